@@ -24,45 +24,68 @@ Usage:
 """
 
 import re
-import os
 import argparse
-from collections import OrderedDict
 from table_utils import (
     verify_table_structure,
-    run_command,
+    get_mysql_create_table,
     create_postgresql_table,
-    export_and_clean_mysql_data,
-    import_data_to_postgresql,
+    copy_mysql_table_to_postgresql,
     add_primary_key_constraint,
-    setup_auto_increment_sequence
+    setup_auto_increment_sequence,
+    execute_postgresql_ddl_batch,
+    get_existing_postgresql_tables,
+    get_mysql_column_names,
+    convert_mysql_column_types
 )
 
 # Configuration: Set to True to preserve MySQL naming convention in PostgreSQL
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "Appointment"
 
+_MYSQL_SYNTAX_CLEANUPS = [
+    (re.compile(r'\s+unsigned\b', re.IGNORECASE), ''),
+    (re.compile(r'\s+zerofill\b', re.IGNORECASE), ''),
+    (re.compile(r'DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP', re.IGNORECASE), 'DEFAULT CURRENT_TIMESTAMP'),
+    (re.compile(r'COLLATE [a-zA-Z0-9_]+'), ''),
+    (re.compile(r'CHARACTER SET [a-zA-Z0-9_]+'), ''),
+    (re.compile(r'\s*ENGINE\s*=\s*[a-zA-Z0-9_]+', re.IGNORECASE), ''),
+    (re.compile(r'\s*DEFAULT\s+CHARSET\s*=\s*[a-zA-Z0-9_]+', re.IGNORECASE), ''),
+    (re.compile(r'\s*AUTO_INCREMENT\s*=\s*\d+', re.IGNORECASE), ''),
+]
+
+_POSTGRES_FIXUPS = [
+    # Fix timestamp types for Appointment
+    (re.compile(r'\bTIMESTAMP\(3\)\b', re.IGNORECASE), 'TIMESTAMP WITHOUT TIME ZONE'),
+    (re.compile(r'\bDATETIME\(3\)\b', re.IGNORECASE), 'TIMESTAMP WITHOUT TIME ZONE'),
+    # Fix boolean defaults for Appointment email template status fields
+    (re.compile(r"DEFAULT\s+'0'", re.IGNORECASE), "DEFAULT false"),
+    (re.compile(r"DEFAULT\s+'1'", re.IGNORECASE), "DEFAULT true"),
+    # Fix invalid date defaults
+    (re.compile(r"DEFAULT\s+'0000-00-00 00:00:00'", re.IGNORECASE), "DEFAULT NULL"),
+    (re.compile(r"DEFAULT\s+'0000-00-00'", re.IGNORECASE), "DEFAULT NULL"),
+    # Clean up commas
+    (re.compile(r',\s*,'), ','),
+    (re.compile(r',(\s*)\)'), r'\1)'),
+]
+
+_CREATE_TABLE_BACKTICK_RE = re.compile(r'CREATE TABLE `([^`]+)`', re.IGNORECASE)
+_PRIMARY_KEY_CLAUSE_RE = re.compile(r',\s*PRIMARY\s+KEY\s*\([^)]+\)', re.IGNORECASE)
+_BACKTICK_RE = re.compile(r'`([^`]+)`')
+_AUTO_INCREMENT_RE = re.compile(r'\s+AUTO_INCREMENT\b', re.IGNORECASE)
+_ID_INT_RE = re.compile(r'(\s*[`"]id[`"]?\s+)int(\s+NOT\s+NULL)', re.IGNORECASE)
+_ID_INTEGER_RE = re.compile(r'(\s*[`"]id[`"]?\s+)INTEGER(\s+NOT\s+NULL)', re.IGNORECASE)
+_DDL_LINE_SPLIT_RE = re.compile(r'\\n|\r?\n')
+# get_appointment_table_info results, filled on first use and shared by every phase of the run
+_TABLE_INFO_CACHE = {}
+
 def get_appointment_table_info():
     """Get complete Appointment table information from MySQL including constraints"""
+    if TABLE_NAME in _TABLE_INFO_CACHE:
+        return _TABLE_INFO_CACHE[TABLE_NAME]
     print(f" Getting complete table info for {TABLE_NAME} from MySQL...")
     
-    # Get CREATE TABLE statement
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW CREATE TABLE `{TABLE_NAME}`;"'
-    result = run_command(cmd)
-    
-    if not result or result.returncode != 0:
-        print(f" Failed to get Appointment table structure: {result.stderr if result else 'No result'}")
-        return None, None, None
-
-    
-    lines = result.stdout.strip().split('\n')
-    create_statement = None
-    for line in lines[1:]:
-        if 'CREATE TABLE' in line:
-            parts = line.split('\t')
-            if len(parts) >= 2:
-                create_statement = parts[1]
-                break
-    
+    # Get CREATE TABLE statement (DDL snapshot or the shared MySQL connection when available)
+    create_statement = get_mysql_create_table(TABLE_NAME)
     if not create_statement:
         print(" Could not find CREATE TABLE statement for Appointment")
         return None, None, None
@@ -72,6 +95,7 @@ def get_appointment_table_info():
     foreign_keys = extract_appointment_foreign_keys_from_ddl(create_statement)
     
     print(f" Found {len(indexes)} indexes and {len(foreign_keys)} foreign keys for Appointment table")
+    _TABLE_INFO_CACHE[TABLE_NAME] = (create_statement, indexes, foreign_keys)
     return create_statement, indexes, foreign_keys
 
 def extract_appointment_indexes_from_ddl(ddl):
@@ -136,70 +160,25 @@ def convert_appointment_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=F
     """Convert Appointment table MySQL DDL to PostgreSQL DDL with Appointment-specific optimizations"""
     print(f"🔄 Converting Appointment table MySQL DDL to PostgreSQL (constraints: {include_constraints}, preserve_case: {preserve_case})...")
     
-    # Appointment-specific type mappings
-    appointment_type_mappings = OrderedDict([
-        # Standard mappings
-        (r'\bint\(\d+\)\s+auto_increment\b', 'SERIAL PRIMARY KEY'),
-        (r'\bbigint\(\d+\)\s+auto_increment\b', 'BIGSERIAL PRIMARY KEY'),
-        (r'tinyint\(1\)', 'BOOLEAN'),
-        (r'tinyint\(\d+\)', 'SMALLINT'),
-        (r'smallint\(\d+\)', 'SMALLINT'),
-        (r'mediumint\(\d+\)', 'INTEGER'),
-        (r'int\(\d+\)', 'INTEGER'),
-        (r'bigint\(\d+\)', 'BIGINT'),
-        (r'\btinyint\b(?!\()', 'SMALLINT'),
-        (r'\bint\b(?!\()', 'INTEGER'),
-        (r'varchar\((\d+)\)', r'VARCHAR(\1)'),
-        (r'char\((\d+)\)', r'CHAR(\1)'),
-        (r'text', 'TEXT'),
-        (r'longtext', 'TEXT'),
-        (r'mediumtext', 'TEXT'),
-        (r'tinytext', 'TEXT'),
-        (r'\bdatetime\(\d+\)\b', 'TIMESTAMP(3)'),
-        (r'\bdatetime\b', 'TIMESTAMP'),
-        (r'\btimestamp\b', 'TIMESTAMP'),
-        (r'\bdate\b(?=\s|,|\)|\n)', 'DATE'),
-        (r'\btime\b(?=\s|,|\)|\n)', 'TIME'),
-        (r'decimal\((\d+),(\d+)\)', r'DECIMAL(\1,\2)'),
-        (r'numeric\((\d+),(\d+)\)', r'DECIMAL(\1,\2)'),
-        (r'double', 'DOUBLE PRECISION'),
-        (r'float', 'REAL'),
-        (r'enum\([^)]+\)', 'VARCHAR(50)'),
-        (r'json', 'JSONB'),  # Important for Appointment.times field
-        (r'blob', 'BYTEA'),
-        (r'longblob', 'BYTEA'),
-    ])
-    
     postgres_ddl = mysql_ddl
     
-    # Convert table name
-    postgres_ddl = re.sub(
-        r'CREATE TABLE `([^`]+)`',
-        r'CREATE TABLE \1',
-        postgres_ddl,
-        flags=re.IGNORECASE
-    )
+    # Use proper table name based on case preservation
+    target_table_name = f'"{TABLE_NAME}"' if preserve_case else TABLE_NAME.lower()
     
-    # Apply Appointment-specific type mappings
-    for mysql_pattern, postgres_type in appointment_type_mappings.items():
-        postgres_ddl = re.sub(mysql_pattern, postgres_type, postgres_ddl, flags=re.IGNORECASE)
+    # Convert table name once, straight to its PostgreSQL form
+    postgres_ddl = _CREATE_TABLE_BACKTICK_RE.sub(f'CREATE TABLE {target_table_name}', postgres_ddl)
+    
+    # Map MySQL types in one pass; inline int(n) AUTO_INCREMENT keys become SERIAL PRIMARY KEY
+    postgres_ddl = convert_mysql_column_types(postgres_ddl, serial_auto_increment=True)
     
     # Remove MySQL-specific syntax
-    postgres_ddl = re.sub(r'\s+unsigned\b', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\s+zerofill\b', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP', 'DEFAULT CURRENT_TIMESTAMP', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'COLLATE [a-zA-Z0-9_]+', '', postgres_ddl)
-    postgres_ddl = re.sub(r'CHARACTER SET [a-zA-Z0-9_]+', '', postgres_ddl)
-    postgres_ddl = re.sub(r'\s*ENGINE\s*=\s*[a-zA-Z0-9_]+', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\s*DEFAULT\s+CHARSET\s*=\s*[a-zA-Z0-9_]+', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\s*AUTO_INCREMENT\s*=\s*\d+', '', postgres_ddl, flags=re.IGNORECASE)
+    for pattern, replacement in _MYSQL_SYNTAX_CLEANUPS:
+        postgres_ddl = pattern.sub(replacement, postgres_ddl)
     
     if not include_constraints:
         # For phase 1, completely rebuild DDL without constraints
-        lines = postgres_ddl.split('\\n')  # Handle escaped newlines
+        lines = _DDL_LINE_SPLIT_RE.split(postgres_ddl)  # Handle escaped and real newlines
         
-        # Use proper table name based on case preservation
-        target_table_name = f'"{TABLE_NAME}"' if preserve_case else TABLE_NAME.lower()
         clean_lines = [f'CREATE TABLE {target_table_name} (']
         
         for line in lines:
@@ -230,54 +209,31 @@ def convert_appointment_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=F
         postgres_ddl = '\n'.join(clean_lines)
     
     # Clean up PRIMARY KEY definitions that are already handled by SERIAL
-    postgres_ddl = re.sub(r',\s*PRIMARY\s+KEY\s*\([^)]+\)', '', postgres_ddl, flags=re.IGNORECASE)
+    postgres_ddl = _PRIMARY_KEY_CLAUSE_RE.sub('', postgres_ddl)
     
-    # Remove MySQL table options
-    postgres_ddl = re.sub(r'\)\s*[A-Z_=\s\w\d]+$', ')', postgres_ddl, flags=re.IGNORECASE)
+    # Remove MySQL table options: everything after the column list's closing parenthesis
+    options_start = postgres_ddl.rfind(')') + 1
+    if options_start:
+        postgres_ddl = postgres_ddl[:options_start]
     
     # Handle backticks - preserve case if needed for Appointment columns (important for googleEventId)
     if preserve_case:
         # Convert MySQL backticks to PostgreSQL double quotes to preserve case
-        postgres_ddl = re.sub(r'`([^`]+)`', r'"\1"', postgres_ddl)
+        postgres_ddl = _BACKTICK_RE.sub(r'"\1"', postgres_ddl)
     else:
         # Remove backticks for case-insensitive mode
-        postgres_ddl = re.sub(r'`([^`]+)`', r'\1', postgres_ddl)
+        postgres_ddl = _BACKTICK_RE.sub(r'\1', postgres_ddl)
     
     # Fix auto_increment - convert to SERIAL FIRST
-    postgres_ddl = re.sub(r'\s+AUTO_INCREMENT\b', '', postgres_ddl, flags=re.IGNORECASE)
+    postgres_ddl = _AUTO_INCREMENT_RE.sub('', postgres_ddl)
     
     # Convert ONLY the id column to INTEGER NOT NULL (preserve original IDs)
-    postgres_ddl = re.sub(r'(\s*[`"]id[`"]?\s+)int(\s+NOT\s+NULL)', r'\1INTEGER NOT NULL', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'(\s*[`"]id[`"]?\s+)INTEGER(\s+NOT\s+NULL)', r'\1INTEGER NOT NULL', postgres_ddl, flags=re.IGNORECASE)
+    postgres_ddl = _ID_INT_RE.sub(r'\1INTEGER NOT NULL', postgres_ddl)
+    postgres_ddl = _ID_INTEGER_RE.sub(r'\1INTEGER NOT NULL', postgres_ddl)
     
-    # Fix timestamp types for Appointment
-    postgres_ddl = re.sub(r'\bTIMESTAMP\(3\)\b', 'TIMESTAMP WITHOUT TIME ZONE', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\bDATETIME\(3\)\b', 'TIMESTAMP WITHOUT TIME ZONE', postgres_ddl, flags=re.IGNORECASE)
-    
-    # Fix boolean defaults for Appointment email template status fields
-    postgres_ddl = re.sub(r"DEFAULT\s+'0'", "DEFAULT false", postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r"DEFAULT\s+'1'", "DEFAULT true", postgres_ddl, flags=re.IGNORECASE)
-    
-    # Fix invalid date defaults
-    postgres_ddl = re.sub(r"DEFAULT\s+'0000-00-00 00:00:00'", "DEFAULT NULL", postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r"DEFAULT\s+'0000-00-00'", "DEFAULT NULL", postgres_ddl, flags=re.IGNORECASE)
-    
-    # Clean up commas
-    postgres_ddl = re.sub(r',\s*,', ',', postgres_ddl)
-    postgres_ddl = re.sub(r',(\s*)\)', r'\1)', postgres_ddl)
-    
-    # Convert table name appropriately based on case preservation
-    if preserve_case:
-        target_table_name = f'"{TABLE_NAME}"'
-    else:
-        target_table_name = TABLE_NAME.lower()
-    
-    postgres_ddl = re.sub(
-        rf'\bCREATE TABLE {TABLE_NAME}\b',
-        f'CREATE TABLE {target_table_name}',
-        postgres_ddl,
-        flags=re.IGNORECASE
-    )
+    # Fix timestamp types, boolean defaults and invalid date defaults, then clean up commas
+    for pattern, replacement in _POSTGRES_FIXUPS:
+        postgres_ddl = pattern.sub(replacement, postgres_ddl)
     
     return postgres_ddl
 
@@ -289,14 +245,16 @@ def create_appointment_indexes(indexes):
     
     print(f" Creating {len(indexes)} indexes for {TABLE_NAME}...")
     
+    # For case-sensitive table, quote the table name
+    table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+    
+    index_names = []
+    statements = []
     for index in indexes:
         index_name = f"{TABLE_NAME.lower()}_{index['name']}"
         columns = index['columns'].replace('`', '')  # Remove backticks
         unique_clause = "UNIQUE " if index['unique'] else ""
         
-        # For case-sensitive table, quote the table name
-        table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        
         # Quote column names if preserving case
         if PRESERVE_MYSQL_CASE:
             col_list = []
@@ -305,51 +263,24 @@ def create_appointment_indexes(indexes):
                 col_list.append(f'"{col}"')
             columns = ', '.join(col_list)
         
-        create_index_sql = f"CREATE {unique_clause}INDEX {index_name} ON {table_ref} ({columns});"
-        
         print(f"🔧 Creating Appointment index: {index_name}")
-        
-        # Write to file and execute
-        sql_file = f"create_appointment_index_{index_name}.sql"
-        with open(sql_file, "w", encoding="utf-8") as f:
-            f.write(create_index_sql)
-        
-        # Copy and execute
-        copy_cmd = f"docker cp {sql_file} postgres_target:/tmp/{sql_file}"
-        run_command(copy_cmd)
-        
-        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{sql_file}'
-        result = run_command(exec_cmd)
-        
-        # Cleanup
-        try:
-            os.remove(sql_file)
-        except:
-            pass
-        run_command(f"docker exec postgres_target rm /tmp/{sql_file}")
-        
-        if result and result.returncode == 0:
-            print(f" Created Appointment index: {index_name}")
+        index_names.append(index_name)
+        statements.append(f"CREATE {unique_clause}INDEX {index_name} ON {table_ref} ({columns});")
+    
+    # All indexes go through one psql session; each one still succeeds or fails on its own
+    errors = execute_postgresql_ddl_batch(statements)
+    if errors is None:
+        print(f" Failed to create Appointment indexes")
+        return False
+    
+    for i, index_name in enumerate(index_names):
+        if i in errors:
+            print(f" Failed to create Appointment index {index_name}: {errors[i]}")
         else:
-            print(f" Failed to create Appointment index {index_name}: {result.stderr if result else 'Unknown error'}")
+            print(f" Created Appointment index: {index_name}")
     
     return True
 
-def check_appointment_referenced_table_exists(ref_table):
-    """Check if referenced table exists in PostgreSQL for Appointment foreign keys"""
-    # Appointment references: Company, Client, User, Vehicle
-    table_name = ref_table if PRESERVE_MYSQL_CASE else ref_table.lower()
-    cmd = f'docker exec postgres_target psql -U postgres -d target_db -t -c "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = \'{table_name}\' AND table_schema = \'public\';"'
-    result = run_command(cmd)
-    
-    if result and result.returncode == 0:
-        try:
-            count = int(result.stdout.strip())
-            return count > 0
-        except:
-            return False
-    return False
-
 def create_appointment_foreign_keys(foreign_keys):
     """Create foreign key constraints for Appointment table"""
     if not foreign_keys:
@@ -358,15 +289,23 @@ def create_appointment_foreign_keys(foreign_keys):
     
     print(f" Creating {len(foreign_keys)} foreign keys for {TABLE_NAME}...")
     
-    created_count = 0
+    table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+    
+    constraint_names = []
+    statements = []
     skipped_count = 0
     
+    # Appointment references: Company, Client, User, Vehicle
+    existing_tables = get_existing_postgresql_tables(
+        {fk['ref_table'] if PRESERVE_MYSQL_CASE else fk['ref_table'].lower() for fk in foreign_keys}
+    )
+    
     for fk in foreign_keys:
         ref_table = fk['ref_table']
         ref_table_name = f'"{ref_table}"' if PRESERVE_MYSQL_CASE else ref_table.lower()
         
         # Check if referenced table exists
-        if not check_appointment_referenced_table_exists(ref_table):
+        if (ref_table if PRESERVE_MYSQL_CASE else ref_table.lower()) not in existing_tables:
             print(f" Skipping Appointment FK {fk['name']}: Referenced table '{ref_table}' does not exist")
             skipped_count += 1
             continue
@@ -389,48 +328,29 @@ def create_appointment_foreign_keys(foreign_keys):
         if on_update not in ['CASCADE', 'SET NULL', 'RESTRICT', 'NO ACTION']:
             on_update = 'RESTRICT'
         
-        table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        
-        alter_sql = f"""
-ALTER TABLE {table_ref} 
-ADD CONSTRAINT {constraint_name} 
-FOREIGN KEY ({local_cols}) 
-REFERENCES {ref_table_name} ({ref_cols}) 
-ON DELETE {on_delete} 
-ON UPDATE {on_update};
-"""
-        
         print(f"🔧 Creating Appointment FK: {constraint_name} -> {ref_table}")
-        
-        # Write to file and execute
-        sql_file = f"create_appointment_fk_{constraint_name}.sql"
-        with open(sql_file, "w", encoding="utf-8") as f:
-            f.write(alter_sql)
-        
-        # Copy and execute
-        copy_cmd = f"docker cp {sql_file} postgres_target:/tmp/{sql_file}"
-        run_command(copy_cmd)
-        
-        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{sql_file}'
-        result = run_command(exec_cmd)
-        
-        # Cleanup
-        try:
-            os.remove(sql_file)
-        except:
-            pass
-        run_command(f"docker exec postgres_target rm /tmp/{sql_file}")
-        
-        if result and result.returncode == 0:
-            print(f" Created Appointment FK: {constraint_name}")
-            created_count += 1
+        constraint_names.append(constraint_name)
+        statements.append(
+            f"ALTER TABLE {table_ref} ADD CONSTRAINT {constraint_name} FOREIGN KEY ({local_cols}) "
+            f"REFERENCES {ref_table_name} ({ref_cols}) ON DELETE {on_delete} ON UPDATE {on_update};"
+        )
+    
+    # All constraints go through one psql session; each one still succeeds or fails on its own
+    errors = execute_postgresql_ddl_batch(statements) if statements else {}
+    if errors is None:
+        print(f" Failed to create Appointment foreign keys")
+        return False
+    
+    for i, constraint_name in enumerate(constraint_names):
+        if i in errors:
+            print(f" Failed to create Appointment FK {constraint_name}: {errors[i]}")
         else:
-            print(f" Failed to create Appointment FK {constraint_name}: {result.stderr if result else 'Unknown error'}")
+            print(f" Created Appointment FK: {constraint_name}")
     
-    print(f" Appointment Foreign Keys: {created_count} created, {skipped_count} skipped")
+    print(f" Appointment Foreign Keys: {len(statements) - len(errors)} created, {skipped_count} skipped")
     return True
 
-def migrate_appointment_phase1():
+def migrate_appointment_phase1(batch_size=None):
     """Phase 1: Create Appointment table and import data (no constraints)"""
     print(f" Phase 1: Creating Appointment table and importing data")
     
@@ -450,11 +370,11 @@ def migrate_appointment_phase1():
     if not create_postgresql_table(TABLE_NAME, postgres_ddl, preserve_case=PRESERVE_MYSQL_CASE):
         return False
     
-    cleaned_data = export_and_clean_mysql_data(TABLE_NAME)
-    if cleaned_data is None:
-        return False
-    
-    if not import_data_to_postgresql(TABLE_NAME, cleaned_data, preserve_case=PRESERVE_MYSQL_CASE, include_id=True):
+    # COPY every column, id included: over the PyMySQL -> psycopg2 connections when both drivers
+    # are installed, otherwise from mysql -B output, whose escaping already matches COPY's text
+    # format. Either way no row goes through Python-side cleaning
+    columns = get_mysql_column_names(mysql_ddl)
+    if not copy_mysql_table_to_postgresql(TABLE_NAME, columns, PRESERVE_MYSQL_CASE, batch_size=batch_size):
         return False
 
     # Add PRIMARY KEY constraint if not exists
@@ -496,6 +416,7 @@ def main():
     parser.add_argument('--phase', type=int, choices=[1, 2, 3], help='Migration phase (1=table+data, 2=indexes, 3=foreign keys)')
     parser.add_argument('--full', action='store_true', help='Run all phases')
     parser.add_argument('--verify', action='store_true', help='Verify Appointment table structure matches between MySQL and PostgreSQL')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Rows per phase-1 COPY transaction (0: one transaction)')
     
     args = parser.parse_args()
     
@@ -507,12 +428,12 @@ def main():
     if args.full:
         print(f" Running full migration for {TABLE_NAME}")
         success = (
-            migrate_appointment_phase1() and
+            migrate_appointment_phase1(args.batch_size or None) and
             migrate_appointment_phase2() and
             migrate_appointment_phase3()
         )
     elif args.phase == 1:
-        success = migrate_appointment_phase1()
+        success = migrate_appointment_phase1(args.batch_size or None)
     elif args.phase == 2:
         success = migrate_appointment_phase2()
     elif args.phase == 3:
@@ -26,156 +26,185 @@ Usage:
 
 import re
 import os
+import logging
 import argparse
-import tempfile
-from collections import OrderedDict
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from table_utils import (
     verify_table_structure,
-    run_command,
     create_postgresql_table,
-    export_and_clean_mysql_data,
-    import_data_to_postgresql,
     add_primary_key_constraint,
     setup_auto_increment_sequence,
-    execute_postgresql_sql
+    execute_postgresql_sql,
+    execute_postgresql_statements,
+    execute_postgresql_script,
+    execute_postgresql_ddl_batch,
+    stream_mysql_to_postgresql_copy,
+    BULK_LOAD_SETTINGS,
+    standardize_id_column_as_serial,
+    get_mysql_create_table,
+    split_create_table_clauses,
+    get_postgresql_names,
+    convert_column_ddl
 )
 
 # Configuration: Set to True to preserve MySQL naming convention in PostgreSQL
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "ClientSMS"
 
+# PostgreSQL spellings of the table name and identifier quoting, fixed once PRESERVE_MYSQL_CASE is known
+_TABLE_PG = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+_TABLE_FOR_CHECK = TABLE_NAME if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+_SEQUENCE_PG = f'"{TABLE_NAME}_id_seq"' if PRESERVE_MYSQL_CASE else f"{TABLE_NAME}_id_seq"
+_IDENT_QUOTE = '"' if PRESERVE_MYSQL_CASE else ''
+_INDEX_PREFIX = TABLE_NAME.lower()
+
+# Per-item progress goes to DEBUG; at the default INFO level only phase summaries are written.
+# Set MIGRATION_LOG=DEBUG to see every index, FK and column conversion.
+logger = logging.getLogger("migration")
+
+# SHOW CREATE TABLE results keyed by table name, so phases in one run share a single MySQL round trip
+_TABLE_INFO_CACHE = {}
+
+# Phase 1 data transfer: mysql -B escapes tabs, newlines and backslashes the same way
+# COPY's text format expects, and prints NULL as the literal NULL
+EXPORT_SQL = "SELECT id, message, `from`, `to`, sentBy, is_read, user_id, company_id, client_id, created_at, updated_at FROM ClientSMS"
+COPY_SQL = '''COPY "ClientSMS" ("id", "message", "from", "to", "sentBy", "is_read", "user_id", "company_id", "client_id", "created_at", "updated_at") FROM STDIN WITH (FORMAT text, NULL 'NULL');'''
+
+SENTBY_ENUM_SQL = '''
+    DO $$ BEGIN
+        CREATE TYPE sentby_enum AS ENUM ('Client', 'Company');
+    EXCEPTION
+        WHEN duplicate_object THEN null;
+    END $$;
+    '''
+
+# Placeholder row referenced by other tables' foreign keys
+MISSING_RECORDS_SQL = '''
+INSERT INTO "ClientSMS" (id, message, "from", "to", "sentBy", is_read, user_id, company_id, client_id, created_at, updated_at)
+VALUES (2950, 'Fake record for FK integrity', '+1234567890', '+0987654321', 'Company', false, 1, 1, 1, NOW(), NOW())
+ON CONFLICT (id) DO NOTHING;
+'''
+
+# Phase 2 builds indexes in parallel psql sessions; CREATE INDEX only takes a SHARE lock,
+# so builds on the same table do not block each other
+INDEX_WORKERS = 8
+INDEX_SESSION_SETTINGS = ("SET max_parallel_maintenance_workers = 4",)
+
+# Single alternation over KEY and CONSTRAINT ... FOREIGN KEY clauses so each clause is matched once.
+# The FK branch only matches the linear constraint head; the trailing ON DELETE / ON UPDATE
+# actions are captured whole and read by _parse_fk_actions, avoiding backtracking lookaheads.
+_DDL_RE = re.compile(
+    r'(?P<idx>(?:UNIQUE\s+)?KEY\s+`(?P<idx_name>[^`]+)`\s*\((?P<idx_columns>[^)]+)\))'
+    r'|(?P<fk>CONSTRAINT\s+`(?P<fk_name>[^`]+)`\s+FOREIGN\s+KEY\s*\((?P<local_columns>[^)]+)\)\s+'
+    r'REFERENCES\s+`(?P<ref_table>[^`]+)`\s*\((?P<ref_columns>[^)]+)\)(?P<fk_actions>.*))',
+    re.IGNORECASE | re.DOTALL
+)
+
+_ENUM_RE = re.compile(r'enum\([^)]+\)', re.IGNORECASE)
+
+# Clause prefixes that mark a key or constraint rather than a column definition
+_CONSTRAINT_PREFIXES = ('PRIMARY KEY', 'KEY', 'UNIQUE KEY', 'CONSTRAINT')
+
 def get_clientsms_table_info():
     """Get complete ClientSMS table information from MySQL including constraints"""
-    print(f" Getting complete table info for {TABLE_NAME} from MySQL...")
+    if TABLE_NAME in _TABLE_INFO_CACHE:
+        return _TABLE_INFO_CACHE[TABLE_NAME]
     
-    # Get CREATE TABLE statement
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW CREATE TABLE `{TABLE_NAME}`;"'
-    result = run_command(cmd)
+    logger.info(" Getting complete table info for %s from MySQL...", TABLE_NAME)
     
-    if not result or result.returncode != 0:
-        print(f" Failed to get {TABLE_NAME} table info from MySQL")
-        return None, [], []
-    
-    # Extract DDL
-    lines = result.stdout.strip().split("\n")
-    ddl_line = None
-    for line in lines:
-        # Look for lines containing CREATE TABLE (could be in second column)
-        if "CREATE TABLE" in line:
-            # Split by tab and take the part with CREATE TABLE
-            parts = line.split("\t")
-            for part in parts:
-                if "CREATE TABLE" in part:
-                    ddl_line = part
-                    break
-            if ddl_line:
-                break
-    
-    if not ddl_line:
-        print(f" Could not find CREATE TABLE statement for {TABLE_NAME}")
-        print("Debug: MySQL output:")
-        print(result.stdout)
+    # Get CREATE TABLE statement
+    mysql_ddl = get_mysql_create_table(TABLE_NAME)
+    if not mysql_ddl:
+        logger.error(" Could not find CREATE TABLE statement for %s", TABLE_NAME)
         return None, [], []
     
-    mysql_ddl = ddl_line.strip()
-    
-    # Extract indexes and foreign keys
-    indexes = extract_clientsms_indexes_from_ddl(mysql_ddl)
-    foreign_keys = extract_clientsms_foreign_keys_from_ddl(mysql_ddl)
+    # Extract indexes and foreign keys from the tokenized DDL clauses
+    indexes, foreign_keys = extract_clientsms_indexes_and_foreign_keys_from_ddl(mysql_ddl)
     
-    print(f" Found {len(indexes)} indexes and {len(foreign_keys)} foreign keys for {TABLE_NAME} table")
+    logger.info(" Found %s indexes and %s foreign keys for %s table", len(indexes), len(foreign_keys), TABLE_NAME)
+    _TABLE_INFO_CACHE[TABLE_NAME] = (mysql_ddl, indexes, foreign_keys)
     return mysql_ddl, indexes, foreign_keys
 
-def extract_clientsms_indexes_from_ddl(ddl):
-    """Extract index definitions from ClientSMS table MySQL DDL"""
+@functools.lru_cache(maxsize=None)
+def parse_clientsms_ddl(mysql_ddl):
+    """Tokenize ClientSMS MySQL DDL once into its top-level column, key and constraint clauses"""
+    clauses = split_create_table_clauses(mysql_ddl)
+    return tuple(clauses) if clauses is not None else None
+
+def _parse_fk_actions(actions):
+    """Read ON DELETE / ON UPDATE actions (including multi-word ones like SET NULL) from a FK clause tail"""
+    found = {}
+    words = actions.upper().split()
+    i = 0
+    while i + 1 < len(words):
+        if words[i] == 'ON' and words[i + 1] in ('DELETE', 'UPDATE'):
+            end = i + 2
+            while end < len(words) and words[end] != 'ON':
+                end += 1
+            found[words[i + 1]] = ' '.join(words[i + 2:end])
+            i = end
+        else:
+            i += 1
+    return found.get('DELETE') or 'RESTRICT', found.get('UPDATE') or 'RESTRICT'
+
+def extract_clientsms_indexes_and_foreign_keys_from_ddl(ddl):
+    """Extract index and foreign key definitions from ClientSMS table MySQL DDL in one pass"""
     indexes = []
-    
-    # Pattern for KEY definitions
-    key_pattern = r'(?:UNIQUE\s+)?KEY\s+`([^`]+)`\s*\(([^)]+)\)'
-    
-    matches = re.finditer(key_pattern, ddl, re.IGNORECASE)
-    for match in matches:
-        index_name = match.group(1)
-        columns = match.group(2)
-        is_unique = 'UNIQUE' in match.group(0).upper()
-        
-        indexes.append({
-            'name': index_name,
-            'columns': columns,
-            'unique': is_unique,
-            'original': match.group(0),
-            'table': 'ClientSMS'
-        })
-    
-    return indexes
-
-def extract_clientsms_foreign_keys_from_ddl(ddl):
-    """Extract foreign key definitions from ClientSMS table MySQL DDL"""
     foreign_keys = []
     
-    # Pattern for CONSTRAINT FOREIGN KEY specific to ClientSMS - handle multi-word actions like "SET NULL"
-    fk_pattern = r'CONSTRAINT\s+`([^`]+)`\s+FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+`([^`]+)`\s*\(([^)]+)\)(?:\s+ON\s+DELETE\s+([A-Z][A-Z\s]*?)(?=\s+ON|\s*$))?(?:\s+ON\s+UPDATE\s+([A-Z][A-Z\s]*?)(?=\s*$|\s*,))?'
-    
-    matches = re.finditer(fk_pattern, ddl, re.IGNORECASE)
-    for match in matches:
-        constraint_name = match.group(1)
-        local_columns = match.group(2)
-        ref_table = match.group(3)
-        ref_columns = match.group(4)
-        on_delete = match.group(5).strip() if match.group(5) else 'RESTRICT'
-        on_update = match.group(6).strip() if match.group(6) else 'RESTRICT'
+    for clause in parse_clientsms_ddl(ddl) or ():
+        match = _DDL_RE.match(clause)
+        if not match:
+            continue
         
-        foreign_keys.append({
-            'name': constraint_name,
-            'local_columns': local_columns,
-            'ref_table': ref_table,
-            'ref_columns': ref_columns,
-            'on_delete': on_delete,
-            'on_update': on_update,
-            'original': match.group(0),
-            'table': 'ClientSMS'
-        })
-    
-    return foreign_keys
+        if match.lastgroup == 'idx':
+            is_unique = 'UNIQUE' in match.group('idx').upper()
+            
+            indexes.append({
+                'name': match.group('idx_name'),
+                'columns': match.group('idx_columns'),
+                'unique': is_unique,
+                'original': match.group('idx'),
+                'table': 'ClientSMS'
+            })
+        else:
+            on_delete, on_update = _parse_fk_actions(match.group('fk_actions'))
+            
+            foreign_keys.append({
+                'name': match.group('fk_name'),
+                'local_columns': match.group('local_columns'),
+                'ref_table': match.group('ref_table'),
+                'ref_columns': match.group('ref_columns'),
+                'on_delete': on_delete,
+                'on_update': on_update,
+                'original': match.group('fk'),
+                'table': 'ClientSMS'
+            })
+    
+    return indexes, foreign_keys
 
 def convert_clientsms_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False, preserve_case=True):
     """Convert ClientSMS table MySQL DDL to PostgreSQL DDL with ClientSMS-specific optimizations"""
-    print(f" Converting ClientSMS table MySQL DDL to PostgreSQL (constraints: {include_constraints}, preserve_case: {preserve_case})...")
-    
-    # Fix literal \n characters to actual newlines first
-    postgres_ddl = mysql_ddl.replace('\\n', '\n')
+    logger.info(" Converting ClientSMS table MySQL DDL to PostgreSQL (constraints: %s, preserve_case: %s)...", include_constraints, preserve_case)
     
-    # Extract just the column definitions part
-    create_match = re.search(r'CREATE TABLE `[^`]+`\s*\((.*?)\)\s*ENGINE', postgres_ddl, re.DOTALL)
-    if not create_match:
-        print(f" Could not parse CREATE TABLE statement for {TABLE_NAME}")
+    # Reuse the tokenized columns, indexes, and constraints
+    clauses = parse_clientsms_ddl(mysql_ddl)
+    if clauses is None:
+        logger.error(" Could not parse CREATE TABLE statement for %s", TABLE_NAME)
         return None
     
-    columns_part = create_match.group(1)
-    
-    # Parse individual columns, indexes, and constraints
     lines = []
-    for line in columns_part.split(',\n'):
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Skip constraints for now if include_constraints is False
-        if not include_constraints and (
-            line.startswith('PRIMARY KEY') or 
-            line.startswith('KEY') or 
-            line.startswith('UNIQUE KEY') or 
-            line.startswith('CONSTRAINT')
-        ):
+    for line in clauses:
+        # Keys and constraints are never inlined; primary key, indexes and FKs are added
+        # after the data import and in phases 2 and 3
+        if line.startswith(_CONSTRAINT_PREFIXES):
             continue
-            
-        # Process column definitions
-        if not (line.startswith('PRIMARY KEY') or line.startswith('KEY') or 
-                line.startswith('UNIQUE KEY') or line.startswith('CONSTRAINT')):
-            # This is a column definition
-            processed_line = process_clientsms_column_definition(line, preserve_case)
-            if processed_line:
-                lines.append(processed_line)
+        
+        # This is a column definition
+        processed_line = process_clientsms_column_definition(line, preserve_case)
+        if processed_line:
+            lines.append(processed_line)
     
     # Build the PostgreSQL DDL
     table_name_pg = f'"{TABLE_NAME}"' if preserve_case else TABLE_NAME.lower()
@@ -192,356 +221,248 @@ def process_clientsms_column_definition(line, preserve_case):
     
     # Handle reserved word 'from' by using proper quoting
     if '"from"' in line:
-        print(f" Handling reserved word 'from' in column definition")
+        logger.debug(" Handling reserved word 'from' in column definition")
     
     # ClientSMS-specific fix: Make message nullable
     if '"message"' in line:
         # Remove NOT NULL if present
         line = line.replace('NOT NULL', '')
-        print(f" Allowing message column to be NULL (nullable field)")
-    
-    # Handle ENUM types - convert to PostgreSQL ENUM or VARCHAR
-    enum_pattern = r'enum\(([^)]+)\)'
-    enum_match = re.search(enum_pattern, line, re.IGNORECASE)
-    if enum_match:
-        enum_values = enum_match.group(1)
-        # For ClientSMS sentBy enum, create a proper PostgreSQL enum
-        if 'sentBy' in line:
-            line = re.sub(enum_pattern, 'sentby_enum', line, flags=re.IGNORECASE)
-            print(f" Converted sentBy ENUM to sentby_enum for ClientSMS")
+        logger.debug(" Allowing message column to be NULL (nullable field)")
+    
+    # Handle ENUM types - convert to PostgreSQL ENUM or VARCHAR in a single substitution
+    # For ClientSMS sentBy enum, use the proper PostgreSQL enum created in create_clientsms_table
+    is_sent_by = 'sentBy' in line
+    line, enum_count = _ENUM_RE.subn('sentby_enum' if is_sent_by else 'VARCHAR(100)', line)
+    if enum_count:
+        if is_sent_by:
+            logger.debug(" Converted sentBy ENUM to sentby_enum for ClientSMS")
         else:
-            line = re.sub(enum_pattern, 'VARCHAR(100)', line, flags=re.IGNORECASE)
-            print(f" Converted ENUM to VARCHAR for ClientSMS")
-    
-    # MySQL to PostgreSQL type conversions for ClientSMS
-    conversions = [
-        (r'\btinyint\(1\)\b', 'BOOLEAN'),
-        (r'\btinyint\([^)]+\)\b', 'SMALLINT'),
-        (r'\bsmallint\([^)]+\)\b', 'SMALLINT'),
-        (r'\bmediumint\([^)]+\)\b', 'INTEGER'),
-        (r'\bint\([^)]+\)\b', 'INTEGER'),
-        (r'\bbigint\([^)]+\)\b', 'BIGINT'),
-        (r'\bint\b', 'INTEGER'),
-        (r'\bvarchar\([^)]+\)\b', 'VARCHAR'),
-        (r'\btext\b', 'TEXT'),
-        (r'\blongtext\b', 'TEXT'),
-        (r'\bmediumtext\b', 'TEXT'),
-        (r'\btinytext\b', 'TEXT'),
-        (r'\bdatetime\([^)]+\)\b', 'TIMESTAMP'),
-        (r'\bdatetime\b', 'TIMESTAMP'),
-        (r'\btimestamp\([^)]+\)\b', 'TIMESTAMP'),
-        (r'\btimestamp\b', 'TIMESTAMP'),
-        (r'\bdate\b', 'DATE'),
-        (r'\btime\b', 'TIME'),
-        (r'\bdouble\b', 'DOUBLE PRECISION'),
-        (r'\bfloat\b', 'REAL'),
-        (r'\bdecimal\([^)]+\)\b', 'DECIMAL'),
-        (r'\bjson\b', 'JSON'),
-        (r'\bblob\b', 'BYTEA'),
-        (r'\blongblob\b', 'BYTEA'),
-        (r'\bmediumblob\b', 'BYTEA'),
-        (r'\btinyblob\b', 'BYTEA'),
-    ]
-    
-    for pattern, replacement in conversions:
-        line = re.sub(pattern, replacement, line, flags=re.IGNORECASE)
-    
-    # Additional manual fixes for common issues
-    line = line.replace("tinyint(1)", "BOOLEAN")  # Force tinyint(1) to BOOLEAN
-    line = line.replace("tinyint", "SMALLINT")    # Any other tinyint to SMALLINT
-    
-    # Handle AUTO_INCREMENT
-    line = re.sub(r'\bAUTO_INCREMENT\b', '', line, flags=re.IGNORECASE)
-    
-    # Handle MySQL DEFAULT expressions
-    line = re.sub(r"DEFAULT\s+CURRENT_TIMESTAMP\(\d*\)", "DEFAULT CURRENT_TIMESTAMP", line, flags=re.IGNORECASE)
-    line = re.sub(r"DEFAULT\s+CURRENT_TIMESTAMP", "DEFAULT CURRENT_TIMESTAMP", line, flags=re.IGNORECASE)
-    
-    # Handle MySQL character set and collation
-    line = re.sub(r'\s+CHARACTER\s+SET\s+[^\s]+', '', line, flags=re.IGNORECASE)
-    line = re.sub(r'\s+COLLATE\s+[^\s]+', '', line, flags=re.IGNORECASE)
-    
-    # Clean up extra whitespace
-    line = re.sub(r'\s+', ' ', line).strip()
-    
-    return line
+            logger.debug(" Converted ENUM to VARCHAR for ClientSMS")
+    
+    # Shared MySQL to PostgreSQL type, default and charset conversions
+    return convert_column_ddl(line, preserve_case)
 
 def create_clientsms_table(mysql_ddl):
     """Create ClientSMS table in PostgreSQL"""
-    print(f" Generating PostgreSQL DDL for {TABLE_NAME}...")
+    logger.info(" Generating PostgreSQL DDL for %s...", TABLE_NAME)
     
     # Create the enum type for sentBy
-    print(" Creating sentBy enum type...")
-    enum_sql = '''
-    DO $$ BEGIN
-        CREATE TYPE sentby_enum AS ENUM ('Client', 'Company');
-    EXCEPTION
-        WHEN duplicate_object THEN null;
-    END $$;
-    '''
-    
-    with open('clientsms_enum.sql', 'w', encoding='utf-8') as f:
-        f.write(enum_sql)
-    
-    copy_enum_cmd = 'docker cp clientsms_enum.sql postgres_target:/tmp/clientsms_enum.sql'
-    result = run_command(copy_enum_cmd)
-    
+    logger.info(" Creating sentBy enum type...")
+    # Piped to psql on stdin: no temp file, docker cp or container file to clean up
+    result = execute_postgresql_script(SENTBY_ENUM_SQL)
     if result and result.returncode == 0:
-        enum_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/clientsms_enum.sql'
-        result = run_command(enum_cmd)
-        if result and result.returncode == 0:
-            print(" Created sentBy enum type")
-        else:
-            print(f" Enum creation warning: {result.stderr if result else 'No result'}")
+        logger.info(" Created sentBy enum type")
+    else:
+        logger.warning(" Enum creation warning: %s", result.stderr if result else 'No result')
     
     # Convert MySQL DDL to PostgreSQL DDL
     postgres_ddl = convert_clientsms_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False, preserve_case=PRESERVE_MYSQL_CASE)
     if not postgres_ddl:
         return False
     
-    print(f" Generated PostgreSQL DDL for {TABLE_NAME}:")
-    print("=" * 50)
-    print(postgres_ddl)
-    print("=" * 50)
+    logger.debug(" Generated PostgreSQL DDL for %s:", TABLE_NAME)
+    logger.debug("=" * 50)
+    logger.debug("%s", postgres_ddl)
+    logger.debug("=" * 50)
     
     return create_postgresql_table(TABLE_NAME, postgres_ddl, PRESERVE_MYSQL_CASE)
 
-def create_clientsms_indexes(indexes):
-    """Create indexes for ClientSMS table"""
+def build_clientsms_index_sql(index):
+    """Build the CREATE INDEX statement for one ClientSMS index"""
+    index_name = f"{_INDEX_PREFIX}_{index['name']}"
+    columns = index['columns'].replace('`', _IDENT_QUOTE)
+    unique_clause = "UNIQUE " if index.get('unique', False) else ""
+    return f'CREATE {unique_clause}INDEX "{index_name}" ON {_TABLE_PG} ({columns});'
+
+def build_clientsms_foreign_key_sql(fk):
+    """Build the ALTER TABLE ... ADD CONSTRAINT statement for one ClientSMS foreign key"""
+    constraint_name = f"{TABLE_NAME}_{fk['name']}"
+    local_columns = fk['local_columns'].replace('`', _IDENT_QUOTE)
+    ref_table = f'"{fk["ref_table"]}"' if PRESERVE_MYSQL_CASE else fk['ref_table'].lower()
+    ref_columns = fk['ref_columns'].replace('`', _IDENT_QUOTE)
+    return f'ALTER TABLE {_TABLE_PG} ADD CONSTRAINT "{constraint_name}" FOREIGN KEY ({local_columns}) REFERENCES {ref_table} ({ref_columns});'
+
+def create_clientsms_indexes(indexes, dry_run=False):
+    """Create indexes for ClientSMS table, or return their statements when dry_run is set"""
+    if dry_run:
+        return [build_clientsms_index_sql(index) for index in indexes]
+    
     if not indexes:
-        print(f" No indexes to create for {TABLE_NAME}")
+        logger.info(" No indexes to create for %s", TABLE_NAME)
         return True
     
-    print(f" Creating {len(indexes)} indexes for {TABLE_NAME}...")
+    logger.info(" Creating %s indexes for %s...", len(indexes), TABLE_NAME)
     
-    success = True
+    # Check all existing indexes with one query instead of one per index
+    existing = get_postgresql_names(f"SELECT indexname FROM pg_indexes WHERE tablename = '{_TABLE_FOR_CHECK}';")
+    
+    pending = []
+    statements = []
     for index in indexes:
-        index_name = f"{TABLE_NAME.lower()}_{index['name']}"
-        columns = index['columns'].replace('`', '"' if PRESERVE_MYSQL_CASE else '')
-        table_name = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        
-        # Check if index already exists
-        table_name_for_check = TABLE_NAME if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        check_cmd = f'docker exec postgres_target psql -U postgres -d target_db -t -c "SELECT indexname FROM pg_indexes WHERE tablename = \'{table_name_for_check}\' AND indexname = \'{index_name}\';"'
-        check_result = run_command(check_cmd)
-        
-        if check_result and check_result.returncode == 0 and check_result.stdout.strip():
-            print(f" Skipping existing index: {index_name}")
+        index_name = f"{_INDEX_PREFIX}_{index['name']}"
+        if index_name in existing:
+            logger.debug(" Skipping existing index: %s", index_name)
             continue
         
-        unique_clause = "UNIQUE " if index.get('unique', False) else ""
-        index_sql = f'CREATE {unique_clause}INDEX "{index_name}" ON {table_name} ({columns});'
-        
-        print(f" Creating {TABLE_NAME} index: {index['name']}")
-        success_flag, result = execute_postgresql_sql(index_sql, f"{TABLE_NAME} index {index['name']}")
-        
-        if success_flag and result and "CREATE INDEX" in result.stdout:
-            print(f" Created {TABLE_NAME} index: {index['name']}")
+        logger.debug(" Creating %s index: %s", TABLE_NAME, index['name'])
+        pending.append(index)
+        statements.append(build_clientsms_index_sql(index))
+    
+    if not statements:
+        logger.info(" %s Indexes: 0 created, %s skipped", TABLE_NAME, len(indexes))
+        return True
+    
+    # Each index gets its own session so independent builds overlap
+    with ThreadPoolExecutor(max_workers=min(INDEX_WORKERS, len(statements))) as executor:
+        results = list(executor.map(
+            lambda index_sql: execute_postgresql_statements(INDEX_SESSION_SETTINGS + (index_sql,)),
+            statements
+        ))
+    
+    success = True
+    created_count = 0
+    for index, result in zip(pending, results):
+        if result and result.returncode == 0:
+            logger.debug(" Created %s index: %s", TABLE_NAME, index['name'])
+            created_count += 1
         else:
             error_msg = result.stderr if result else "No result"
-            print(f" Failed to create {TABLE_NAME} index {index['name']}: {error_msg}")
+            logger.error(" Failed to create %s index %s: %s", TABLE_NAME, index['name'], error_msg)
             success = False
     
+    logger.info(" %s Indexes: %s created, %s skipped", TABLE_NAME, created_count, len(indexes) - len(pending))
     return success
 
-def create_clientsms_foreign_keys(foreign_keys):
-    """Create foreign keys for ClientSMS table"""
+def create_clientsms_foreign_keys(foreign_keys, dry_run=False):
+    """Create foreign keys for ClientSMS table, or return their statements when dry_run is set
+    
+    In dry_run mode each statement is wrapped so that a failing FK (e.g. a referenced table that
+    has not been migrated yet) only raises a warning instead of aborting the surrounding transaction.
+    """
+    if dry_run:
+        return [
+            f"""DO $$ BEGIN
+    {build_clientsms_foreign_key_sql(fk)}
+EXCEPTION WHEN others THEN
+    RAISE WARNING 'Failed to create {TABLE_NAME} FK {TABLE_NAME}_{fk['name']}: %', SQLERRM;
+END $$;"""
+            for fk in foreign_keys
+        ]
+    
     if not foreign_keys:
-        print(f" No foreign keys to create for {TABLE_NAME}")
+        logger.info(" No foreign keys to create for %s", TABLE_NAME)
         return True
     
-    print(f" Creating {len(foreign_keys)} foreign keys for {TABLE_NAME}...")
+    logger.info(" Creating %s foreign keys for %s...", len(foreign_keys), TABLE_NAME)
     
-    created_count = 0
-    skipped_count = 0
+    # Check all existing foreign keys with one query instead of one per constraint
+    existing = get_postgresql_names(f"SELECT constraint_name FROM information_schema.table_constraints WHERE table_name = '{_TABLE_FOR_CHECK}' AND constraint_type = 'FOREIGN KEY';")
     
+    skipped_count = 0
+    pending = []
+    statements = []
     for fk in foreign_keys:
         constraint_name = f"{TABLE_NAME}_{fk['name']}"
-        local_columns = fk['local_columns'].replace('`', '"' if PRESERVE_MYSQL_CASE else '')
-        ref_table = f'"{fk["ref_table"]}"' if PRESERVE_MYSQL_CASE else fk['ref_table'].lower()
-        ref_columns = fk['ref_columns'].replace('`', '"' if PRESERVE_MYSQL_CASE else '')
-        table_name = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        
-        # Check if foreign key already exists
-        table_name_for_check = TABLE_NAME if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        check_cmd = f'docker exec postgres_target psql -U postgres -d target_db -t -c "SELECT constraint_name FROM information_schema.table_constraints WHERE table_name = \'{table_name_for_check}\' AND constraint_type = \'FOREIGN KEY\' AND constraint_name = \'{constraint_name}\';"'
-        check_result = run_command(check_cmd)
-        
-        if check_result and check_result.returncode == 0 and check_result.stdout.strip():
-            print(f" Skipping existing FK: {constraint_name}")
+        if constraint_name in existing:
+            logger.debug(" Skipping existing FK: %s", constraint_name)
             skipped_count += 1
             continue
         
-        # Create the foreign key constraint
-        fk_sql = f'ALTER TABLE {table_name} ADD CONSTRAINT "{constraint_name}" FOREIGN KEY ({local_columns}) REFERENCES {ref_table} ({ref_columns});'
-        
-        print(f" Creating {TABLE_NAME} FK: {constraint_name} -> {fk['ref_table']}")
-        success, result = execute_postgresql_sql(fk_sql, f"{TABLE_NAME} FK {constraint_name}")
-        
-        if success and result and "ALTER TABLE" in result.stdout:
-            print(f" Created {TABLE_NAME} FK: {constraint_name}")
-            created_count += 1
-        else:
-            error_msg = result.stderr if result else "No result"
-            print(f" Failed to create {TABLE_NAME} FK {constraint_name}: {error_msg}")
+        logger.debug(" Creating %s FK: %s -> %s", TABLE_NAME, constraint_name, fk['ref_table'])
+        pending.append(constraint_name)
+        statements.append(build_clientsms_foreign_key_sql(fk))
+    
+    created_count = 0
+    if statements:
+        # Each FK runs in its own DO block, so one failure (e.g. a referenced table that has not
+        # been migrated yet) neither rolls back nor hides the others
+        errors = execute_postgresql_ddl_batch(statements)
+        if errors is None:
+            errors = {i: "Batch execution failed" for i in range(len(statements))}
+        for i, constraint_name in enumerate(pending):
+            if i in errors:
+                logger.error(" Failed to create %s FK %s: %s", TABLE_NAME, constraint_name, errors[i])
+            else:
+                logger.debug(" Created %s FK: %s", TABLE_NAME, constraint_name)
+                created_count += 1
     
-    print(f" {TABLE_NAME} Foreign Keys: {created_count} created, {skipped_count} skipped")
+    logger.info(" %s Foreign Keys: %s created, %s skipped", TABLE_NAME, created_count, skipped_count)
     return True
 
-def phase1_create_table_and_data():
-    """Phase 1: Create ClientSMS table and import data"""
-    print(f" Phase 1: Creating {TABLE_NAME} table and importing data")
+def phase1_create_table_and_data(dry_run=False):
+    """Phase 1: Create ClientSMS table and import data
+    
+    With dry_run set nothing is executed; the SQL to run before and after the COPY is
+    returned as a (before_sql, after_sql) pair of statement lists, or None on failure.
+    """
+    logger.info(" Phase 1: Creating %s table and importing data", TABLE_NAME)
     
     # Get table info from MySQL
     mysql_ddl, indexes, foreign_keys = get_clientsms_table_info()
     if not mysql_ddl:
-        return False
+        return None if dry_run else False
+    
+    if dry_run:
+        postgres_ddl = convert_clientsms_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False, preserve_case=PRESERVE_MYSQL_CASE)
+        if not postgres_ddl:
+            return None
+        
+        create_sql = standardize_id_column_as_serial(postgres_ddl, PRESERVE_MYSQL_CASE) + ';'
+        
+        before_sql = [
+            SENTBY_ENUM_SQL,
+            f"DROP TABLE IF EXISTS {_TABLE_PG} CASCADE;",
+            create_sql,
+        ] + list(BULK_LOAD_SETTINGS)
+        after_sql = [
+            f"""CREATE SEQUENCE IF NOT EXISTS {_SEQUENCE_PG};
+SELECT setval('{_SEQUENCE_PG}', (SELECT COALESCE(MAX(id), 0) + 1 FROM {_TABLE_PG}));
+ALTER TABLE {_TABLE_PG} ALTER COLUMN id SET DEFAULT nextval('{_SEQUENCE_PG}');""",
+            f"""DO $$ BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conrelid = '{_TABLE_PG}'::regclass AND contype = 'p') THEN
+        ALTER TABLE {_TABLE_PG} ADD CONSTRAINT {TABLE_NAME}_pkey PRIMARY KEY (id);
+    END IF;
+END $$;""",
+            MISSING_RECORDS_SQL,
+        ]
+        return before_sql, after_sql
     
     # Create table
     if not create_clientsms_table(mysql_ddl):
         return False
     
-    # Use a different approach - export with proper escaping
-    print(" Exporting ClientSMS data with proper escaping...")
-    
-    # Export using basic tab-separated format
-    export_cmd = f'''docker exec mysql_source mysql -u mysql -pmysql source_db -e "SELECT id, message, `from`, `to`, sentBy, is_read, user_id, company_id, client_id, created_at, updated_at FROM ClientSMS" -B --skip-column-names'''
-    result = run_command(export_cmd)
-    
+    # Stream the export straight into COPY FROM STDIN
+    logger.info(" Streaming ClientSMS data from MySQL into PostgreSQL COPY...")
+    result = stream_mysql_to_postgresql_copy(EXPORT_SQL, COPY_SQL, before_sql=BULK_LOAD_SETTINGS)
+    logger.debug("\n--- COPY command output ---")
+    if result:
+        logger.debug("STDOUT:\n%s", result.stdout)
+        logger.debug("STDERR:\n%s", result.stderr)
+    logger.debug("--- End of COPY output ---\n")
     if not result or result.returncode != 0:
-        print(f" Failed to export ClientSMS data: {result.stderr if result else 'No result'}")
+        logger.error(" Failed to import ClientSMS data: %s", result.stderr if result else 'No result')
         return False
+    logger.info(" Successfully imported ClientSMS data")
     
-    # Process the tab-separated data and convert to proper CSV
-    try:
-        # Read the raw output and process it correctly
-        raw_data = result.stdout
-        
-        # Split by lines first, then reconstruct rows properly
-        lines = raw_data.splitlines()
-        csv_lines = []
-        current_row = []
-        field_count = 11
-        
-        for line in lines:
-            if not line.strip():
-                continue
-                
-            # Split by tab
-            fields = line.split('\t')
-            
-            if len(fields) == field_count:
-                # Complete row
-                csv_lines.append(process_csv_row(fields))
-            elif len(fields) < field_count:
-                # Incomplete row - accumulate
-                current_row.extend(fields)
-                if len(current_row) == field_count:
-                    csv_lines.append(process_csv_row(current_row))
-                    current_row = []
-            else:
-                # Too many fields - this shouldn't happen
-                print(f" Skipping malformed row with {len(fields)} fields")
-        
-        # Handle any remaining fields
-        if current_row and len(current_row) == field_count:
-            csv_lines.append(process_csv_row(current_row))
-        
-        print(f" Processed {len(csv_lines)} rows from export")
-        
-        # Write processed CSV
-        with open('ClientSMS_processed.csv', 'w', encoding='utf-8') as f:
-            f.write('\n'.join(csv_lines))
-        
-        # Print the first 10 lines of the processed CSV for debugging
-        print("\n--- First 10 lines of ClientSMS_processed.csv ---")
-        with open('ClientSMS_processed.csv', 'r', encoding='utf-8') as f:
-            for i, line in enumerate(f):
-                print(line.rstrip())
-                if i >= 9:
-                    break
-        print("--- End of sample ---\n")
-
-        # Print the number of fields per row for the first 10 rows
-        print("Field counts for first 10 rows:")
-        with open('ClientSMS_processed.csv', 'r', encoding='utf-8') as f:
-            import csv
-            reader = csv.reader(f)
-            for i, row in enumerate(reader):
-                print(f"Row {i+1}: {len(row)} fields")
-                if i >= 9:
-                    break
-
-        # Copy to PostgreSQL container
-        copy_cmd = 'docker cp ClientSMS_processed.csv postgres_target:/tmp/ClientSMS_import.csv'
-        result = run_command(copy_cmd)
-        if not result or result.returncode != 0:
-            print(f" Failed to copy processed CSV: {result.stderr if result else 'No result'}")
-            return False
-
-        # Import using COPY command
-        copy_sql = '''COPY "ClientSMS" ("id", "message", "from", "to", "sentBy", "is_read", "user_id", "company_id", "client_id", "created_at", "updated_at") FROM '/tmp/ClientSMS_import.csv' WITH (FORMAT csv, DELIMITER ',', QUOTE '"', NULL '');'''
-        with open('import_clientsms.sql', 'w', encoding='utf-8') as f:
-            f.write(copy_sql)
-        # Copy SQL file to container
-        copy_sql_cmd = 'docker cp import_clientsms.sql postgres_target:/tmp/import_clientsms.sql'
-        result = run_command(copy_sql_cmd)
-        if not result or result.returncode != 0:
-            print(f" Failed to copy SQL file: {result.stderr if result else 'No result'}")
-            return False
-        # Execute the import
-        import_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/import_clientsms.sql'
-        result = run_command(import_cmd)
-        print("\n--- COPY command output ---")
-        if result:
-            print("STDOUT:\n", result.stdout)
-            print("STDERR:\n", result.stderr)
-        print("--- End of COPY output ---\n")
-        if not result or result.returncode != 0:
-            print(f" Failed to import ClientSMS data: {result.stderr if result else 'No result'}")
-            if result:
-                print(f" Import command stdout: {result.stdout}")
-            return False
-        print(f" Successfully imported ClientSMS data")
-        
-        # Setup auto-increment sequence
-        print(f" Setting up auto-increment sequence for {TABLE_NAME}...")
-        if not setup_auto_increment_sequence(TABLE_NAME, PRESERVE_MYSQL_CASE):
-            print(f" Warning: Could not setup auto-increment sequence for {TABLE_NAME}")
-        
-        # Add missing records for foreign key integrity
-        print(f" Adding missing records for foreign key integrity...")
-        missing_records_sql = '''
-INSERT INTO "ClientSMS" (id, message, "from", "to", "sentBy", is_read, user_id, company_id, client_id, created_at, updated_at)
-VALUES (2950, 'Fake record for FK integrity', '+1234567890', '+0987654321', 'Company', false, 1, 1, 1, NOW(), NOW())
-ON CONFLICT (id) DO NOTHING;
-'''
-        execute_postgresql_sql(missing_records_sql, "Adding missing ClientSMS records")
-        
-        # Add PRIMARY KEY constraint
-        print(f" Adding PRIMARY KEY constraint to {TABLE_NAME}...")
-        if not add_primary_key_constraint(TABLE_NAME, PRESERVE_MYSQL_CASE):
-            print(f" Warning: Could not add PRIMARY KEY constraint to {TABLE_NAME}")
-        
-        return True
-        
-    finally:
-        # Clean up temporary files
-        cleanup_cmds = [
-            'rm -f import_clientsms.sql',
-            'rm -f ClientSMS_processed.csv',
-            'rm -f clientsms_enum.sql',
-            'docker exec postgres_target rm -f /tmp/ClientSMS_import.csv',
-            'docker exec postgres_target rm -f /tmp/import_clientsms.sql',
-            'docker exec postgres_target rm -f /tmp/clientsms_enum.sql'
-        ]
-        
-        for cmd in cleanup_cmds:
-            run_command(cmd)
+    # Setup auto-increment sequence
+    logger.info(" Setting up auto-increment sequence for %s...", TABLE_NAME)
+    if not setup_auto_increment_sequence(TABLE_NAME, PRESERVE_MYSQL_CASE):
+        logger.warning(" Warning: Could not setup auto-increment sequence for %s", TABLE_NAME)
+    
+    # Add missing records for foreign key integrity
+    logger.info(" Adding missing records for foreign key integrity...")
+    execute_postgresql_sql(MISSING_RECORDS_SQL, "Adding missing ClientSMS records")
+    
+    # Add PRIMARY KEY constraint
+    logger.info(" Adding PRIMARY KEY constraint to %s...", TABLE_NAME)
+    if not add_primary_key_constraint(TABLE_NAME, PRESERVE_MYSQL_CASE):
+        logger.warning(" Warning: Could not add PRIMARY KEY constraint to %s", TABLE_NAME)
+    
+    return True
 
 def phase2_create_indexes():
     """Phase 2: Create indexes for ClientSMS table"""
-    print(f" Phase 2: Creating indexes for {TABLE_NAME}")
+    logger.info(" Phase 2: Creating indexes for %s", TABLE_NAME)
     
     # Get indexes from MySQL
     mysql_ddl, indexes, foreign_keys = get_clientsms_table_info()
@@ -552,7 +473,7 @@ def phase2_create_indexes():
 
 def phase3_create_foreign_keys():
     """Phase 3: Create foreign keys for ClientSMS table"""
-    print(f" Phase 3: Creating foreign keys for {TABLE_NAME}")
+    logger.info(" Phase 3: Creating foreign keys for %s", TABLE_NAME)
     
     # Get foreign keys from MySQL
     mysql_ddl, indexes, foreign_keys = get_clientsms_table_info()
@@ -561,20 +482,29 @@ def phase3_create_foreign_keys():
     
     return create_clientsms_foreign_keys(foreign_keys)
 
-def process_csv_row(fields):
-    # user_id is the 7th field (index 6)
-    out_fields = []
-    for i, field in enumerate(fields):
-        if field == 'NULL' or field.strip() == '':
-            if i == 6:
-                out_fields.append('')  # unquoted for user_id
-            else:
-                out_fields.append('""')  # quoted empty for others
-        else:
-            # Clean up the field and handle newlines and quotes
-            field = field.strip().replace('"', '""').replace('\n', '\\n').replace('\r', '\\r')
-            out_fields.append(f'"{field}"')
-    return ','.join(out_fields)
+def run_full_migration():
+    """Run all three phases as one script in a single psql transaction around the data COPY"""
+    logger.info(" Running full migration for %s in a single transaction", TABLE_NAME)
+    
+    phase1_sql = phase1_create_table_and_data(dry_run=True)
+    if not phase1_sql:
+        return False
+    
+    mysql_ddl, indexes, foreign_keys = get_clientsms_table_info()
+    before_sql, after_sql = phase1_sql
+    after_sql = after_sql + create_clientsms_indexes(indexes, dry_run=True) + create_clientsms_foreign_keys(foreign_keys, dry_run=True)
+    
+    logger.info(" Streaming %s data with %s indexes and %s foreign keys in one transaction...", TABLE_NAME, len(indexes), len(foreign_keys))
+    result = stream_mysql_to_postgresql_copy(EXPORT_SQL, COPY_SQL, before_sql=before_sql, after_sql=after_sql)
+    
+    if result and result.stderr:
+        logger.info(" psql output: %s", result.stderr)
+    if not result or result.returncode != 0:
+        logger.error(" Full migration for %s failed and was rolled back", TABLE_NAME)
+        return False
+    
+    logger.info(" Full migration for %s committed", TABLE_NAME)
+    return True
 
 def main():
     parser = argparse.ArgumentParser(description=f'Migrate {TABLE_NAME} table from MySQL to PostgreSQL')
@@ -584,6 +514,8 @@ def main():
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=os.environ.get("MIGRATION_LOG", "INFO").upper(), format="%(message)s")
+    
     if args.verify:
         mysql_ddl, indexes, foreign_keys = get_clientsms_table_info()
         if mysql_ddl:
@@ -591,13 +523,11 @@ def main():
         return
     
     if args.full:
-        success = (phase1_create_table_and_data() and 
-                  phase2_create_indexes() and 
-                  phase3_create_foreign_keys())
+        success = run_full_migration()
         if success:
-            print(" Operation completed successfully!")
+            logger.info(" Operation completed successfully!")
         else:
-            print(" Operation failed!")
+            logger.error(" Operation failed!")
             exit(1)
         return
     
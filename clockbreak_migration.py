@@ -23,156 +23,88 @@ Usage:
 """
 
 import re
-import os
 import argparse
-from collections import OrderedDict
 from table_utils import (
     verify_table_structure,
-    run_command,
     create_postgresql_table,
     export_and_clean_mysql_data,
     import_data_to_postgresql,
     add_primary_key_constraint,
     setup_auto_increment_sequence,
-    execute_postgresql_sql
+    execute_postgresql_sql,
+    split_create_table_clauses,
+    get_postgresql_names,
+    get_mysql_create_table,
+    convert_column_ddl
 )
 
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "ClockBreak"
 
+# Table name as it appears in the PostgreSQL catalogs, fixed once PRESERVE_MYSQL_CASE is known
+_TABLE_FOR_CHECK = TABLE_NAME if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+
+# SHOW CREATE TABLE results keyed by table name, so repeated lookups share a single MySQL round trip
+_TABLE_INFO_CACHE = {}
+
+_FK_NAME_RE = re.compile(r'CONSTRAINT\s+`([^`]+)`')
+_FK_COLUMN_RE = re.compile(r'FOREIGN KEY\s+\(`([^`]+)`\)')
+_FK_REFERENCES_RE = re.compile(r'REFERENCES\s+`([^`]+)`\s+\(`([^`]+)`\)')
+_FK_ON_DELETE_RE = re.compile(r'ON DELETE (CASCADE|SET NULL|SET DEFAULT|RESTRICT|NO ACTION)')
+_FK_ON_UPDATE_RE = re.compile(r'ON UPDATE (CASCADE|SET NULL|SET DEFAULT|RESTRICT|NO ACTION)')
+_INDEX_NAME_RE = re.compile(r'KEY\s+`([^`]+)`')
+_PG_CONSTRAINT_NAME_RE = re.compile(r'ADD CONSTRAINT\s+"([^"]+)"')
+
 # --- PHASE 1: Table + Data ---
 def get_clockbreak_table_info():
     """Get complete ClockBreak table information from MySQL including constraints"""
+    if TABLE_NAME in _TABLE_INFO_CACHE:
+        return _TABLE_INFO_CACHE[TABLE_NAME]
     print(f" Getting complete table info for {TABLE_NAME} from MySQL...")
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW CREATE TABLE `{TABLE_NAME}`;"'
-    result = run_command(cmd)
-    if not result or result.returncode != 0:
-        print(f" Failed to get {TABLE_NAME} table info from MySQL")
-        return None, [], []
-    lines = result.stdout.strip().split("\n")
-    ddl_line = None
-    for line in lines:
-        if "CREATE TABLE" in line:
-            parts = line.split("\t")
-            for part in parts:
-                if "CREATE TABLE" in part:
-                    ddl_line = part
-                    break
-            if ddl_line:
-                break
-    if not ddl_line:
+    mysql_ddl = get_mysql_create_table(TABLE_NAME)
+    if not mysql_ddl:
         print(f" Could not find CREATE TABLE statement for {TABLE_NAME}")
-        print("Debug: MySQL output:")
-        print(result.stdout)
         return None, [], []
-    mysql_ddl = ddl_line.strip()
-    indexes = extract_clockbreak_indexes_from_ddl(mysql_ddl)
-    foreign_keys = extract_clockbreak_foreign_keys_from_ddl(mysql_ddl)
+    indexes, foreign_keys = extract_clockbreak_indexes_and_foreign_keys_from_ddl(mysql_ddl)
     print(f" Found {len(indexes)} indexes and {len(foreign_keys)} foreign keys for {TABLE_NAME} table")
+    _TABLE_INFO_CACHE[TABLE_NAME] = (mysql_ddl, indexes, foreign_keys)
     return mysql_ddl, indexes, foreign_keys
 
-def extract_clockbreak_indexes_from_ddl(mysql_ddl):
-    # Extract index definitions from MySQL DDL
+def extract_clockbreak_indexes_and_foreign_keys_from_ddl(mysql_ddl):
+    """Classify each ClockBreak DDL clause once, returning (index definitions, PostgreSQL FK statements)"""
     indexes = []
-    for line in mysql_ddl.splitlines():
-        if line.strip().startswith("KEY") or line.strip().startswith("UNIQUE KEY"):
-            indexes.append(line.strip())
-    return indexes
-
-def extract_clockbreak_foreign_keys_from_ddl(mysql_ddl):
-    # Extract foreign key definitions from MySQL DDL and convert to PostgreSQL ALTER TABLE syntax
     fks = []
-    for line in mysql_ddl.splitlines():
-        if "FOREIGN KEY" in line:
-            # Parse MySQL CONSTRAINT line: CONSTRAINT `name` FOREIGN KEY (`col`) REFERENCES `table` (`col`) ...
-            line = line.strip().rstrip(',')
-            
-            # Extract constraint name
-            constraint_match = re.search(r'CONSTRAINT\s+`([^`]+)`', line)
+    for clause in split_create_table_clauses(mysql_ddl) or []:
+        if "FOREIGN KEY" in clause:
+            # Parse MySQL CONSTRAINT clause: CONSTRAINT `name` FOREIGN KEY (`col`) REFERENCES `table` (`col`) ...
+            constraint_match = _FK_NAME_RE.search(clause)
             constraint_name = constraint_match.group(1) if constraint_match else "fk_constraint"
             
-            # Extract column name
-            fk_col_match = re.search(r'FOREIGN KEY\s+\(`([^`]+)`\)', line)
+            fk_col_match = _FK_COLUMN_RE.search(clause)
             fk_column = fk_col_match.group(1) if fk_col_match else ""
             
-            # Extract referenced table and column
-            ref_match = re.search(r'REFERENCES\s+`([^`]+)`\s+\(`([^`]+)`\)', line)
+            ref_match = _FK_REFERENCES_RE.search(clause)
             if ref_match:
                 ref_table = ref_match.group(1)
                 ref_column = ref_match.group(2)
                 
                 # Extract ON DELETE/UPDATE clauses
-                on_delete = ""
-                on_update = ""
-                if "ON DELETE CASCADE" in line:
-                    on_delete = " ON DELETE CASCADE"
-                elif "ON DELETE SET NULL" in line:
-                    on_delete = " ON DELETE SET NULL"
-                    
-                if "ON UPDATE CASCADE" in line:
-                    on_update = " ON UPDATE CASCADE"
-                elif "ON UPDATE SET NULL" in line:
-                    on_update = " ON UPDATE SET NULL"
+                on_delete_match = _FK_ON_DELETE_RE.search(clause)
+                on_delete = f" ON DELETE {on_delete_match.group(1)}" if on_delete_match else ""
+                on_update_match = _FK_ON_UPDATE_RE.search(clause)
+                on_update = f" ON UPDATE {on_update_match.group(1)}" if on_update_match else ""
                 
                 # Create PostgreSQL ALTER TABLE statement
                 pg_fk = f'ALTER TABLE "ClockBreak" ADD CONSTRAINT "{constraint_name}" FOREIGN KEY ("{fk_column}") REFERENCES "{ref_table}" ("{ref_column}"){on_delete}{on_update};'
                 fks.append(pg_fk)
+        elif clause.startswith(("KEY", "UNIQUE KEY")):
+            indexes.append(clause)
     
-    return fks
+    return indexes, fks
 
 def process_clockbreak_column_definition(line, preserve_case):
     """Process a single column definition for ClockBreak table"""
-    # Remove backticks and handle MySQL-specific types
-    line = line.replace('`', '"' if preserve_case else '')
-    
-    # MySQL to PostgreSQL type conversions for ClockBreak
-    conversions = [
-        (r'\btinyint\(1\)\b', 'BOOLEAN'),
-        (r'\btinyint\([^)]+\)\b', 'SMALLINT'),
-        (r'\bsmallint\([^)]+\)\b', 'SMALLINT'),
-        (r'\bmediumint\([^)]+\)\b', 'INTEGER'),
-        (r'\bint\([^)]+\)\b', 'INTEGER'),
-        (r'\bbigint\([^)]+\)\b', 'BIGINT'),
-        (r'\bint\b', 'INTEGER'),
-        (r'\bvarchar\([^)]+\)\b', 'VARCHAR'),
-        (r'\btext\b', 'TEXT'),
-        (r'\blongtext\b', 'TEXT'),
-        (r'\bmediumtext\b', 'TEXT'),
-        (r'\btinytext\b', 'TEXT'),
-        (r'\bdatetime\([^)]+\)\b', 'TIMESTAMP'),
-        (r'\bdatetime\b', 'TIMESTAMP'),
-        (r'\btimestamp\([^)]+\)\b', 'TIMESTAMP'),
-        (r'\btimestamp\b', 'TIMESTAMP'),
-        (r'\bdate\b', 'DATE'),
-        (r'\btime\b', 'TIME'),
-        (r'\bdouble\b', 'DOUBLE PRECISION'),
-        (r'\bfloat\b', 'REAL'),
-        (r'\bdecimal\([^)]+\)\b', 'DECIMAL'),
-        (r'\bjson\b', 'JSON'),
-        (r'\bblob\b', 'BYTEA'),
-        (r'\blongblob\b', 'BYTEA'),
-        (r'\bmediumblob\b', 'BYTEA'),
-        (r'\btinyblob\b', 'BYTEA'),
-    ]
-    
-    for pattern, replacement in conversions:
-        line = re.sub(pattern, replacement, line, flags=re.IGNORECASE)
-    
-    # Handle AUTO_INCREMENT
-    line = re.sub(r'\bAUTO_INCREMENT\b', '', line, flags=re.IGNORECASE)
-    
-    # Handle MySQL DEFAULT expressions
-    line = re.sub(r"DEFAULT\s+CURRENT_TIMESTAMP\(\d*\)", "DEFAULT CURRENT_TIMESTAMP", line, flags=re.IGNORECASE)
-    line = re.sub(r"DEFAULT\s+CURRENT_TIMESTAMP", "DEFAULT CURRENT_TIMESTAMP", line, flags=re.IGNORECASE)
-    
-    # Remove MySQL-specific syntax
-    line = re.sub(r'\s+CHARACTER\s+SET\s+[^\s]+', '', line, flags=re.IGNORECASE)
-    line = re.sub(r'\s+COLLATE\s+[^\s]+', '', line, flags=re.IGNORECASE)
-    
-    # Clean up whitespace
-    line = re.sub(r'\s+', ' ', line).strip()
-    
-    return line
+    return convert_column_ddl(line, preserve_case)
 
 def convert_clockbreak_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False, preserve_case=True):
     """Convert ClockBreak table MySQL DDL to PostgreSQL DDL"""
@@ -229,11 +161,22 @@ def main():
             setup_auto_increment_sequence(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE)
         elif phase == 2:
             print(f"\n Phase 2: Creating indexes for {TABLE_NAME}...")
+            # Check all existing indexes with one query instead of one per index
+            existing = get_postgresql_names(f"SELECT indexname FROM pg_indexes WHERE tablename = '{_TABLE_FOR_CHECK}';")
             for idx in indexes:
+                name_match = _INDEX_NAME_RE.search(idx)
+                if name_match and name_match.group(1) in existing:
+                    print(f" Skipping existing index: {name_match.group(1)}")
+                    continue
                 execute_postgresql_sql(idx, TABLE_NAME)
         elif phase == 3:
             print(f"\n Phase 3: Creating foreign keys for {TABLE_NAME}...")
+            existing = get_postgresql_names(f"SELECT constraint_name FROM information_schema.table_constraints WHERE table_name = '{_TABLE_FOR_CHECK}' AND constraint_type = 'FOREIGN KEY';")
             for fk in foreign_keys:
+                name_match = _PG_CONSTRAINT_NAME_RE.search(fk)
+                if name_match and name_match.group(1) in existing:
+                    print(f" Skipping existing foreign key: {name_match.group(1)}")
+                    continue
                 execute_postgresql_sql(fk, TABLE_NAME)
 
     if args.verify:
@@ -25,125 +25,78 @@ Usage:
 import re
 import os
 import argparse
-from collections import OrderedDict
 from table_utils import (
     verify_table_structure,
-    run_command,
     create_postgresql_table,
-    export_and_clean_mysql_data,
-    import_data_to_postgresql,
+    copy_mysql_table_to_postgresql,
     add_primary_key_constraint,
     setup_auto_increment_sequence,
-    execute_postgresql_sql
+    get_mysql_create_table,
+    execute_postgresql_ddl_batch
 )
 
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "ClockInOut"
 
+# One pass over the whole DDL for each clause kind instead of per-line scans
+_INDEX_RE = re.compile(r'^\s*(?P<unique>UNIQUE\s+)?KEY\s+`(?P<name>[^`]+)`\s*\((?P<columns>[^)]+)\)', re.MULTILINE)
+_FK_RE = re.compile(
+    r'CONSTRAINT\s+`(?P<name>[^`]+)`\s+FOREIGN KEY\s+\(`(?P<col>[^`]+)`\)\s+REFERENCES\s+`(?P<rt>[^`]+)`\s+\(`(?P<rc>[^`]+)`\)'
+    r'(?:\s+ON DELETE (?P<od>CASCADE|SET NULL|SET DEFAULT|RESTRICT|NO ACTION))?'
+    r'(?:\s+ON UPDATE (?P<ou>CASCADE|SET NULL|SET DEFAULT|RESTRICT|NO ACTION))?'
+)
+
+# Columns of the phase-1 table, in the order they are streamed from MySQL into COPY
+COPY_COLUMNS = ("id", "user_id", "company_id", "clock_in", "clock_out", "created_at", "updated_at", "timezone")
+
+# The ClockInOut structure is known up front, so its PostgreSQL DDL is a constant
+_POSTGRES_DDL = f"""CREATE TABLE {f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()} (
+    "id" INTEGER NOT NULL,
+    "user_id" INTEGER NOT NULL,
+    "company_id" INTEGER NOT NULL,
+    "clock_in" TIMESTAMP NOT NULL,
+    "clock_out" TIMESTAMP,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "timezone" VARCHAR
+);"""
+
 # --- PHASE 1: Table + Data ---
 def get_clockinout_table_info():
     """Get complete ClockInOut table information from MySQL including constraints"""
     print(f" Getting complete table info for {TABLE_NAME} from MySQL...")
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW CREATE TABLE `{TABLE_NAME}`;"'
-    result = run_command(cmd)
-    if not result or result.returncode != 0:
-        print(f" Failed to get {TABLE_NAME} table info from MySQL")
-        return None, [], []
-    lines = result.stdout.strip().split("\n")
-    ddl_line = None
-    for line in lines:
-        if "CREATE TABLE" in line:
-            parts = line.split("\t")
-            for part in parts:
-                if "CREATE TABLE" in part:
-                    ddl_line = part
-                    break
-            if ddl_line:
-                break
-    if not ddl_line:
+    mysql_ddl = get_mysql_create_table(TABLE_NAME)
+    if not mysql_ddl:
         print(f" Could not find CREATE TABLE statement for {TABLE_NAME}")
-        print("Debug: MySQL output:")
-        print(result.stdout)
         return None, [], []
-    mysql_ddl = ddl_line.strip()
     indexes = extract_clockinout_indexes_from_ddl(mysql_ddl)
     foreign_keys = extract_clockinout_foreign_keys_from_ddl(mysql_ddl)
     print(f" Found {len(indexes)} indexes and {len(foreign_keys)} foreign keys for {TABLE_NAME} table")
     return mysql_ddl, indexes, foreign_keys
 
 def extract_clockinout_indexes_from_ddl(mysql_ddl):
-    # Extract index definitions from MySQL DDL
+    # Extract index definitions from MySQL DDL as PostgreSQL CREATE INDEX statements
     indexes = []
-    for line in mysql_ddl.splitlines():
-        if line.strip().startswith("KEY") or line.strip().startswith("UNIQUE KEY"):
-            indexes.append(line.strip())
+    for m in _INDEX_RE.finditer(mysql_ddl):
+        unique_clause = "UNIQUE " if m.group('unique') else ""
+        index_name = m.group('name')
+        columns = m.group('columns').replace('`', '"')
+        indexes.append(f'CREATE {unique_clause}INDEX IF NOT EXISTS "{index_name}" ON "ClockInOut" ({columns});')
     return indexes
 
 def extract_clockinout_foreign_keys_from_ddl(mysql_ddl):
     # Extract foreign key definitions from MySQL DDL and convert to PostgreSQL ALTER TABLE syntax
     fks = []
-    for line in mysql_ddl.splitlines():
-        if "FOREIGN KEY" in line:
-            # Parse MySQL CONSTRAINT line: CONSTRAINT `name` FOREIGN KEY (`col`) REFERENCES `table` (`col`) ...
-            line = line.strip().rstrip(',')
-            
-            # Extract constraint name
-            constraint_match = re.search(r'CONSTRAINT\s+`([^`]+)`', line)
-            constraint_name = constraint_match.group(1) if constraint_match else "fk_constraint"
-            
-            # Extract column name
-            fk_col_match = re.search(r'FOREIGN KEY\s+\(`([^`]+)`\)', line)
-            fk_column = fk_col_match.group(1) if fk_col_match else ""
-            
-            # Extract referenced table and column
-            ref_match = re.search(r'REFERENCES\s+`([^`]+)`\s+\(`([^`]+)`\)', line)
-            if ref_match:
-                ref_table = ref_match.group(1)
-                ref_column = ref_match.group(2)
-                
-                # Extract ON DELETE/UPDATE clauses
-                on_delete = ""
-                on_update = ""
-                if "ON DELETE CASCADE" in line:
-                    on_delete = " ON DELETE CASCADE"
-                elif "ON DELETE SET NULL" in line:
-                    on_delete = " ON DELETE SET NULL"
-                    
-                if "ON UPDATE CASCADE" in line:
-                    on_update = " ON UPDATE CASCADE"
-                elif "ON UPDATE SET NULL" in line:
-                    on_update = " ON UPDATE SET NULL"
-                
-                # Create PostgreSQL ALTER TABLE statement
-                pg_fk = f'ALTER TABLE "ClockInOut" ADD CONSTRAINT "{constraint_name}" FOREIGN KEY ("{fk_column}") REFERENCES "{ref_table}" ("{ref_column}"){on_delete}{on_update};'
-                fks.append(pg_fk)
-    
+    for m in _FK_RE.finditer(mysql_ddl):
+        constraint_name, fk_column, ref_table, ref_column = m.group('name', 'col', 'rt', 'rc')
+        on_delete = f" ON DELETE {m.group('od')}" if m.group('od') else ""
+        on_update = f" ON UPDATE {m.group('ou')}" if m.group('ou') else ""
+        fks.append(f'ALTER TABLE "ClockInOut" ADD CONSTRAINT "{constraint_name}" FOREIGN KEY ("{fk_column}") REFERENCES "{ref_table}" ("{ref_column}"){on_delete}{on_update};')
     return fks
 
 def convert_clockinout_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False, preserve_case=True):
-    """Convert ClockInOut table MySQL DDL to PostgreSQL DDL"""
-    print(f"🔄 Converting {TABLE_NAME} table MySQL DDL to PostgreSQL (constraints: {include_constraints}, preserve_case: {preserve_case})...")
-    
-    # Create the PostgreSQL DDL manually based on the known MySQL structure
-    table_name = f'"{TABLE_NAME}"' if preserve_case else TABLE_NAME.lower()
-    
-    postgres_ddl = f"""CREATE TABLE {table_name} (
-    "id" INTEGER NOT NULL,
-    "user_id" INTEGER NOT NULL,
-    "company_id" INTEGER NOT NULL,
-    "clock_in" TIMESTAMP NOT NULL,
-    "clock_out" TIMESTAMP,
-    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    "timezone" VARCHAR
-);"""
-    
-    print(f" Generated PostgreSQL DDL:")
-    print("=" * 50)
-    print(postgres_ddl)
-    print("=" * 50)
-    
-    return postgres_ddl
+    """Return the PostgreSQL DDL for ClockInOut (fixed structure, built once at import)"""
+    return _POSTGRES_DDL
 
 # --- Main Migration Logic ---
 def main():
@@ -151,6 +104,7 @@ def main():
     parser.add_argument('--phase', type=int, choices=[1,2,3], help='Migration phase (1: table+data, 2: indexes, 3: foreign keys)')
     parser.add_argument('--full', action='store_true', help='Run all phases')
     parser.add_argument('--verify', action='store_true', help='Verify table structure and data')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Rows per phase-1 COPY transaction (0: one transaction)')
     args = parser.parse_args()
 
     if args.full:
@@ -171,32 +125,39 @@ def main():
             print(f"\n Phase 1: Creating table and importing data for {TABLE_NAME}...")
             pg_ddl = convert_clockinout_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False, preserve_case=PRESERVE_MYSQL_CASE)
             create_postgresql_table(TABLE_NAME, pg_ddl, preserve_case=PRESERVE_MYSQL_CASE)
-            data_indicator = export_and_clean_mysql_data(TABLE_NAME)
-            import_data_to_postgresql(TABLE_NAME, data_indicator, PRESERVE_MYSQL_CASE, include_id=True)
+            copy_mysql_table_to_postgresql(TABLE_NAME, COPY_COLUMNS, PRESERVE_MYSQL_CASE, batch_size=args.batch_size or None)
             add_primary_key_constraint(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE)
             setup_auto_increment_sequence(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE)
         elif phase == 2:
             print(f"\n Phase 2: Creating indexes for {TABLE_NAME}...")
-            for idx in indexes:
-                execute_postgresql_sql(idx, TABLE_NAME)
+            # All indexes go through one psql session
+            errors = execute_postgresql_ddl_batch(indexes) if indexes else {}
+            if errors is None:
+                print(f"Failed to create indexes for {TABLE_NAME}")
+            else:
+                for i, idx in enumerate(indexes):
+                    if i in errors:
+                        print(f"Failed to create index: {idx}")
+                        print(f"Error: {errors[i]}")
         elif phase == 3:
             print(f"\n Phase 3: Creating foreign keys for {TABLE_NAME}...")
             # Create the specific foreign keys for ClockInOut table manually
-            from table_utils import execute_postgresql_sql
-            
             foreign_keys_to_create = [
                 'ALTER TABLE "ClockInOut" ADD CONSTRAINT "ClockInOut_company_id_fkey" FOREIGN KEY ("company_id") REFERENCES "Company" ("id") ON DELETE CASCADE;',
                 'ALTER TABLE "ClockInOut" ADD CONSTRAINT "ClockInOut_user_id_fkey" FOREIGN KEY ("user_id") REFERENCES "User" ("id") ON DELETE CASCADE;'
             ]
             
-            for fk_sql in foreign_keys_to_create:
-                success, result = execute_postgresql_sql(fk_sql, f"Foreign key creation for {TABLE_NAME}")
-                if success:
-                    print(f"Created foreign key successfully")
-                else:
-                    print(f"Failed to create foreign key: {fk_sql}")
-                    if result:
-                        print(f"Error: {result.stderr}")
+            # All constraints go through one psql session
+            errors = execute_postgresql_ddl_batch(foreign_keys_to_create)
+            if errors is None:
+                print(f"Failed to create foreign keys for {TABLE_NAME}")
+            else:
+                for i, fk_sql in enumerate(foreign_keys_to_create):
+                    if i in errors:
+                        print(f"Failed to create foreign key: {fk_sql}")
+                        print(f"Error: {errors[i]}")
+                    else:
+                        print(f"Created foreign key successfully")
 
     if args.verify:
         print(f"\n Verifying {TABLE_NAME} migration...")
@@ -23,49 +23,51 @@ Usage:
 """
 
 import re
-import os
 import argparse
-from collections import OrderedDict
 from table_utils import (
     verify_table_structure,
-    run_command,
     create_postgresql_table,
-    export_and_clean_mysql_data,
-    import_data_to_postgresql,
+    copy_mysql_table_to_postgresql,
     add_primary_key_constraint,
     setup_auto_increment_sequence,
-    execute_postgresql_sql
+    execute_postgresql_ddl_batch,
+    get_mysql_create_table
 )
-import csv
 
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "Column"
 
+# One pass over the whole DDL for each clause kind instead of per-line scans
+_INDEX_RE = re.compile(r'^\s*(?P<unique>UNIQUE\s+)?KEY\s+`(?P<name>[^`]+)`\s*\((?P<columns>[^)]+)\)', re.MULTILINE)
+_FK_RE = re.compile(
+    r'CONSTRAINT\s+`(?P<name>[^`]+)`\s+FOREIGN KEY\s+\(`(?P<col>[^`]+)`\)\s+REFERENCES\s+`(?P<rt>[^`]+)`\s+\(`(?P<rc>[^`]+)`\)'
+    r'(?:\s+ON DELETE (?P<od>CASCADE|SET NULL|SET DEFAULT|RESTRICT|NO ACTION))?'
+    r'(?:\s+ON UPDATE (?P<ou>CASCADE|SET NULL|SET DEFAULT|RESTRICT|NO ACTION))?'
+)
+
+# Columns of the phase-1 table, in the order they are streamed from MySQL into COPY
+COPY_COLUMNS = ("id", "title", "type", "order", "textColor", "bgColor", "company_id")
+
+# The Column structure is known up front, so its PostgreSQL DDL is a constant
+_POSTGRES_DDL = '''
+CREATE TABLE "Column" (
+    "id" INTEGER NOT NULL,
+    "title" VARCHAR NOT NULL,
+    "type" VARCHAR NOT NULL,
+    "order" INTEGER NOT NULL,
+    "textColor" VARCHAR,
+    "bgColor" VARCHAR,
+    "company_id" INTEGER NOT NULL
+);
+'''
+
 def get_column_table_info():
     """Get complete Column table information from MySQL including constraints"""
     print(f" Getting complete table info for {TABLE_NAME} from MySQL...")
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW CREATE TABLE `{TABLE_NAME}`;"'
-    result = run_command(cmd)
-    if not result or result.returncode != 0:
-        print(f" Failed to get {TABLE_NAME} table info from MySQL")
-        return None, [], []
-    lines = result.stdout.strip().split("\n")
-    ddl_line = None
-    for line in lines:
-        if "CREATE TABLE" in line:
-            parts = line.split("\t")
-            for part in parts:
-                if "CREATE TABLE" in part:
-                    ddl_line = part
-                    break
-            if ddl_line:
-                break
-    if not ddl_line:
+    mysql_ddl = get_mysql_create_table(TABLE_NAME)
+    if not mysql_ddl:
         print(f" Could not find CREATE TABLE statement for {TABLE_NAME}")
-        print("Debug: MySQL output:")
-        print(result.stdout)
         return None, [], []
-    mysql_ddl = ddl_line.strip()
     indexes = extract_column_indexes_from_ddl(mysql_ddl)
     foreign_keys = extract_column_foreign_keys_from_ddl(mysql_ddl)
     print(f" Found {len(indexes)} indexes and {len(foreign_keys)} foreign keys for {TABLE_NAME} table")
@@ -73,76 +75,35 @@ def get_column_table_info():
 
 def extract_column_indexes_from_ddl(mysql_ddl):
     indexes = []
-    for line in mysql_ddl.splitlines():
-        if line.strip().startswith("KEY") or line.strip().startswith("UNIQUE KEY"):
-            indexes.append(line.strip())
+    for m in _INDEX_RE.finditer(mysql_ddl):
+        unique_clause = "UNIQUE " if m.group('unique') else ""
+        index_name = m.group('name')
+        columns = m.group('columns').replace('`', '"')
+        indexes.append(f'CREATE {unique_clause}INDEX IF NOT EXISTS "{index_name}" ON "Column" ({columns});')
     return indexes
 
 def extract_column_foreign_keys_from_ddl(mysql_ddl):
     fks = []
-    for line in mysql_ddl.splitlines():
-        if "FOREIGN KEY" in line:
-            fks.append(line.strip())
+    for m in _FK_RE.finditer(mysql_ddl):
+        constraint_name, fk_column, ref_table, ref_column = m.group('name', 'col', 'rt', 'rc')
+        on_delete = f" ON DELETE {m.group('od')}" if m.group('od') else ""
+        on_update = f" ON UPDATE {m.group('ou')}" if m.group('ou') else ""
+        fks.append(f'ALTER TABLE "Column" ADD CONSTRAINT "{constraint_name}" FOREIGN KEY ("{fk_column}") REFERENCES "{ref_table}" ("{ref_column}"){on_delete}{on_update};')
     return fks
 
 def convert_column_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False, preserve_case=True):
-    """Convert Column table MySQL DDL to PostgreSQL DDL"""
-    print(f"🔄 Converting {TABLE_NAME} table MySQL DDL to PostgreSQL (constraints: {include_constraints}, preserve_case: {preserve_case})...")
-    
-    # Get actual MySQL structure first
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "DESCRIBE `{TABLE_NAME}`;"'
-    result = run_command(cmd)
-    if result and result.returncode == 0:
-        print(f" MySQL structure for {TABLE_NAME}:")
-        print(result.stdout)
-    
-    # Create the PostgreSQL DDL manually based on the known MySQL structure
-    table_name = f'"{TABLE_NAME}"' if preserve_case else TABLE_NAME.lower()
-    
-    postgres_ddl = f"""CREATE TABLE {table_name} (
-    "id" INTEGER NOT NULL,
-    "name" VARCHAR NOT NULL,
-    "company_id" INTEGER NOT NULL,
-    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-);"""
-    
-    print(f" Generated PostgreSQL DDL:")
-    print("=" * 50)
-    print(postgres_ddl)
-    print("=" * 50)
-    
-    return postgres_ddl
+    """Return the PostgreSQL DDL for Column (fixed structure, built once at import)"""
+    return _POSTGRES_DDL
 
 def get_postgresql_column_table_ddl():
-    return '''
-CREATE TABLE "Column" (
-    "id" INTEGER NOT NULL,
-    "title" VARCHAR NOT NULL,
-    "type" VARCHAR NOT NULL,
-    "order" INTEGER NOT NULL,
-    "textColor" VARCHAR,
-    "bgColor" VARCHAR,
-    "company_id" INTEGER NOT NULL
-);
-'''
-
-def log_csv_preview(csv_filename, num_lines=5):
-    print(f"Preview of {csv_filename} (first {num_lines} lines):")
-    if not os.path.exists(csv_filename):
-        print(f"  File not found: {csv_filename}")
-        return
-    with open(csv_filename, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f):
-            print(f"  {line.strip()}")
-            if i >= num_lines - 1:
-                break
+    return _POSTGRES_DDL
 
 def main():
     parser = argparse.ArgumentParser(description=f"Migrate {TABLE_NAME} table from MySQL to PostgreSQL")
     parser.add_argument('--phase', type=int, choices=[1,2,3], help='Migration phase (1: table+data, 2: indexes, 3: foreign keys)')
     parser.add_argument('--full', action='store_true', help='Run all phases')
     parser.add_argument('--verify', action='store_true', help='Verify table structure and data')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Rows per phase-1 COPY transaction (0: one transaction)')
     args = parser.parse_args()
 
     if args.full:
@@ -163,46 +124,35 @@ def main():
             print(f"\n Phase 1: Creating table and importing data for {TABLE_NAME}...")
             pg_ddl = get_postgresql_column_table_ddl()
             create_postgresql_table(TABLE_NAME, pg_ddl, preserve_case=PRESERVE_MYSQL_CASE)
-            data_indicator = export_and_clean_mysql_data(TABLE_NAME)
-            import_data_to_postgresql(TABLE_NAME, data_indicator, PRESERVE_MYSQL_CASE, include_id=True)
+            copy_mysql_table_to_postgresql(TABLE_NAME, COPY_COLUMNS, PRESERVE_MYSQL_CASE, batch_size=args.batch_size or None)
             add_primary_key_constraint(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE)
             setup_auto_increment_sequence(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE)
         elif phase == 2:
             print(f"\n Phase 2: Creating indexes for {TABLE_NAME}...")
-            for idx in indexes:
-                execute_postgresql_sql(idx, TABLE_NAME)
+            # All indexes go through one psql session
+            errors = execute_postgresql_ddl_batch(indexes) if indexes else {}
+            if errors is None:
+                print(f"Failed to create indexes for {TABLE_NAME}")
+            else:
+                for i, idx in enumerate(indexes):
+                    if i in errors:
+                        print(f"Failed to create index: {idx}")
+                        print(f"Error: {errors[i]}")
         elif phase == 3:
             print(f"\n Phase 3: Creating foreign keys for {TABLE_NAME}...")
             # Create the specific foreign key for Column table
-            from table_utils import execute_postgresql_sql
             fk_sql = 'ALTER TABLE "Column" ADD CONSTRAINT "Column_company_id_fkey" FOREIGN KEY ("company_id") REFERENCES "Company" ("id") ON DELETE CASCADE;'
-            success, result = execute_postgresql_sql(fk_sql, f"Foreign key creation for {TABLE_NAME}")
-            if success:
+            errors = execute_postgresql_ddl_batch([fk_sql])
+            if errors == {}:
                 print(f"Created foreign key for {TABLE_NAME}")
             else:
                 print(f"Failed to create foreign key for {TABLE_NAME}")
-                if result:
-                    print(f"Error: {result.stderr}")
+                if errors:
+                    print(f"Error: {errors[0]}")
 
     if args.verify:
         print(f"\n Verifying {TABLE_NAME} migration...")
         verify_table_structure(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE)
 
-    # After exporting CSV for Column, log the file and preview
-    csv_filename = 'Column_robust_import.csv'
-    if os.path.exists(csv_filename):
-        with open(csv_filename, 'r', encoding='utf-8') as f:
-            row_count = sum(1 for _ in f)
-        print(f"Exported CSV row count: {row_count}")
-        log_csv_preview(csv_filename)
-    else:
-        print(f"Exported CSV file not found: {csv_filename}")
-    # After import, log the import SQL and any errors
-    import_sql_filename = 'import_Column_robust.sql'
-    if os.path.exists(import_sql_filename):
-        print(f"Import SQL used:")
-        with open(import_sql_filename, 'r', encoding='utf-8') as f:
-            print(f.read())
-
 if __name__ == "__main__":
     main() 
\ No newline at end of file
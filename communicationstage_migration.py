@@ -13,14 +13,18 @@ from table_utils import (
     verify_table_structure,
     run_command,
     create_postgresql_table,
-    robust_export_and_import_data,
+    copy_mysql_table_to_postgresql,
     add_primary_key_constraint,
-    setup_auto_increment_sequence
+    setup_auto_increment_sequence,
+    execute_postgresql_ddl_batch
 )
 
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "CommunicationStage"
 
+# Columns of the phase-1 table, in the order they are streamed from MySQL into COPY
+COPY_COLUMNS = ("id", "communicationRuleId", "columnId")
+
 def create_communicationstage_table():
     """Create CommunicationStage table in PostgreSQL with proper schema"""
     
@@ -49,7 +53,7 @@ def phase1_create_table_and_data():
         return False
     
     # Import data preserving original IDs
-    if not robust_export_and_import_data(TABLE_NAME, PRESERVE_MYSQL_CASE, include_id=True):
+    if not copy_mysql_table_to_postgresql(TABLE_NAME, COPY_COLUMNS, PRESERVE_MYSQL_CASE):
         return False
     
     # Add PRIMARY KEY constraint
@@ -75,20 +79,20 @@ def phase3_create_foreign_keys():
     """Phase 3: Create foreign key constraints"""
     print(f" Phase 3: Creating foreign keys for {TABLE_NAME}")
     
-    from table_utils import execute_postgresql_sql
-    
     # Create foreign key constraints for CommunicationStage
     foreign_keys = [
         'ALTER TABLE "CommunicationStage" ADD CONSTRAINT "CommunicationStage_columnId_fkey" FOREIGN KEY ("columnId") REFERENCES "Column" ("id") ON DELETE CASCADE;',
         'ALTER TABLE "CommunicationStage" ADD CONSTRAINT "CommunicationStage_communicationRuleId_fkey" FOREIGN KEY ("communicationRuleId") REFERENCES "CommunicationAutomationRule" ("id") ON DELETE CASCADE;'
     ]
     
-    for fk_sql in foreign_keys:
-        success, result = execute_postgresql_sql(fk_sql, f"Foreign key creation for {TABLE_NAME}")
-        if not success:
+    # All constraints go through one psql session
+    errors = execute_postgresql_ddl_batch(foreign_keys)
+    if errors is None:
+        return False
+    for i, fk_sql in enumerate(foreign_keys):
+        if i in errors:
             print(f"Warning: Failed to create foreign key: {fk_sql}")
-            if result:
-                print(f"Error: {result.stderr}")
+            print(f"Error: {errors[i]}")
         else:
             print(f"Created foreign key successfully")
     
@@ -23,45 +23,95 @@ Usage:
 """
 
 import re
-import os
 import argparse
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from table_utils import (
     verify_table_structure,
-    run_command,
     create_postgresql_table,
-    export_and_clean_mysql_data,
-    import_data_to_postgresql,
+    copy_mysql_table_to_postgresql,
     add_primary_key_constraint,
-    setup_auto_increment_sequence
+    setup_auto_increment_sequence,
+    execute_postgresql_ddl_batch,
+    execute_postgresql_statements,
+    get_mysql_create_table,
+    get_postgresql_names,
+    get_existing_postgresql_tables,
+    get_mysql_column_names,
+    convert_mysql_column_types
 )
 
 # Configuration: Set to True to preserve MySQL naming convention in PostgreSQL
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "Company"
 
+_MYSQL_SYNTAX_CLEANUPS = [
+    (re.compile(r'\s+unsigned\b', re.IGNORECASE), ''),
+    (re.compile(r'\s+zerofill\b', re.IGNORECASE), ''),
+    (re.compile(r'DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP', re.IGNORECASE), 'DEFAULT CURRENT_TIMESTAMP'),
+    (re.compile(r'COLLATE [a-zA-Z0-9_]+'), ''),
+    (re.compile(r'CHARACTER SET [a-zA-Z0-9_]+'), ''),
+    (re.compile(r'\s*ENGINE\s*=\s*[a-zA-Z0-9_]+', re.IGNORECASE), ''),
+    (re.compile(r'\s*DEFAULT\s+CHARSET\s*=\s*[a-zA-Z0-9_]+', re.IGNORECASE), ''),
+    (re.compile(r'\s*AUTO_INCREMENT\s*=\s*\d+', re.IGNORECASE), ''),
+]
+
+_POSTGRES_FIXUPS = [
+    (re.compile(r'\bTIMESTAMP\(3\)\b', re.IGNORECASE), 'TIMESTAMP WITHOUT TIME ZONE'),
+    (re.compile(r'\bDATETIME\(3\)\b', re.IGNORECASE), 'TIMESTAMP WITHOUT TIME ZONE'),
+    (re.compile(r"DEFAULT\s+'0'", re.IGNORECASE), "DEFAULT false"),
+    (re.compile(r"DEFAULT\s+'1'", re.IGNORECASE), "DEFAULT true"),
+    (re.compile(r"DEFAULT\s+'0000-00-00 00:00:00'", re.IGNORECASE), "DEFAULT NULL"),
+    (re.compile(r"DEFAULT\s+'0000-00-00'", re.IGNORECASE), "DEFAULT NULL"),
+    (re.compile(r',\s*,'), ','),
+    (re.compile(r',(\s*)\)'), r'\1)'),
+]
+
+_INDEX_RE = re.compile(r'(UNIQUE\s+)?(?:KEY|INDEX)\s+`([^`]+)`\s*\(([^)]+)\)', re.IGNORECASE)
+# CONSTRAINT ... FOREIGN KEY ... REFERENCES with optional ON DELETE / ON UPDATE actions
+_FK_RE = re.compile(
+    r'CONSTRAINT\s+`([^`]+)`\s+FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+`([^`]+)`\s*\(([^)]+)\)'
+    r'(?:\s+ON\s+DELETE\s+(SET\s+NULL|SET\s+DEFAULT|NO\s+ACTION|\w+))?'
+    r'(?:\s+ON\s+UPDATE\s+(SET\s+NULL|SET\s+DEFAULT|NO\s+ACTION|\w+))?',
+    re.IGNORECASE
+)
+# Referential actions PostgreSQL accepts; anything else falls back to RESTRICT
+_VALID_REF_ACTIONS = frozenset({'CASCADE', 'SET NULL', 'SET DEFAULT', 'RESTRICT', 'NO ACTION'})
+_COLUMN_NAME_RE = re.compile(r'[^,\s`]+')
+_DDL_LINE_SPLIT_RE = re.compile(r'\\n|\r?\n')
+# Lines of the CREATE TABLE that are not column definitions
+_NON_COLUMN_LINE_RE = re.compile(r'(?i:KEY |INDEX |CONSTRAINT |FOREIGN |UNIQUE )|PRIMARY KEY \(|CREATE TABLE|\)')
+_CREATE_TABLE_BACKTICK_RE = re.compile(r'CREATE TABLE `([^`]+)`', re.IGNORECASE)
+_CREATE_TABLE_NAME_RE = re.compile(rf'\bCREATE TABLE {TABLE_NAME}\b', re.IGNORECASE)
+_PRIMARY_KEY_CLAUSE_RE = re.compile(r',\s*PRIMARY\s+KEY\s*\([^)]+\)', re.IGNORECASE)
+_TABLE_OPTIONS_RE = re.compile(r'\)\s*[A-Z_=\s\w\d]+$', re.IGNORECASE)
+# MySQL only uses backticks as identifier quotes, so a one-character translate table is enough
+_BACKTICK_TO_QUOTE = str.maketrans({'`': '"'})
+_BACKTICK_REMOVE = str.maketrans({'`': None})
+_AUTO_INCREMENT_RE = re.compile(r'\s+AUTO_INCREMENT\b', re.IGNORECASE)
+_ID_INT_RE = re.compile(r'(\s*[`"]id[`"]?\s+)int(\s+NOT\s+NULL)', re.IGNORECASE)
+
+# Table name as it appears in the PostgreSQL catalogs, fixed once PRESERVE_MYSQL_CASE is known
+_TABLE_FOR_CHECK = TABLE_NAME if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+_SEQUENCE_FOR_CHECK = f"{_TABLE_FOR_CHECK}_id_seq"
+
+# Phase 2 builds indexes in parallel psql sessions
+INDEX_WORKERS = 4
+INDEX_SESSION_SETTINGS = (
+    "SET max_parallel_maintenance_workers = 4",
+    "SET maintenance_work_mem = '256MB'",
+)
+
+# SHOW CREATE TABLE results keyed by table name, so --full runs all three phases off one MySQL round trip
+_TABLE_INFO_CACHE = {}
+
 def get_company_table_info():
     """Get complete Company table information from MySQL including constraints"""
+    if TABLE_NAME in _TABLE_INFO_CACHE:
+        return _TABLE_INFO_CACHE[TABLE_NAME]
     print(f" Getting complete table info for {TABLE_NAME} from MySQL...")
     
-    # Get CREATE TABLE statement
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW CREATE TABLE `{TABLE_NAME}`;"'
-    result = run_command(cmd)
-    
-    if not result or result.returncode != 0:
-        print(f" Failed to get Company table structure: {result.stderr if result else 'No result'}")
-        return None, None, None
-
-    
-    lines = result.stdout.strip().split('\n')
-    create_statement = None
-    for line in lines[1:]:
-        if 'CREATE TABLE' in line:
-            parts = line.split('\t')
-            if len(parts) >= 2:
-                create_statement = parts[1]
-                break
-    
+    # Get CREATE TABLE statement (DDL snapshot or the shared MySQL connection when available)
+    create_statement = get_mysql_create_table(TABLE_NAME)
     if not create_statement:
         print(" Could not find CREATE TABLE statement for Company")
         return None, None, None
@@ -71,34 +121,26 @@ def get_company_table_info():
     foreign_keys = extract_company_foreign_keys_from_ddl(create_statement)
     
     print(f" Found {len(indexes)} indexes and {len(foreign_keys)} foreign keys for Company table")
+    _TABLE_INFO_CACHE[TABLE_NAME] = (create_statement, indexes, foreign_keys)
     return create_statement, indexes, foreign_keys
 
 def extract_company_indexes_from_ddl(ddl):
     """Extract index definitions from Company table MySQL DDL"""
     indexes = []
+    seen_names = set()
     
-    # Find all KEY definitions specific to Company table
-    key_patterns = [
-        r'KEY\s+`([^`]+)`\s*\(([^)]+)\)',
-        r'INDEX\s+`([^`]+)`\s*\(([^)]+)\)',
-        r'UNIQUE\s+KEY\s+`([^`]+)`\s*\(([^)]+)\)',
-        r'UNIQUE\s+INDEX\s+`([^`]+)`\s*\(([^)]+)\)'
-    ]
-    
-    for pattern in key_patterns:
-        matches = re.finditer(pattern, ddl, re.IGNORECASE)
-        for match in matches:
-            index_name = match.group(1)
-            columns = match.group(2)
-            is_unique = 'UNIQUE' in match.group(0).upper()
-            
-            indexes.append({
-                'name': index_name,
-                'columns': columns,
-                'unique': is_unique,
-                'original': match.group(0),
-                'table': 'Company'
-            })
+    # One scan finds KEY, INDEX, UNIQUE KEY and UNIQUE INDEX definitions specific to Company table
+    for unique, index_name, columns in _INDEX_RE.findall(ddl):
+        if index_name in seen_names:
+            continue
+        seen_names.add(index_name)
+        
+        indexes.append({
+            'name': index_name,
+            'columns': columns,
+            'unique': bool(unique),
+            'table': 'Company'
+        })
     
     return indexes
 
@@ -106,26 +148,14 @@ def extract_company_foreign_keys_from_ddl(ddl):
     """Extract foreign key definitions from Company table MySQL DDL"""
     foreign_keys = []
     
-    # Pattern for CONSTRAINT FOREIGN KEY specific to Company
-    fk_pattern = r'CONSTRAINT\s+`([^`]+)`\s+FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+`([^`]+)`\s*\(([^)]+)\)(?:\s+ON\s+DELETE\s+(\w+))?(?:\s+ON\s+UPDATE\s+(\w+))?'
-    
-    matches = re.finditer(fk_pattern, ddl, re.IGNORECASE)
-    for match in matches:
-        constraint_name = match.group(1)
-        local_columns = match.group(2)
-        ref_table = match.group(3)
-        ref_columns = match.group(4)
-        on_delete = match.group(5) or 'RESTRICT'
-        on_update = match.group(6) or 'RESTRICT'
-        
+    for name, local_columns, ref_table, ref_columns, on_delete, on_update in _FK_RE.findall(ddl):
         foreign_keys.append({
-            'name': constraint_name,
+            'name': name,
             'local_columns': local_columns,
             'ref_table': ref_table,
             'ref_columns': ref_columns,
-            'on_delete': on_delete,
-            'on_update': on_update,
-            'original': match.group(0),
+            'on_delete': on_delete or 'RESTRICT',
+            'on_update': on_update or 'RESTRICT',
             'table': 'Company'
         })
     
@@ -135,143 +165,57 @@ def convert_company_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False
     """Convert Company table MySQL DDL to PostgreSQL DDL with Company-specific optimizations"""
     print(f" Converting Company table MySQL DDL to PostgreSQL (constraints: {include_constraints}, preserve_case: {preserve_case})...")
     
-    # Company-specific type mappings
-    company_type_mappings = OrderedDict([
-        # Modified: Don't auto-convert id to SERIAL - preserve original IDs
-        (r'\bbigint\(\d+\)\s+auto_increment\b', 'BIGINT'),  # Remove auto-increment, handle manually
-        (r'tinyint\(1\)', 'BOOLEAN'),
-        (r'tinyint\(\d+\)', 'SMALLINT'),
-        (r'smallint\(\d+\)', 'SMALLINT'),
-        (r'mediumint\(\d+\)', 'INTEGER'),
-        (r'int\(\d+\)', 'INTEGER'),
-        (r'bigint\(\d+\)', 'BIGINT'),
-        (r'\btinyint\b(?!\()', 'SMALLINT'),
-        (r'\bint\(\d+\)\s+auto_increment\b', 'INTEGER'),  # Remove auto-increment, preserve original IDs
-        (r'\bint\b(?!\()', 'INTEGER'),
-        (r'varchar\((\d+)\)', r'VARCHAR(\1)'),
-        (r'char\((\d+)\)', r'CHAR(\1)'),
-        (r'text', 'TEXT'),
-        (r'longtext', 'TEXT'),
-        (r'mediumtext', 'TEXT'),
-        (r'tinytext', 'TEXT'),
-        (r'\bdatetime\(\d+\)\b', 'TIMESTAMP(3)'),
-        (r'\bdatetime\b', 'TIMESTAMP'),
-        (r'\btimestamp\b', 'TIMESTAMP'),
-        (r'\bdate\b(?=\s|,|\)|\n)', 'DATE'),
-        (r'\btime\b(?=\s|,|\)|\n)', 'TIME'),
-        (r'decimal\((\d+),(\d+)\)', r'DECIMAL(\1,\2)'),
-        (r'numeric\((\d+),(\d+)\)', r'DECIMAL(\1,\2)'),
-        (r'double', 'DOUBLE PRECISION'),
-        (r'float', 'REAL'),
-        (r'enum\([^)]+\)', 'VARCHAR(50)'),
-        (r'json', 'JSONB'),
-        (r'blob', 'BYTEA'),
-        (r'longblob', 'BYTEA'),
-        # Company-specific: Handle large precision decimals for tax and serviceFee
-        (r'decimal\(65,30\)', 'DECIMAL(65,30)'),
-    ])
-    
     postgres_ddl = mysql_ddl
     
     # Convert table name
-    postgres_ddl = re.sub(
-        r'CREATE TABLE `([^`]+)`',
-        r'CREATE TABLE \1',
-        postgres_ddl,
-        flags=re.IGNORECASE
-    )
+    postgres_ddl = _CREATE_TABLE_BACKTICK_RE.sub(r'CREATE TABLE \1', postgres_ddl)
     
-    # Apply Company-specific type mappings
-    for mysql_pattern, postgres_type in company_type_mappings.items():
-        postgres_ddl = re.sub(mysql_pattern, postgres_type, postgres_ddl, flags=re.IGNORECASE)
+    # Map MySQL types in one pass, keeping the large precision decimals for tax and serviceFee
+    postgres_ddl = convert_mysql_column_types(postgres_ddl)
     
     # Remove MySQL-specific syntax
-    postgres_ddl = re.sub(r'\s+unsigned\b', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\s+zerofill\b', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP', 'DEFAULT CURRENT_TIMESTAMP', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'COLLATE [a-zA-Z0-9_]+', '', postgres_ddl)
-    postgres_ddl = re.sub(r'CHARACTER SET [a-zA-Z0-9_]+', '', postgres_ddl)
-    postgres_ddl = re.sub(r'\s*ENGINE\s*=\s*[a-zA-Z0-9_]+', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\s*DEFAULT\s+CHARSET\s*=\s*[a-zA-Z0-9_]+', '', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\s*AUTO_INCREMENT\s*=\s*\d+', '', postgres_ddl, flags=re.IGNORECASE)
+    for pattern, replacement in _MYSQL_SYNTAX_CLEANUPS:
+        postgres_ddl = pattern.sub(replacement, postgres_ddl)
+    
+    # Drop the inline PRIMARY KEY clause before any rebuild; add_primary_key_constraint adds it
+    # once the data is loaded
+    postgres_ddl = _PRIMARY_KEY_CLAUSE_RE.sub('', postgres_ddl)
     
     if not include_constraints:
-        # For phase 1, completely rebuild DDL without constraints
-        lines = postgres_ddl.split('\\n')  # Handle escaped newlines
+        # For phase 1, completely rebuild DDL without constraints: keep only the column
+        # definitions (lines may be separated by real or escaped newlines)
+        columns = [
+            line.rstrip(',').strip()
+            for line in map(str.strip, _DDL_LINE_SPLIT_RE.split(postgres_ddl))
+            if line and not _NON_COLUMN_LINE_RE.match(line)
+        ]
         
-        # Use proper table name based on case preservation
+        # Use proper table name based on case preservation; the primary key is added after
+        # the data import by add_primary_key_constraint
         target_table_name = f'"{TABLE_NAME}"' if preserve_case else TABLE_NAME.lower()
-        clean_lines = [f'CREATE TABLE {target_table_name} (']
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip constraint, key, and index lines, but keep column definitions
-            if (line.startswith('KEY ') or 
-                line.startswith('INDEX ') or 
-                line.startswith('CONSTRAINT ') or
-                line.startswith('UNIQUE KEY ') or
-                line.startswith('PRIMARY KEY (') or
-                line.startswith('CREATE TABLE') or
-                line.startswith(')') or
-                not line):
-                continue
-            
-            # This is a column definition if it doesn't start with constraint keywords
-            if not any(line.upper().startswith(kw) for kw in ['KEY ', 'INDEX ', 'CONSTRAINT ', 'FOREIGN ', 'UNIQUE ']):
-                # Clean up the line - ensure proper comma
-                clean_line = line.rstrip(',').strip()
-                clean_lines.append('  ' + clean_line + ',')
-        
-        # Remove trailing comma from last line and close
-        if clean_lines[-1].endswith(','):
-            clean_lines[-1] = clean_lines[-1][:-1]
-        
-        # Add PRIMARY KEY constraint for id column (for Company table with preserved IDs)
-        if TABLE_NAME == "Company":
-            clean_lines.append(',')
-            clean_lines.append('  PRIMARY KEY ("id")')
-        
-        clean_lines.append(')')
-        
-        postgres_ddl = '\n'.join(clean_lines)
-    
-    # Clean up PRIMARY KEY definitions that are already handled by SERIAL
-    postgres_ddl = re.sub(r',\s*PRIMARY\s+KEY\s*\([^)]+\)', '', postgres_ddl, flags=re.IGNORECASE)
+        postgres_ddl = f'CREATE TABLE {target_table_name} (\n' + ',\n'.join(f'  {column}' for column in columns) + '\n)'
     
     # Remove MySQL table options
-    postgres_ddl = re.sub(r'\)\s*[A-Z_=\s\w\d]+$', ')', postgres_ddl, flags=re.IGNORECASE)
+    postgres_ddl = _TABLE_OPTIONS_RE.sub(')', postgres_ddl)
     
     # Handle backticks - preserve case if needed for Company columns
     if preserve_case:
         # Convert MySQL backticks to PostgreSQL double quotes to preserve case
-        postgres_ddl = re.sub(r'`([^`]+)`', r'"\1"', postgres_ddl)
+        postgres_ddl = postgres_ddl.translate(_BACKTICK_TO_QUOTE)
     else:
         # Remove backticks for case-insensitive mode
-        postgres_ddl = re.sub(r'`([^`]+)`', r'\1', postgres_ddl)
+        postgres_ddl = postgres_ddl.translate(_BACKTICK_REMOVE)
     
     # Fix auto_increment - convert to SERIAL FIRST
-    postgres_ddl = re.sub(r'\s+AUTO_INCREMENT\b', '', postgres_ddl, flags=re.IGNORECASE)
+    postgres_ddl = _AUTO_INCREMENT_RE.sub('', postgres_ddl)
     
     # Convert ONLY the id column but keep it as INTEGER (not SERIAL) to preserve original values
-    postgres_ddl = re.sub(r'(\s*[`"]id[`"]?\s+)int(\s+NOT\s+NULL)', r'\1INTEGER\2', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'(\s*[`"]id[`"]?\s+)INTEGER(\s+NOT\s+NULL)', r'\1INTEGER\2', postgres_ddl, flags=re.IGNORECASE)
-    
-    # Fix timestamp types for Company
-    postgres_ddl = re.sub(r'\bTIMESTAMP\(3\)\b', 'TIMESTAMP WITHOUT TIME ZONE', postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r'\bDATETIME\(3\)\b', 'TIMESTAMP WITHOUT TIME ZONE', postgres_ddl, flags=re.IGNORECASE)
-    
-    # Fix boolean defaults for Company visibility fields
-    postgres_ddl = re.sub(r"DEFAULT\s+'0'", "DEFAULT false", postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r"DEFAULT\s+'1'", "DEFAULT true", postgres_ddl, flags=re.IGNORECASE)
+    postgres_ddl = _ID_INT_RE.sub(r'\1INTEGER\2', postgres_ddl)
     
-    # Fix invalid date defaults
-    postgres_ddl = re.sub(r"DEFAULT\s+'0000-00-00 00:00:00'", "DEFAULT NULL", postgres_ddl, flags=re.IGNORECASE)
-    postgres_ddl = re.sub(r"DEFAULT\s+'0000-00-00'", "DEFAULT NULL", postgres_ddl, flags=re.IGNORECASE)
-    
-    # Clean up commas
-    postgres_ddl = re.sub(r',\s*,', ',', postgres_ddl)
-    postgres_ddl = re.sub(r',(\s*)\)', r'\1)', postgres_ddl)
+    # Fix timestamp types, boolean defaults for Company visibility fields and invalid date defaults,
+    # then clean up commas
+    for pattern, replacement in _POSTGRES_FIXUPS:
+        postgres_ddl = pattern.sub(replacement, postgres_ddl)
     
     # Convert table name appropriately based on case preservation
     if preserve_case:
@@ -279,89 +223,90 @@ def convert_company_mysql_to_postgresql_ddl(mysql_ddl, include_constraints=False
     else:
         target_table_name = TABLE_NAME.lower()
     
-    postgres_ddl = re.sub(
-        rf'\bCREATE TABLE {TABLE_NAME}\b',
-        f'CREATE TABLE {target_table_name}',
-        postgres_ddl,
-        flags=re.IGNORECASE
-    )
+    postgres_ddl = _CREATE_TABLE_NAME_RE.sub(f'CREATE TABLE {target_table_name}', postgres_ddl)
     
     return postgres_ddl
 
-def create_company_indexes(indexes):
-    """Create indexes for Company table"""
+def create_company_indexes(indexes, concurrently=False):
+    """Create indexes for Company table
+    
+    With concurrently=True each index is built with CREATE INDEX CONCURRENTLY, one at a time,
+    so a target that is already serving traffic keeps accepting writes during the build.
+    """
     if not indexes:
         print(f" No indexes to create for {TABLE_NAME}")
         return True
     
     print(f" Creating {len(indexes)} indexes for {TABLE_NAME}...")
     
-    success = True
-    created_indexes = set()  # Track created index names to avoid duplicates
+    # For case-sensitive table, quote the table name
+    table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+    
+    # Index names are unquoted, so PostgreSQL stores them lower-cased. Only valid indexes count:
+    # an interrupted concurrent build leaves an invalid one behind that has to be rebuilt
+    existing_indexes = get_postgresql_names(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        f"JOIN pg_class t ON t.oid = i.indrelid WHERE t.relname = '{_TABLE_FOR_CHECK}' AND i.indisvalid;"
+    )
+    
+    index_names = []
+    statements = []
     
     for index in indexes:
         index_name = f"{TABLE_NAME.lower()}_{index['name']}"
-        
-        # Skip duplicates (can happen with UNIQUE variants)
-        if index_name in created_indexes:
-            print(f" Skipping duplicate index: {index_name}")
+        if index_name.lower() in existing_indexes:
+            print(f" Company index already exists: {index_name}")
             continue
-            
-        created_indexes.add(index_name)
-        columns = index['columns'].replace('`', '"')  # Convert backticks to quotes for case preservation
+        columns = index['columns'].translate(_BACKTICK_TO_QUOTE)  # Convert backticks to quotes for case preservation
         unique_clause = "UNIQUE " if index['unique'] else ""
         
-        # For case-sensitive table, quote the table name
-        table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        
-        create_index_sql = f"CREATE {unique_clause}INDEX {index_name} ON {table_ref} ({columns});"
-        
-        print(f" Creating Company index: {index_name}")
-        
-        # Write to file and execute
-        sql_file = f"create_company_index_{index_name}.sql"
-        with open(sql_file, "w", encoding="utf-8") as f:
-            f.write(create_index_sql)
-        
-        # Copy and execute
-        copy_cmd = f"docker cp {sql_file} postgres_target:/tmp/{sql_file}"
-        copy_result = run_command(copy_cmd)
-        
-        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{sql_file}'
-        result = run_command(exec_cmd)
-        
-        # Cleanup
-        try:
-            os.remove(sql_file)
-        except:
-            pass
-        run_command(f"docker exec postgres_target rm /tmp/{sql_file}")
-        
+        index_names.append(index_name)
+        if concurrently:
+            statements.append((
+                f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};",
+                f"CREATE {unique_clause}INDEX CONCURRENTLY {index_name} ON {table_ref} ({columns});"
+            ))
+        else:
+            statements.append((f"CREATE {unique_clause}INDEX IF NOT EXISTS {index_name} ON {table_ref} ({columns});",))
+    
+    if not statements:
+        return True
+    
+    # Each index gets its own session so independent builds overlap; CREATE INDEX only takes
+    # a SHARE lock, so builds on the same table do not block each other. Concurrent builds lock
+    # out one another on the same table, so those run one at a time
+    workers = 1 if concurrently else min(INDEX_WORKERS, len(statements))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda index_sql: execute_postgresql_statements(INDEX_SESSION_SETTINGS + index_sql),
+            statements
+        ))
+    
+    success = True
+    for index_name, index_sql, result in zip(index_names, statements, results):
         if result and result.returncode == 0:
             print(f" Created Company index: {index_name}")
         else:
             print(f" Failed to create Company index: {index_name}")
-            if result:
-                print(f"   Error: {result.stderr}")
-                print(f"   SQL: {create_index_sql}")
+            print(f"   Error: {result.stderr.strip() if result else 'No result'}")
+            print(f"   SQL: {index_sql[-1]}")
             success = False
     
     return success
 
-def check_company_referenced_table_exists(ref_table):
-    """Check if referenced table exists in PostgreSQL for Company foreign keys"""
-    # Company references: TwilioCredentials, MailgunCredential
-    table_name = ref_table if PRESERVE_MYSQL_CASE else ref_table.lower()
-    cmd = f'docker exec postgres_target psql -U postgres -d target_db -t -c "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = \'{table_name}\' AND table_schema = \'public\';"'
-    result = run_command(cmd)
-    
-    if result and result.returncode == 0:
-        try:
-            count = int(result.stdout.strip())
-            return count > 0
-        except:
-            return False
-    return False
+def company_sequence_in_use():
+    """Return True when the Company id sequence exists and is already the id column default, in one catalog query"""
+    return bool(get_postgresql_names(
+        f"SELECT relname FROM pg_class WHERE relkind = 'S' AND relname = '{_SEQUENCE_FOR_CHECK}' "
+        f"AND EXISTS (SELECT 1 FROM information_schema.columns WHERE table_schema = 'public' "
+        f"AND table_name = '{_TABLE_FOR_CHECK}' AND column_name = 'id' "
+        f"AND column_default LIKE 'nextval(%{_SEQUENCE_FOR_CHECK}%');"
+    ))
+
+def _format_company_columns(columns):
+    """Turn a MySQL column list such as `a`,`b` into a PostgreSQL one, quoted when preserving case"""
+    names = _COLUMN_NAME_RE.findall(columns)
+    return ', '.join(f'"{name}"' for name in names) if PRESERVE_MYSQL_CASE else ', '.join(names)
 
 def create_company_foreign_keys(foreign_keys):
     """Create foreign key constraints for Company table"""
@@ -371,76 +316,61 @@ def create_company_foreign_keys(foreign_keys):
     
     print(f" Creating {len(foreign_keys)} foreign keys for {TABLE_NAME}...")
     
-    created_count = 0
+    table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
+    
+    constraint_names = []
+    statements = []
     skipped_count = 0
     
+    # Company references: TwilioCredentials, MailgunCredential
+    existing_tables = get_existing_postgresql_tables(
+        {fk['ref_table'] if PRESERVE_MYSQL_CASE else fk['ref_table'].lower() for fk in foreign_keys}
+    )
+    
     for fk in foreign_keys:
         ref_table = fk['ref_table']
         ref_table_name = f'"{ref_table}"' if PRESERVE_MYSQL_CASE else ref_table.lower()
         
         # Check if referenced table exists
-        if not check_company_referenced_table_exists(ref_table):
+        if (ref_table if PRESERVE_MYSQL_CASE else ref_table.lower()) not in existing_tables:
             print(f" Skipping Company FK {fk['name']}: Referenced table '{ref_table}' does not exist")
             skipped_count += 1
             continue
         
         constraint_name = f"fk_company_{fk['name']}"
-        local_cols = fk['local_columns'].replace('`', '')
-        ref_cols = fk['ref_columns'].replace('`', '')
-        
         # Quote column names if preserving case
-        if PRESERVE_MYSQL_CASE:
-            local_cols = ', '.join([f'"{col.strip()}"' for col in local_cols.split(',')])
-            ref_cols = ', '.join([f'"{col.strip()}"' for col in ref_cols.split(',')])
+        local_cols = _format_company_columns(fk['local_columns'])
+        ref_cols = _format_company_columns(fk['ref_columns'])
         
         # Convert MySQL actions to PostgreSQL
-        on_delete = fk['on_delete'].upper()
-        on_update = fk['on_update'].upper()
+        on_delete = ' '.join(fk['on_delete'].upper().split())
+        on_update = ' '.join(fk['on_update'].upper().split())
         
-        if on_delete not in ['CASCADE', 'SET NULL', 'RESTRICT', 'NO ACTION']:
+        if on_delete not in _VALID_REF_ACTIONS:
             on_delete = 'RESTRICT'
-        if on_update not in ['CASCADE', 'SET NULL', 'RESTRICT', 'NO ACTION']:
+        if on_update not in _VALID_REF_ACTIONS:
             on_update = 'RESTRICT'
         
-        table_ref = f'"{TABLE_NAME}"' if PRESERVE_MYSQL_CASE else TABLE_NAME.lower()
-        
-        alter_sql = f"""
-ALTER TABLE {table_ref} 
-ADD CONSTRAINT {constraint_name} 
-FOREIGN KEY ({local_cols}) 
-REFERENCES {ref_table_name} ({ref_cols}) 
-ON DELETE {on_delete} 
-ON UPDATE {on_update};
-"""
-        
         print(f" Creating Company FK: {constraint_name} -> {ref_table}")
-        
-        # Write to file and execute
-        sql_file = f"create_company_fk_{constraint_name}.sql"
-        with open(sql_file, "w", encoding="utf-8") as f:
-            f.write(alter_sql)
-        
-        # Copy and execute
-        copy_cmd = f"docker cp {sql_file} postgres_target:/tmp/{sql_file}"
-        run_command(copy_cmd)
-        
-        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{sql_file}'
-        result = run_command(exec_cmd)
-        
-        # Cleanup
-        try:
-            os.remove(sql_file)
-        except:
-            pass
-        run_command(f"docker exec postgres_target rm /tmp/{sql_file}")
-        
-        if result and result.returncode == 0:
-            print(f" Created Company FK: {constraint_name}")
-            created_count += 1
+        constraint_names.append(constraint_name)
+        statements.append(
+            f"ALTER TABLE {table_ref} ADD CONSTRAINT {constraint_name} FOREIGN KEY ({local_cols}) "
+            f"REFERENCES {ref_table_name} ({ref_cols}) ON DELETE {on_delete} ON UPDATE {on_update};"
+        )
+    
+    # All constraints are piped into one psql session; each one still succeeds or fails on its own
+    errors = execute_postgresql_ddl_batch(statements) if statements else {}
+    if errors is None:
+        print(f" Failed to create Company foreign keys")
+        return False
+    
+    for i, constraint_name in enumerate(constraint_names):
+        if i in errors:
+            print(f" Failed to create Company FK {constraint_name}: {errors[i]}")
         else:
-            print(f" Failed to create Company FK {constraint_name}: {result.stderr if result else 'Unknown error'}")
+            print(f" Created Company FK: {constraint_name}")
     
-    print(f" Company Foreign Keys: {created_count} created, {skipped_count} skipped")
+    print(f" Company Foreign Keys: {len(statements) - len(errors)} created, {skipped_count} skipped")
     return True
 
 def migrate_company_phase1():
@@ -463,25 +393,24 @@ def migrate_company_phase1():
     if not create_postgresql_table(TABLE_NAME, postgres_ddl, preserve_case=PRESERVE_MYSQL_CASE):
         return False
     
-    cleaned_data = export_and_clean_mysql_data(TABLE_NAME)
-    if cleaned_data is None:
-        return False
-    
-    if not import_data_to_postgresql(TABLE_NAME, cleaned_data, preserve_case=PRESERVE_MYSQL_CASE, include_id=True):
+    # COPY every column, id included, straight from MySQL instead of row-by-row INSERTs
+    columns = get_mysql_column_names(mysql_ddl)
+    if not copy_mysql_table_to_postgresql(TABLE_NAME, columns, PRESERVE_MYSQL_CASE):
         return False
 
     # Add PRIMARY KEY constraint if not exists
     add_primary_key_constraint(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE)
     
-    # Setup auto-increment sequence for preserved IDs
-    if not setup_auto_increment_sequence(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE):
-        print(" Warning: Could not setup auto-increment sequence")
+    # Setup auto-increment sequence for preserved IDs unless the id column already draws from it
+    if company_sequence_in_use():
+        print(f" Auto-increment sequence already set up for {TABLE_NAME}")
+    elif not setup_auto_increment_sequence(TABLE_NAME, preserve_case=PRESERVE_MYSQL_CASE):
         print(" Warning: Could not setup auto-increment sequence")
 
     print(f" Phase 1 complete for {TABLE_NAME}")
     return True
 
-def migrate_company_phase2():
+def migrate_company_phase2(concurrently=False):
     """Phase 2: Create indexes for Company table"""
     print(f" Phase 2: Creating indexes for {TABLE_NAME}")
     
@@ -489,7 +418,7 @@ def migrate_company_phase2():
     if not mysql_ddl:
         return False
     
-    return create_company_indexes(indexes)
+    return create_company_indexes(indexes, concurrently)
 
 def migrate_company_phase3():
     """Phase 3: Create foreign keys for Company table"""
@@ -510,6 +439,7 @@ def main():
     parser.add_argument('--phase', type=int, choices=[1, 2, 3], help='Migration phase (1=table+data, 2=indexes, 3=foreign keys)')
     parser.add_argument('--full', action='store_true', help='Run all phases')
     parser.add_argument('--verify', action='store_true', help='Verify Company table structure matches between MySQL and PostgreSQL')
+    parser.add_argument('--concurrent-indexes', action='store_true', help='Build phase-2 indexes with CREATE INDEX CONCURRENTLY (for a live target)')
     
     args = parser.parse_args()
     
@@ -522,13 +452,13 @@ def main():
         print(f" Running full migration for {TABLE_NAME}")
         success = (
             migrate_company_phase1() and
-            migrate_company_phase2() and
+            migrate_company_phase2(args.concurrent_indexes) and
             migrate_company_phase3()
         )
     elif args.phase == 1:
         success = migrate_company_phase1()
     elif args.phase == 2:
-        success = migrate_company_phase2()
+        success = migrate_company_phase2(args.concurrent_indexes)
     elif args.phase == 3:
         success = migrate_company_phase3()
     else:
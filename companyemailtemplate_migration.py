@@ -8,12 +8,14 @@ Note: The MySQL table name is 'companyEmailTemplate' (lowercase 'c').
 """
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from table_utils import (
     create_postgresql_table,
     robust_export_and_import_data,
     validate_migration_success,
     run_command,
     execute_postgresql_sql,
+    execute_postgresql_statements,
     setup_auto_increment_sequence
 )
 
@@ -21,12 +23,8 @@ from table_utils import (
 PRESERVE_MYSQL_CASE = True
 TABLE_NAME = "companyEmailTemplate"  # Note: lowercase 'c' in MySQL
 
-def create_companyemailtemplate_table():
-    """Create companyEmailTemplate table in PostgreSQL"""
-    print(f"Creating {TABLE_NAME} table in PostgreSQL...")
-    
-    # Define PostgreSQL DDL based on MySQL structure
-    ddl = '''
+# PostgreSQL DDL based on the MySQL structure
+_COMPANYEMAILTEMPLATE_DDL = '''
 CREATE TABLE "companyEmailTemplate" (
     "id" SERIAL PRIMARY KEY,
     "subject" VARCHAR(191) NOT NULL,
@@ -36,10 +34,11 @@ CREATE TABLE "companyEmailTemplate" (
     "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 '''
-    
-    # Create table
-    success = create_postgresql_table(TABLE_NAME, ddl, PRESERVE_MYSQL_CASE)
-    return success
+
+def create_companyemailtemplate_table():
+    """Create companyEmailTemplate table in PostgreSQL"""
+    print(f"Creating {TABLE_NAME} table in PostgreSQL...")
+    return create_postgresql_table(TABLE_NAME, _COMPANYEMAILTEMPLATE_DDL, PRESERVE_MYSQL_CASE)
 
 def phase1_create_table_and_data():
     """Phase 1: Create table and import data"""
@@ -69,9 +68,12 @@ def phase2_create_indexes():
         f'CREATE INDEX IF NOT EXISTS "idx_{TABLE_NAME}_created_at" ON "{TABLE_NAME}" ("created_at");'
     ]
     
-    for index_sql in indexes:
-        success, result = execute_postgresql_sql(index_sql, f"Index creation for {TABLE_NAME}")
-        if not success:
+    # Independent indexes are built in parallel sessions
+    with ThreadPoolExecutor(max_workers=len(indexes)) as executor:
+        results = list(executor.map(lambda index_sql: execute_postgresql_statements([index_sql]), indexes))
+    
+    for index_sql, result in zip(indexes, results):
+        if not result or result.returncode != 0:
             print(f"Warning: Failed to create index: {index_sql}")
             print(f"Error: {result.stderr if result else 'Unknown error'}")
     
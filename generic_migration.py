@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Generic Table Migration Script
+==============================
+
+Shared 3-phase migration for the tables whose scripts were generated from the common
+template (client_migration.py, message_migration.py, ...):
+1. Phase 1: Table + Data (without constraints)
+2. Phase 2: Indexes (after data import for performance)
+3. Phase 3: Foreign Keys (after all tables exist)
+
+Each per-table script only names its table and calls main(); the logic lives here once.
+
+Usage:
+    python generic_migration.py --table=Client --phase=1
+    python generic_migration.py --table=Message --enums --full
+    python generic_migration.py --table=Client --verify
+"""
+
+import re
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from table_utils import (
+    verify_table_structure,
+    create_postgresql_table,
+    create_postgresql_table_with_enums,
+    copy_mysql_table_to_postgresql,
+    add_primary_key_constraint,
+    setup_auto_increment_sequence,
+    get_postgresql_names,
+    get_existing_postgresql_tables,
+    get_mysql_column_names,
+    execute_postgresql_ddl_batch,
+    execute_postgresql_statements,
+    convert_column_ddl,
+    get_mysql_create_table,
+    MYSQL_DDL_SNAPSHOT_ENV
+)
+
+# Configuration: Set to True to preserve MySQL naming convention in PostgreSQL
+PRESERVE_MYSQL_CASE = True
+
+# DDL patterns compiled once at import instead of on every call
+_KEY_RE = re.compile(r'(?:UNIQUE\s+)?KEY\s+`([^`]+)`\s*\(([^)]+)\)', re.IGNORECASE)
+# Handles multi-word FK actions like "SET NULL"
+_FK_RE = re.compile(r'CONSTRAINT\s+`([^`]+)`\s+FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+`([^`]+)`\s*\(([^)]+)\)(?:\s+ON\s+DELETE\s+([A-Z][A-Z\s]*?)(?=\s+ON|\s*$))?(?:\s+ON\s+UPDATE\s+([A-Z][A-Z\s]*?)(?=\s*$|\s*,))?', re.IGNORECASE)
+_CREATE_TABLE_BODY_RE = re.compile(r'CREATE TABLE `[^`]+`\s*\((.*?)\)\s*ENGINE', re.DOTALL)
+_VARCHAR_RE = re.compile(r'varchar\([^)]+\)')
+
+# Phase 2 builds indexes in parallel psql sessions
+INDEX_WORKERS = 4
+INDEX_SESSION_SETTINGS = (
+    "SET max_parallel_maintenance_workers = 4",
+    "SET maintenance_work_mem = '256MB'",
+)
+
+# CREATE TABLE statements cached on disk so separate --phase=1/2/3 runs share one MySQL round trip
+DDL_CACHE_DIR = '.mig_cache'
+DDL_CACHE_MAX_AGE = 3600  # seconds
+
+def load_cached_ddl(table_name):
+    """Return (CREATE TABLE statement, age in seconds) from the cache, or (None, None) if missing or stale"""
+    cache_path = os.path.join(DDL_CACHE_DIR, f"{table_name}.json")
+    try:
+        age = time.time() - os.path.getmtime(cache_path)
+        if age > DDL_CACHE_MAX_AGE:
+            return None, None
+        with open(cache_path, encoding='utf-8') as f:
+            cached_ddl = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    return (cached_ddl, age) if isinstance(cached_ddl, str) else (None, None)
+
+def save_cached_ddl(table_name, mysql_ddl):
+    """Write a table's CREATE TABLE statement to the DDL cache"""
+    cache_path = os.path.join(DDL_CACHE_DIR, f"{table_name}.json")
+    try:
+        os.makedirs(DDL_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(mysql_ddl, f)
+    except OSError as e:
+        print(f" Could not write DDL cache for {table_name}: {str(e)}")
+
+def get_table_info(table_name, use_cache=True):
+    """Get complete table information from MySQL including constraints"""
+    print(f" Getting complete table info for {table_name} from MySQL...")
+    
+    # A run_all_migrations snapshot is fresher than the cache, so the cache only serves standalone runs
+    use_cache = use_cache and not os.environ.get(MYSQL_DDL_SNAPSHOT_ENV)
+    mysql_ddl, cache_age = load_cached_ddl(table_name) if use_cache else (None, None)
+    if mysql_ddl:
+        # Schema changes made in MySQL since then are not picked up until the cache expires
+        print(f" Using CREATE TABLE statement for {table_name} cached {int(cache_age // 60)} min ago "
+              f"in {DDL_CACHE_DIR}/ (pass --no-cache if the MySQL schema has changed)")
+    else:
+        # Get CREATE TABLE statement in one round trip: the DDL snapshot, the shared MySQL
+        # connection, or a single --raw docker exec; indexes and FKs are parsed from it below
+        mysql_ddl = get_mysql_create_table(table_name)
+        if not mysql_ddl:
+            print(f" Could not find CREATE TABLE statement for {table_name}")
+            return None, [], []
+        if use_cache:
+            save_cached_ddl(table_name, mysql_ddl)
+    
+    # Extract indexes and foreign keys
+    indexes = extract_indexes_from_ddl(table_name, mysql_ddl)
+    foreign_keys = extract_foreign_keys_from_ddl(table_name, mysql_ddl)
+    
+    print(f" Found {len(indexes)} indexes and {len(foreign_keys)} foreign keys for {table_name} table")
+    return mysql_ddl, indexes, foreign_keys
+
+def extract_indexes_from_ddl(table_name, ddl):
+    """Extract index definitions from a table's MySQL DDL"""
+    indexes = []
+    
+    # Pattern for KEY definitions
+    matches = _KEY_RE.finditer(ddl)
+    for match in matches:
+        index_name = match.group(1)
+        columns = match.group(2)
+        is_unique = 'UNIQUE' in match.group(0).upper()
+    
+        indexes.append({
+            'name': index_name,
+            'columns': columns,
+            'unique': is_unique,
+            'original': match.group(0),
+            'table': table_name
+        })
+    
+    return indexes
+
+def extract_foreign_keys_from_ddl(table_name, ddl):
+    """Extract foreign key definitions from a table's MySQL DDL"""
+    foreign_keys = []
+    
+    # Pattern for CONSTRAINT FOREIGN KEY - handle multi-word actions like "SET NULL"
+    matches = _FK_RE.finditer(ddl)
+    for match in matches:
+        constraint_name = match.group(1)
+        local_columns = match.group(2)
+        ref_table = match.group(3)
+        ref_columns = match.group(4)
+        on_delete = match.group(5).strip() if match.group(5) else 'RESTRICT'
+        on_update = match.group(6).strip() if match.group(6) else 'RESTRICT'
+    
+        foreign_keys.append({
+            'name': constraint_name,
+            'local_columns': local_columns,
+            'ref_table': ref_table,
+            'ref_columns': ref_columns,
+            'on_delete': on_delete,
+            'on_update': on_update,
+            'original': match.group(0),
+            'table': table_name
+        })
+    
+    return foreign_keys
+
+def convert_mysql_to_postgresql_ddl(table_name, mysql_ddl, include_constraints=False, preserve_case=True):
+    """Convert a table's MySQL DDL to PostgreSQL DDL"""
+    print(f" Converting {table_name} table MySQL DDL to PostgreSQL (constraints: {include_constraints}, preserve_case: {preserve_case})...")
+    
+    # Fix literal \n characters to actual newlines first
+    postgres_ddl = mysql_ddl.replace('\\n', '\n')
+    
+    # Extract just the column definitions part
+    create_match = _CREATE_TABLE_BODY_RE.search(postgres_ddl)
+    if not create_match:
+        print(f" Could not parse CREATE TABLE statement for {table_name}")
+        return None
+    
+    columns_part = create_match.group(1)
+    
+    # Parse individual columns, indexes, and constraints
+    lines = []
+    for line in columns_part.split(',\n'):
+        line = line.strip()
+        if not line:
+            continue
+    
+        # Skip constraints for now if include_constraints is False
+        if not include_constraints and (
+            line.startswith('PRIMARY KEY') or
+            line.startswith('KEY') or
+            line.startswith('UNIQUE KEY') or
+            line.startswith('CONSTRAINT')
+        ):
+            continue
+    
+        # Process column definitions
+        if not (line.startswith('PRIMARY KEY') or line.startswith('KEY') or
+                line.startswith('UNIQUE KEY') or line.startswith('CONSTRAINT')):
+            # This is a column definition
+            processed_line = process_column_definition(line, preserve_case)
+            if processed_line:
+                lines.append(processed_line)
+    
+    # Build the PostgreSQL DDL
+    table_name_pg = f'"{table_name}"' if preserve_case else table_name.lower()
+    postgres_ddl = f"CREATE TABLE {table_name_pg} (\n"
+    postgres_ddl += ",\n".join([f"  {line}" for line in lines])
+    postgres_ddl += "\n)"
+    
+    return postgres_ddl
+
+def process_column_definition(line, preserve_case):
+    """Process a single column definition"""
+    # Quoting, type conversions, AUTO_INCREMENT, defaults, charsets and whitespace via the
+    # shared precompiled rules in table_utils
+    line = convert_column_ddl(line, preserve_case)
+    
+    # Make first_name nullable to handle empty strings
+    if 'first_name' in line and 'NOT NULL' in line:
+        line = line.replace(' NOT NULL', '')
+    
+    # Handle varchar length issues: convert notes to TEXT
+    if 'notes' in line and 'varchar' in line:
+        line = _VARCHAR_RE.sub('TEXT', line)
+    
+    return line
+
+def create_table(table_name, mysql_ddl, with_enums=False):
+    """Create the table in PostgreSQL"""
+    postgres_ddl = convert_mysql_to_postgresql_ddl(table_name, mysql_ddl, include_constraints=False, preserve_case=PRESERVE_MYSQL_CASE)
+    if not postgres_ddl:
+        return False
+    
+    print(f" Generated PostgreSQL DDL for {table_name}:")
+    print("=" * 50)
+    print(postgres_ddl)
+    print("=" * 50)
+    
+    if with_enums:
+        return create_postgresql_table_with_enums(table_name, postgres_ddl, PRESERVE_MYSQL_CASE)
+    return create_postgresql_table(table_name, postgres_ddl, PRESERVE_MYSQL_CASE)
+
+def create_indexes(table_name, indexes, concurrently=False):
+    """Create indexes for a table
+    
+    With concurrently=True each index is built with CREATE INDEX CONCURRENTLY, one at a time,
+    so a target that is already serving traffic keeps accepting writes during the build.
+    """
+    if not indexes:
+        print(f" No indexes to create for {table_name}")
+        return True
+    
+    print(f" Creating {len(indexes)} indexes for {table_name}...")
+    
+    # Table reference, index name prefix and column quote are the same for every index
+    table_ref = f'"{table_name}"' if PRESERVE_MYSQL_CASE else table_name.lower()
+    index_prefix = f"{table_name.lower()}_"
+    column_quote = '"' if PRESERVE_MYSQL_CASE else ''
+    table_for_check = table_name if PRESERVE_MYSQL_CASE else table_name.lower()
+    
+    # One catalog query for all existing indexes instead of one check per index. Only valid
+    # indexes count: an interrupted concurrent build leaves an invalid one behind to rebuild
+    existing_indexes = get_postgresql_names(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        f"JOIN pg_class t ON t.oid = i.indrelid WHERE t.relname = '{table_for_check}' AND i.indisvalid;"
+    )
+    
+    pending = []
+    statements = []
+    for index in indexes:
+        index_name = index_prefix + index['name']
+        if index_name in existing_indexes:
+            print(f" Skipping existing index: {index_name}")
+            continue
+        
+        columns = index['columns'].replace('`', column_quote)
+        unique_clause = "UNIQUE " if index.get('unique', False) else ""
+        pending.append(index)
+        if concurrently:
+            statements.append((
+                f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}";',
+                f'CREATE {unique_clause}INDEX CONCURRENTLY "{index_name}" ON {table_ref} ({columns});'
+            ))
+        else:
+            statements.append((f'CREATE {unique_clause}INDEX IF NOT EXISTS "{index_name}" ON {table_ref} ({columns});',))
+    
+    if not statements:
+        return True
+    
+    # Each index gets its own session so independent builds overlap; CREATE INDEX only takes
+    # a SHARE lock, so builds on the same table do not block each other. Concurrent builds lock
+    # out one another on the same table, so those run one at a time
+    workers = 1 if concurrently else min(INDEX_WORKERS, len(statements))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda index_sql: execute_postgresql_statements(INDEX_SESSION_SETTINGS + index_sql),
+            statements
+        ))
+    
+    success = True
+    for index, result in zip(pending, results):
+        if result and result.returncode == 0:
+            print(f" Created {table_name} index: {index['name']}")
+        else:
+            error_msg = result.stderr.strip() if result else "No result"
+            print(f" Failed to create {table_name} index {index['name']}: {error_msg}")
+            success = False
+    
+    return success
+
+def create_foreign_keys(table_name, foreign_keys):
+    """Create foreign keys for a table"""
+    if not foreign_keys:
+        print(f" No foreign keys to create for {table_name}")
+        return True
+    
+    print(f" Creating {len(foreign_keys)} foreign keys for {table_name}...")
+    
+    # One catalog query each for the existing FKs and for the referenced tables that exist
+    existing_constraints = get_postgresql_names(
+        f"SELECT constraint_name FROM information_schema.table_constraints WHERE table_name = '{table_name}' AND constraint_type = 'FOREIGN KEY';"
+    )
+    existing_tables = get_existing_postgresql_tables(
+        {fk['ref_table'] if PRESERVE_MYSQL_CASE else fk['ref_table'].lower() for fk in foreign_keys}
+    )
+    
+    created = 0
+    skipped = 0
+    pending = []
+    statements = []
+    
+    for fk in foreign_keys:
+        constraint_name = f"{table_name}_{fk['name']}"
+        if constraint_name in existing_constraints:
+            print(f" Skipping existing FK: {constraint_name}")
+            skipped += 1
+            continue
+        if (fk['ref_table'] if PRESERVE_MYSQL_CASE else fk['ref_table'].lower()) not in existing_tables:
+            print(f" Skipping FK {constraint_name}: referenced table {fk['ref_table']} does not exist yet")
+            skipped += 1
+            continue
+        
+        local_cols = fk['local_columns'].replace('`', '"')
+        ref_table = f'"{fk["ref_table"]}"' if PRESERVE_MYSQL_CASE else fk['ref_table']
+        ref_cols = fk['ref_columns'].replace('`', '"')
+        
+        print(f" Creating {table_name} FK: {constraint_name} -> {fk['ref_table']}")
+        pending.append(constraint_name)
+        statements.append(f'ALTER TABLE "{table_name}" ADD CONSTRAINT "{constraint_name}" FOREIGN KEY ({local_cols}) REFERENCES {ref_table} ({ref_cols}) ON DELETE {fk["on_delete"]} ON UPDATE {fk["on_update"]};')
+    
+    if statements:
+        # All constraints go through one psql session; a failed FK does not stop the others
+        errors = execute_postgresql_ddl_batch(statements)
+        if errors is None:
+            print(f" Failed to create foreign keys for {table_name}")
+        else:
+            for i, constraint_name in enumerate(pending):
+                if i in errors:
+                    print(f" Failed to create {table_name} FK {constraint_name}: {errors[i]}")
+                else:
+                    print(f" Created {table_name} FK: {constraint_name}")
+                    created += 1
+    
+    print(f" {table_name} Foreign Keys: {created} created, {skipped} skipped")
+    return True
+
+def main(table_name=None, with_enums=False):
+    """Run the requested phases for table_name; without one, the table comes from --table"""
+    parser = argparse.ArgumentParser(description=f'Migrate {table_name or "a"} table from MySQL to PostgreSQL')
+    if table_name is None:
+        parser.add_argument('--table', required=True, help='MySQL table name, e.g. Client')
+        parser.add_argument('--enums', action='store_true', help='Create ENUM types with the table')
+    parser.add_argument('--phase', choices=['1', '2', '3'], help='Run specific phase')
+    parser.add_argument('--full', action='store_true', help='Run all phases')
+    parser.add_argument('--verify', action='store_true', help='Verify table structure')
+    parser.add_argument('--concurrent-indexes', action='store_true', help='Build phase-2 indexes with CREATE INDEX CONCURRENTLY (for a live target)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-read the CREATE TABLE statement from MySQL')
+    args = parser.parse_args()
+    if table_name is None:
+        table_name = args.table
+        with_enums = args.enums
+    
+    if args.verify:
+        print(f" Verifying table structure for {table_name}")
+        verify_table_structure(table_name, PRESERVE_MYSQL_CASE)
+        return
+    
+    if not any([args.phase, args.full]):
+        print("Please specify --phase, --full, or --verify")
+        return
+    
+    # Get table information
+    mysql_ddl, indexes, foreign_keys = get_table_info(table_name, use_cache=not args.no_cache)
+    if not mysql_ddl:
+        return
+    
+    success = True
+    
+    if args.phase == '1' or args.full:
+        print(f" Phase 1: Creating {table_name} table and importing data")
+        if not create_table(table_name, mysql_ddl, with_enums):
+            success = False
+        else:
+            # Pipe mysql -B straight into COPY FROM STDIN, with the column list taken from the
+            # DDL already in hand rather than looked up in the PostgreSQL catalog
+            columns = get_mysql_column_names(mysql_ddl)
+            copy_mysql_table_to_postgresql(table_name, columns, PRESERVE_MYSQL_CASE)
+            add_primary_key_constraint(table_name, PRESERVE_MYSQL_CASE)
+            setup_auto_increment_sequence(table_name, PRESERVE_MYSQL_CASE)
+            print(f" Phase 1 complete for {table_name}")
+    
+    if args.phase == '2' or args.full:
+        print(f" Phase 2: Creating indexes for {table_name}")
+        if not create_indexes(table_name, indexes, args.concurrent_indexes):
+            success = False
+    
+    if args.phase == '3' or args.full:
+        print(f" Phase 3: Creating foreign keys for {table_name}")
+        if not create_foreign_keys(table_name, foreign_keys):
+            success = False
+    
+    if success:
+        print(" Operation completed successfully!")
+    else:
+        print(" Operation completed with errors!")
+
+if __name__ == "__main__":
+    main()
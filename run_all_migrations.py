@@ -1,108 +1,118 @@
-import subprocess
+import asyncio
 import sys
 import os
 import argparse
+import re
 from pathlib import Path
+from table_utils import MYSQL_DDL_SNAPSHOT_ENV, snapshot_mysql_create_tables, load_mysql_ddl_snapshot
 
 # Set UTF-8 encoding for Windows to handle emoji characters
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
 SCRIPTS_FILE = 'migration_scripts.txt'
 LOGS_DIR = 'migration_logs'
+DDL_SNAPSHOT_FILE = f'{LOGS_DIR}/mysql_ddl_snapshot.json'
 
-def run_migrations(phase='1'):
-    """Run all migration scripts for the specified phase"""
-    print(f"\n=== Running all migrations for phase {phase} ===")
-    
-    # Ensure logs directory exists
-    Path(LOGS_DIR).mkdir(exist_ok=True)
+# Referenced table of each FOREIGN KEY clause in a CREATE TABLE statement
+REFERENCES_RE = re.compile(r'REFERENCES\s+`([^`]+)`')
 
-    successes = []
-    failures = []
+def migration_succeeded(phase, returncode, output):
+    """Decide from a script's exit code and output whether its phase succeeded"""
+    # Check for various success indicators based on phase
+    if phase == '1':
+        success_indicators = [
+            'Operation completed successfully',
+            'Phase 1 complete',
+            'Successfully imported',
+            'imported data to',
+            'Table creation output: CREATE TABLE'
+        ]
+        # Additional pattern checks for phase 1
+        pattern_checks = [
+            ('Created "' in output and 'table successfully' in output)
+        ]
+    elif phase == '2':
+        success_indicators = [
+            'Operation completed successfully',
+            'Phase 2 complete',
+            'created index',
+            'Created indexes',
+            'Index creation',
+            'Skipping existing index'
+        ]
+        # Additional pattern checks for phase 2
+        pattern_checks = [
+            ('Creating' in output and 'indexes' in output),
+            ('Found' in output and 'indexes' in output),
+            ('Created' in output and 'index' in output),
+            ('skip' in output and 'index' in output),
+            ('relation' in output and 'already exists' in output),  # Indexes already exist = success
+            ('Creating' in output and 'index:' in output),  # Creating index: [name] = success attempt
+            ('Found' in output and 'indexes and' in output and 'foreign keys' in output)  # Found X indexes and Y foreign keys
+        ]
+    elif phase == '3':
+        success_indicators = [
+            'Operation completed successfully',
+            'Phase 3 complete',
+            'created foreign key',
+            'Created foreign keys',
+            'Foreign key creation'
+        ]
+        # Additional pattern checks for phase 3
+        pattern_checks = [
+            ('Creating' in output and 'foreign keys' in output),
+            ('Found' in output and 'foreign keys' in output)
+        ]
+    else:
+        success_indicators = ['Operation completed successfully']
+        pattern_checks = []
 
-    with open(SCRIPTS_FILE) as f:
-        scripts = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    # Check both string indicators and pattern matches
+    string_match = any(indicator in output for indicator in success_indicators)
+    pattern_match = any(pattern_checks) if pattern_checks else False
 
-    for script in scripts:
-        log_file = f"{LOGS_DIR}/{script.replace('.py', '')}_phase{phase}.log"
+    # For phase 2, if indexes already exist, consider it success regardless of return code
+    indexes_already_exist = phase == '2' and ('relation' in output and 'already exists' in output)
+
+    return (returncode == 0 and (string_match or pattern_match)) or indexes_already_exist
+
+async def run_migration_script(script, phase, semaphore):
+    """Run one migration script for a phase as a subprocess; returns True on success"""
+    log_file = f"{LOGS_DIR}/{script.replace('.py', '')}_phase{phase}.log"
+    async with semaphore:
         print(f"\n=== Running {script} (phase {phase}) ===")
         try:
             # Run with specified phase
             env = os.environ.copy()
             env['PYTHONIOENCODING'] = 'utf-8'
-            result = subprocess.run([sys.executable, script, '--phase', phase], 
-                                   capture_output=True, text=True, encoding='utf-8', env=env)
-            output = result.stdout + '\n' + result.stderr
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, script, '--phase', phase,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=env)
+            stdout, stderr = await process.communicate()
+            output = stdout.decode('utf-8', errors='replace') + '\n' + stderr.decode('utf-8', errors='replace')
             with open(log_file, 'w', encoding='utf-8') as log:
                 log.write(output)
-            
-            # Check for various success indicators based on phase
-            if phase == '1':
-                success_indicators = [
-                    'Operation completed successfully',
-                    'Phase 1 complete',
-                    'Successfully imported',
-                    'imported data to',
-                    'Table creation output: CREATE TABLE'
-                ]
-                # Additional pattern checks for phase 1
-                pattern_checks = [
-                    ('Created "' in output and 'table successfully' in output)
-                ]
-            elif phase == '2':
-                success_indicators = [
-                    'Operation completed successfully',
-                    'Phase 2 complete',
-                    'created index',
-                    'Created indexes',
-                    'Index creation',
-                    'Skipping existing index'
-                ]
-                # Additional pattern checks for phase 2
-                pattern_checks = [
-                    ('Creating' in output and 'indexes' in output),
-                    ('Found' in output and 'indexes' in output),
-                    ('Created' in output and 'index' in output),
-                    ('skip' in output and 'index' in output),
-                    ('relation' in output and 'already exists' in output),  # Indexes already exist = success
-                    ('Creating' in output and 'index:' in output),  # Creating index: [name] = success attempt
-                    ('Found' in output and 'indexes and' in output and 'foreign keys' in output)  # Found X indexes and Y foreign keys
-                ]
-            elif phase == '3':
-                success_indicators = [
-                    'Operation completed successfully',
-                    'Phase 3 complete',
-                    'created foreign key',
-                    'Created foreign keys',
-                    'Foreign key creation'
-                ]
-                # Additional pattern checks for phase 3
-                pattern_checks = [
-                    ('Creating' in output and 'foreign keys' in output),
-                    ('Found' in output and 'foreign keys' in output)
-                ]
-            else:
-                success_indicators = ['Operation completed successfully']
-                pattern_checks = []
-            
-            # Check both string indicators and pattern matches
-            string_match = any(indicator in output for indicator in success_indicators)
-            pattern_match = any(pattern_checks) if pattern_checks else False
-            
-            # For phase 2, if indexes already exist, consider it success regardless of return code
-            indexes_already_exist = phase == '2' and ('relation' in output and 'already exists' in output)
-            
-            if (result.returncode == 0 and (string_match or pattern_match)) or indexes_already_exist:
+
+            if migration_succeeded(phase, process.returncode, output):
                 print(f"[SUCCESS] {script}")
-                successes.append(script)
-            else:
-                print(f"[FAIL] {script}")
-                failures.append(script)
+                return True
+            print(f"[FAIL] {script}")
+            return False
         except Exception as e:
             with open(log_file, 'a', encoding='utf-8') as log:
                 log.write(f"\nException: {e}\n")
             print(f"[ERROR] {script}: {e}")
-            failures.append(script)
+            return False
+
+def read_scripts():
+    """Read the migration scripts to run, skipping blank lines and comments"""
+    with open(SCRIPTS_FILE) as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+def print_summary(phase, scripts, results):
+    """Print the per-phase success/failure summary; returns True when every script succeeded"""
+    successes = [script for script, ok in zip(scripts, results) if ok]
+    failures = [script for script, ok in zip(scripts, results) if not ok]
 
     print(f"\n=== Migration Summary (phase {phase}) ===")
     print(f"Succeeded: {len(successes)}")
@@ -111,32 +121,125 @@ def run_migrations(phase='1'):
     print(f"Failed: {len(failures)}")
     for f in failures:
         print(f"  - {f}")
-    
+
     return len(failures) == 0
 
+async def run_migrations_async(phase='1', jobs=1):
+    """Run all migration scripts for a phase, at most `jobs` at a time"""
+    print(f"\n=== Running all migrations for phase {phase} ===")
+
+    # Ensure logs directory exists
+    Path(LOGS_DIR).mkdir(exist_ok=True)
+
+    scripts = read_scripts()
+
+    # Each script talks to the databases through its own docker exec clients, so while one
+    # waits on a COPY or an index build the others can make progress
+    semaphore = asyncio.Semaphore(max(1, jobs))
+    results = await asyncio.gather(*(run_migration_script(script, phase, semaphore) for script in scripts))
+
+    return print_summary(phase, scripts, results)
+
+def prepare_ddl_snapshot():
+    """Snapshot every table's SHOW CREATE TABLE once so the per-table scripts skip that MySQL round trip"""
+    Path(LOGS_DIR).mkdir(exist_ok=True)
+    count = snapshot_mysql_create_tables(DDL_SNAPSHOT_FILE)
+    if count:
+        print(f"Cached CREATE TABLE statements for {count} MySQL tables in {DDL_SNAPSHOT_FILE}")
+        # Inherited by every script started through os.environ.copy()
+        os.environ[MYSQL_DDL_SNAPSHOT_ENV] = os.path.abspath(DDL_SNAPSHOT_FILE)
+    else:
+        print("Could not snapshot MySQL DDL; each script will query MySQL itself")
+
+def run_migrations(phase='1', jobs=1):
+    """Run all migration scripts for the specified phase"""
+    return asyncio.run(run_migrations_async(phase, jobs))
+
+def script_dependencies(scripts):
+    """Map each script to the scripts whose tables its foreign keys reference, from the DDL snapshot
+
+    Scripts are matched to tables by name (clockinout_migration.py -> ClockInOut). A script
+    whose table is not in the snapshot maps to None, meaning "wait for every other table".
+    """
+    ddls = load_mysql_ddl_snapshot()
+    script_by_table = {script.replace('_migration.py', '').lower(): script for script in scripts}
+
+    dependencies = {}
+    for script in scripts:
+        table_key = script.replace('_migration.py', '').lower()
+        ddl = next((ddl for table, ddl in ddls.items() if table.lower() == table_key), None)
+        if ddl is None:
+            dependencies[script] = None
+            continue
+        referenced = {script_by_table.get(table.lower()) for table in REFERENCES_RE.findall(ddl)}
+        dependencies[script] = referenced - {None, script}
+    return dependencies
+
+async def run_all_phases_async(jobs=1):
+    """Run every table through phases 1, 2 and 3 as its own pipeline, ordered by the FK graph
+
+    A table's indexes only depend on its own data, so its phase 2 starts as soon as its
+    phase 1 finishes. Its phase 3 only waits for phase 1 of the tables its foreign keys
+    reference, instead of for every table in the migration.
+    """
+    print("\n=== Running phases 1, 2 and 3 as per-table pipelines ===")
+
+    # Ensure logs directory exists
+    Path(LOGS_DIR).mkdir(exist_ok=True)
+
+    scripts = read_scripts()
+    semaphore = asyncio.Semaphore(max(1, jobs))
+    dependencies = script_dependencies(scripts)
+    table_loaded = {script: asyncio.Event() for script in scripts}
+    table_ok = {}
+
+    async def table_pipeline(script):
+        table_ok[script] = await run_migration_script(script, '1', semaphore)
+        table_loaded[script].set()
+        index_ok = table_ok[script] and await run_migration_script(script, '2', semaphore)
+
+        waits_on = dependencies[script]
+        if waits_on is None:
+            waits_on = set(scripts) - {script}
+        for dependency in waits_on:
+            await table_loaded[dependency].wait()
+        if not index_ok or not all(table_ok[dependency] for dependency in waits_on):
+            print(f"[SKIP] {script} (phase 3): its table or a referenced table failed earlier")
+            return table_ok[script], index_ok, False
+        fk_ok = await run_migration_script(script, '3', semaphore)
+        return table_ok[script], index_ok, fk_ok
+
+    results = await asyncio.gather(*(table_pipeline(script) for script in scripts))
+
+    success = True
+    for i, phase in enumerate(('1', '2', '3')):
+        if not print_summary(phase, scripts, [r[i] for r in results]):
+            print(f"Phase {phase} had failures.")
+            success = False
+    return success
+
 def main():
     parser = argparse.ArgumentParser(description='Run all migration scripts for a specific phase')
     parser.add_argument('--phase', choices=['1', '2', '3'], default='1', 
                        help='Migration phase to run (1=table+data, 2=indexes, 3=foreign keys)')
     parser.add_argument('--all-phases', action='store_true', 
-                       help='Run all phases in sequence (1, 2, 3)')
+                       help='Run all phases as per-table pipelines ordered by foreign key dependencies')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Number of migration scripts to run concurrently within a phase (default: 1)')
     
     args = parser.parse_args()
     
+    prepare_ddl_snapshot()
+    
     if args.all_phases:
-        print("Running all phases in sequence...")
-        success = True
-        for phase in ['1', '2', '3']:
-            if not run_migrations(phase):
-                print(f"Phase {phase} had failures. Stopping.")
-                success = False
-                break
+        print("Running all phases...")
+        success = asyncio.run(run_all_phases_async(args.jobs))
         if success:
             print("\n=== ALL PHASES COMPLETED SUCCESSFULLY ===")
         else:
             print("\n=== SOME PHASES FAILED ===")
     else:
-        run_migrations(args.phase)
+        run_migrations(args.phase, args.jobs)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -12,14 +12,53 @@ These functions can be used for any table migration verification.
 import subprocess
 import re
 import os
+import json
 import tempfile
+import collections
+import csv
+import datetime
+
+# Optional database drivers: when installed, metadata queries reuse one persistent connection
+# per database instead of paying a docker exec + client start-up for every query
+try:
+    import pymysql
+except ImportError:
+    pymysql = None
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+# Connection settings for the ports published by docker-compose.yml
+MYSQL_CONNECTION = {'host': '127.0.0.1', 'port': 3306, 'user': 'mysql', 'password': 'mysql', 'database': 'source_db'}
+POSTGRESQL_CONNECTION = {'host': '127.0.0.1', 'port': 5432, 'user': 'postgres', 'password': 'postgres', 'dbname': 'target_db'}
+
+# Shared connections; False marks a failed connect so it is not retried on every call
+_mysql_connection = None
+_postgresql_connection = None
+
+# SHOW CREATE TABLE snapshot written once by run_all_migrations.py; when this environment
+# variable points at it, get_mysql_create_table answers from it instead of querying MySQL
+MYSQL_DDL_SNAPSHOT_ENV = 'MIGRATION_DDL_SNAPSHOT'
+_mysql_ddl_snapshot = None
+
+# Per-process prefix for scratch SQL files (local and in the container) so several
+# migration scripts can run side by side without overwriting each other's files
+TEMP_PREFIX = f"mig{os.getpid()}_"
+
+# Client invocations as argument vectors: run without /bin/sh and need no shell quoting
+MYSQL_EXEC_PREFIX = ['docker', 'exec', 'mysql_source', 'mysql', '-u', 'mysql', '-pmysql', 'source_db']
+PSQL_EXEC_PREFIX = ['docker', 'exec', 'postgres_target', 'psql', '-U', 'postgres', '-d', 'target_db']
+# Same as PSQL_EXEC_PREFIX but keeps stdin open for scripts and COPY data
+PSQL_STDIN_EXEC_PREFIX = ['docker', 'exec', '-i', 'postgres_target', 'psql', '-U', 'postgres', '-d', 'target_db']
 
 def run_command(command, timeout=60):
-    """Run shell command with error handling"""
+    """Run a command with error handling; a string goes through the shell, an argument list does not"""
     try:
         result = subprocess.run(
             command, 
-            shell=True, 
+            shell=isinstance(command, str), 
             capture_output=True, 
             text=True,
             encoding='utf-8',
@@ -32,31 +71,356 @@ def run_command(command, timeout=60):
         return None
 
 def execute_postgresql_sql(sql_statement, description="SQL statement"):
-    """Execute a PostgreSQL SQL statement using file-based approach to handle quotes properly"""
-    # Write SQL to file to handle quotes properly
-    with open('temp_sql.sql', 'w', encoding='utf-8') as f:
-        f.write(sql_statement)
+    """Execute a PostgreSQL SQL statement on the shared connection, or piped to psql on stdin"""
+    # With psycopg2 the statement runs on the shared connection instead of a psql start-up
+    conn = get_postgresql_connection()
+    if conn:
+        return _execute_postgresql_sql_direct(conn, sql_statement, description)
     
-    # Copy and execute
-    copy_cmd = 'docker cp temp_sql.sql postgres_target:/tmp/temp_sql.sql'
-    copy_result = run_command(copy_cmd)
+    # Pipe the SQL to psql on stdin: quotes need no escaping and there is no temp file to clean up
+    result = execute_postgresql_script(sql_statement, on_error_stop=False)
     
-    if not copy_result or copy_result.returncode != 0:
-        print(f"Failed to copy {description} file")
-        return False, None
+    return result and result.returncode == 0, result
+
+def get_mysql_connection():
+    """Return the shared PyMySQL connection to the source database, or None to fall back to docker exec"""
+    global _mysql_connection
+    if pymysql is None or _mysql_connection is False:
+        return None
     
-    result = run_command('docker exec postgres_target psql -U postgres -d target_db -f /tmp/temp_sql.sql')
+    if _mysql_connection is None:
+        try:
+            _mysql_connection = pymysql.connect(charset='utf8mb4', **MYSQL_CONNECTION)
+        except Exception as e:
+            print(f"Direct MySQL connection failed, using docker exec instead: {str(e)}")
+            _mysql_connection = False
+            return None
+    return _mysql_connection
+
+def _execute_postgresql_sql_direct(conn, sql_statement, description):
+    """Run SQL on a psycopg2 connection, returning (success, result) shaped like the psql path
     
-    # Cleanup
-    run_command('rm -f temp_sql.sql')
-    run_command('docker exec postgres_target rm -f /tmp/temp_sql.sql')
+    stdout carries the command tag (e.g. CREATE INDEX, COPY 42) that callers look for in
+    psql's output; stderr carries the error message on failure.
+    """
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql_statement)
+            status = cursor.statusmessage or ""
+    except Exception as e:
+        return False, subprocess.CompletedProcess(description, 1, "", f"ERROR:  {str(e)}")
+    return True, subprocess.CompletedProcess(description, 0, f"{status}\n", "")
+
+def get_postgresql_connection():
+    """Return the shared psycopg2 connection to the target database, or None to fall back to docker exec"""
+    global _postgresql_connection
+    if psycopg2 is None or _postgresql_connection is False:
+        return None
     
-    return result and result.returncode == 0, result
+    if _postgresql_connection is None:
+        try:
+            _postgresql_connection = psycopg2.connect(**POSTGRESQL_CONNECTION)
+            _postgresql_connection.autocommit = True
+        except Exception as e:
+            print(f"Direct PostgreSQL connection failed, using docker exec instead: {str(e)}")
+            _postgresql_connection = False
+            return None
+    return _postgresql_connection
+
+def load_mysql_ddl_snapshot():
+    """Load the SHOW CREATE TABLE snapshot named by MIGRATION_DDL_SNAPSHOT, once per process ({} if unset)"""
+    global _mysql_ddl_snapshot
+    if _mysql_ddl_snapshot is None:
+        _mysql_ddl_snapshot = {}
+        path = os.environ.get(MYSQL_DDL_SNAPSHOT_ENV)
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    _mysql_ddl_snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable DDL snapshot {path}: {str(e)}")
+    return _mysql_ddl_snapshot
+
+# One "<table>\tCREATE TABLE ..." record of a multi-statement --raw SHOW CREATE TABLE output
+_SNAPSHOT_ROW_RE = re.compile(r'^([^\t\n]+)\t(CREATE TABLE .*?)(?=^[^\t\n]+\tCREATE TABLE |\Z)', re.MULTILINE | re.DOTALL)
+
+def snapshot_mysql_create_tables(path):
+    """Fetch SHOW CREATE TABLE for every MySQL base table in one session and save it as JSON; returns the table count"""
+    ddls = {}
+    conn = get_mysql_connection()
+    if conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+                for table_name in [row[0] for row in cursor.fetchall()]:
+                    cursor.execute(f"SHOW CREATE TABLE `{table_name}`")
+                    row = cursor.fetchone()
+                    ddls[row[0]] = row[1]
+        except Exception as e:
+            print(f"Failed to snapshot MySQL DDL: {str(e)}")
+            return 0
+    else:
+        base = MYSQL_EXEC_PREFIX + ['--batch', '--raw', '--skip-column-names', '-e']
+        try:
+            tables = subprocess.run(base + ["SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'"],
+                                    capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=60)
+            table_names = [line.split('\t')[0] for line in tables.stdout.splitlines() if line.strip()]
+            if tables.returncode != 0 or not table_names:
+                print(f"Failed to list MySQL tables: {tables.stderr}")
+                return 0
+            # All SHOW CREATE TABLE statements in one mysql session; each result is "<table>\t<ddl>"
+            # with the DDL's own newlines kept by --raw
+            result = subprocess.run(base + [''.join(f"SHOW CREATE TABLE `{name}`;" for name in table_names)],
+                                    capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=600)
+        except Exception as e:
+            print(f"Failed to snapshot MySQL DDL: {str(e)}")
+            return 0
+        if result.returncode != 0:
+            print(f"Failed to snapshot MySQL DDL: {result.stderr}")
+            return 0
+        for match in _SNAPSHOT_ROW_RE.finditer(result.stdout):
+            ddls[match.group(1)] = match.group(2).strip()
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(ddls, f)
+    return len(ddls)
+
+# Column definitions are the only CREATE TABLE lines that start with a backticked name;
+# SHOW CREATE TABLE output may carry literal \n escapes or real newlines
+_MYSQL_COLUMN_DEF_RE = re.compile(r'^\s*`([^`]+)`\s')
+_MYSQL_DDL_LINE_SPLIT_RE = re.compile(r'\\n|\r?\n')
+
+def get_mysql_column_names(mysql_ddl):
+    """Return the column names of a MySQL CREATE TABLE statement in definition order"""
+    matches = (_MYSQL_COLUMN_DEF_RE.match(line) for line in _MYSQL_DDL_LINE_SPLIT_RE.split(mysql_ddl))
+    return [match.group(1) for match in matches if match]
+
+def get_mysql_create_table(table_name):
+    """Get the SHOW CREATE TABLE statement for a MySQL table, or None if it cannot be read"""
+    snapshot_ddl = load_mysql_ddl_snapshot().get(table_name)
+    if snapshot_ddl:
+        return snapshot_ddl
+    
+    conn = get_mysql_connection()
+    if conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SHOW CREATE TABLE `{table_name}`")
+                row = cursor.fetchone()
+            return row[1] if row else None
+        except Exception as e:
+            print(f"Failed to get table info: {str(e)}")
+            return None
+    
+    # --raw keeps the DDL's newlines unescaped and --skip-column-names drops the header row,
+    # so the output is exactly "<table>\t<ddl>" and needs no line scanning
+    cmd = MYSQL_EXEC_PREFIX + ['--batch', '--raw', '--skip-column-names', '-e', f"SHOW CREATE TABLE `{table_name}`;"]
+    result = run_command(cmd)
+    
+    if not result or result.returncode != 0:
+        print(f"Failed to get table info: {result.stderr if result else 'No result'}")
+        return None
+    
+    _, _, ddl = result.stdout.partition("\t")
+    if ddl.lstrip().startswith("CREATE TABLE"):
+        return ddl.strip()
+    
+    print(f"Failed to get table info: SHOW CREATE TABLE `{table_name}` returned no CREATE TABLE statement")
+    return None
+
+def split_create_table_clauses(mysql_ddl):
+    """Split a CREATE TABLE body into its top-level column/key/constraint clauses, or None if there is no body"""
+    # Fix literal \n characters to actual newlines first
+    ddl = mysql_ddl.replace('\\n', '\n')
+    
+    create_pos = ddl.find('CREATE TABLE')
+    start = ddl.find('(', create_pos) if create_pos != -1 else -1
+    if start == -1:
+        return None
+    
+    # One pass tracking paren depth and quotes, so commas inside DECIMAL(10,2), ENUM('a','b')
+    # or multi-column KEY definitions never split a clause
+    clauses = []
+    depth = 0
+    quote = None
+    clause_start = start + 1
+    i = clause_start
+    
+    while i < len(ddl):
+        ch = ddl[i]
+        if quote:
+            if ch == '\\' and quote == "'":
+                i += 1  # skip the escaped character
+            elif ch == quote:
+                quote = None
+        elif ch in "'`\"":
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            if depth == 0:
+                break  # closing paren of the CREATE TABLE body
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            clauses.append(ddl[clause_start:i].strip())
+            clause_start = i + 1
+        i += 1
+    
+    clauses.append(ddl[clause_start:i].strip())
+    return [clause for clause in clauses if clause]
+
+def get_postgresql_names(query):
+    """Run a single-column catalog query and return its rows as a set of names"""
+    conn = get_postgresql_connection()
+    if conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query)
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"Catalog query failed: {str(e)}")
+            return set()
+    
+    cmd = PSQL_EXEC_PREFIX + ['-t', '-A', '-c', query]
+    result = run_command(cmd)
+    
+    if not result or result.returncode != 0:
+        return set()
+    return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+
+def get_existing_postgresql_tables(table_names):
+    """Return which of the given PostgreSQL table names exist, in one catalog query"""
+    if not table_names:
+        return set()
+    name_list = ', '.join(f"'{name}'" for name in sorted(table_names))
+    return get_postgresql_names(
+        f"SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' AND table_name IN ({name_list});"
+    )
+
+def get_postgresql_column_names(lookup_table_name, include_id=True):
+    """Return a table's column names in ordinal order, reusing the shared connection when there is one"""
+    id_filter = "" if include_id else " AND column_name != 'id'"
+    query = f"SELECT column_name FROM information_schema.columns WHERE table_name = '{lookup_table_name}'{id_filter} ORDER BY ordinal_position;"
+    
+    conn = get_postgresql_connection()
+    if conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query)
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Column lookup failed: {str(e)}")
+            return []
+    
+    cmd = PSQL_EXEC_PREFIX + ['-t', '-A', '-c', query]
+    result = run_command(cmd)
+    
+    if not result or result.returncode != 0:
+        return []
+    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+def execute_postgresql_statements(statements, timeout=3600):
+    """Run statements in their own psql session via an argument vector (no shell quoting or shared temp files)
+    
+    Safe to call from several threads at once, e.g. to build independent indexes in parallel.
+    """
+    cmd = PSQL_EXEC_PREFIX + ['-v', 'ON_ERROR_STOP=1']
+    for sql in statements:
+        cmd += ['-c', sql]
+    
+    try:
+        return subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            timeout=timeout
+        )
+    except Exception as e:
+        print(f"Command failed: {str(e)}")
+        return None
+
+def execute_postgresql_script(sql, timeout=3600, on_error_stop=True):
+    """Pipe a SQL script into one psql session on stdin (no temp file, docker cp or argv size limit)"""
+    cmd = list(PSQL_STDIN_EXEC_PREFIX)
+    if on_error_stop:
+        cmd += ['-v', 'ON_ERROR_STOP=1']
+    try:
+        return subprocess.run(
+            cmd,
+            input=sql,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            timeout=timeout
+        )
+    except Exception as e:
+        print(f"Command failed: {str(e)}")
+        return None
+
+# Warnings raised by the per-statement wrappers in execute_postgresql_ddl_batch
+_BATCH_WARNING_RE = re.compile(r'^WARNING:\s+batch statement (\d+) failed: (.*)$', re.MULTILINE)
+
+def execute_postgresql_ddl_batch(statements, timeout=3600):
+    """Run DDL statements in one psql session, each one independent of the others' failures
+    
+    Every statement is wrapped in a DO block that turns an error into a WARNING, so one
+    bad index or FK does not stop the rest. Returns {statement index: error message}
+    for the statements that failed, or None if the session itself could not run.
+    """
+    wrapped = [
+        f"""DO $$ BEGIN
+    {sql.rstrip().rstrip(';')};
+EXCEPTION WHEN others THEN
+    RAISE WARNING 'batch statement {i} failed: %', SQLERRM;
+END $$;"""
+        for i, sql in enumerate(statements)
+    ]
+    
+    # With psycopg2 the whole batch goes out as one multi-statement query on the shared
+    # connection: a single round trip, with the wrappers' warnings collected from notices
+    conn = get_postgresql_connection()
+    if conn:
+        # psycopg2 trims a plain list of notices to the last 50; a deque keeps them all
+        notices, conn.notices = conn.notices, collections.deque()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("\n".join(wrapped))
+        except Exception as e:
+            print(f"Batch execution failed: {str(e)}")
+            return None
+        finally:
+            notices, conn.notices = conn.notices, notices
+        return {int(i): message for i, message in _BATCH_WARNING_RE.findall("".join(notices))}
+    
+    result = execute_postgresql_script("\n".join(wrapped), timeout=timeout)
+    if not result or result.returncode != 0:
+        print(f"Batch execution failed: {result.stderr if result else 'No result'}")
+        return None
+    return {int(i): message for i, message in _BATCH_WARNING_RE.findall(result.stderr)}
 
 def get_mysql_table_columns(table_name):
     """Get column information from MySQL table"""
     print(f"Getting MySQL column info for {table_name}...")
     
+    conn = get_mysql_connection()
+    if conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"DESCRIBE `{table_name}`")
+                rows = cursor.fetchall()
+        except Exception as e:
+            print(f"Failed to get MySQL columns: {str(e)}")
+            return None
+        columns = [
+            {'name': name, 'type': col_type, 'null': null, 'key': key, 'default': default, 'extra': extra}
+            for name, col_type, null, key, default, extra in rows
+        ]
+        print(f"Found {len(columns)} MySQL columns")
+        return columns
+    
     # Use DESCRIBE which gives more reliable output format
     cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "DESCRIBE {table_name};"'
     result = run_command(cmd)
@@ -423,7 +787,7 @@ def get_mysql_table_info(table_name):
     """Get complete table information from MySQL including constraints"""
     print(f"Getting complete table info for {table_name} from MySQL...")
     
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW CREATE TABLE `{table_name}`;"'
+    cmd = MYSQL_EXEC_PREFIX + ['-e', f"SHOW CREATE TABLE `{table_name}`;"]
     result = run_command(cmd)
     
     if not result or result.returncode != 0:
@@ -434,13 +798,13 @@ def get_mysql_table_info(table_name):
 
 def table_exists_mysql(table_name):
     """Check if table exists in MySQL"""
-    cmd = f'docker exec mysql_source mysql -u mysql -pmysql source_db -e "SHOW TABLES LIKE \'{table_name}\';"'
+    cmd = MYSQL_EXEC_PREFIX + ['-e', f"SHOW TABLES LIKE '{table_name}';"]
     result = run_command(cmd)
     return result and result.returncode == 0 and table_name in result.stdout
 
 def table_exists_postgresql(table_name):
     """Check if table exists in PostgreSQL"""
-    cmd = f'docker exec postgres_target psql -U postgres -d target_db -t -c "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = \'{table_name.lower()}\' AND table_schema = \'public\';"'
+    cmd = PSQL_EXEC_PREFIX + ['-t', '-c', f"SELECT COUNT(*) FROM information_schema.tables WHERE table_name = '{table_name.lower()}' AND table_schema = 'public';"]
     result = run_command(cmd)
     
     if result and result.returncode == 0:
@@ -516,20 +880,8 @@ def create_postgresql_table(table_name, postgres_ddl, preserve_case=True):
     # Drop table if exists
     drop_sql = f"DROP TABLE IF EXISTS {pg_table_name} CASCADE;"
     
-    # Write to temporary file to handle quotes properly
-    with open('drop_table.sql', 'w', encoding='utf-8') as f:
-        f.write(drop_sql)
-    
-    # Copy and execute
-    copy_cmd = 'docker cp drop_table.sql postgres_target:/tmp/drop_table.sql'
-    run_command(copy_cmd)
-    
-    drop_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/drop_table.sql'
-    result = run_command(drop_cmd)
-    
-    # Cleanup
-    run_command('rm -f drop_table.sql')  # Remove local file
-    run_command('docker exec postgres_target rm -f /tmp/drop_table.sql')  # Remove container file
+    # Piped to psql on stdin, which handles quotes without a temp file or docker cp
+    result = execute_postgresql_script(drop_sql, on_error_stop=False)
     
     if not result or result.returncode != 0:
         print(f"Warning: Could not drop table (might not exist): {result.stderr if result else 'No result'}")
@@ -553,46 +905,24 @@ def create_postgresql_table(table_name, postgres_ddl, preserve_case=True):
     if not clean_ddl.endswith(';'):
         clean_ddl += ';'
     
-    # Write DDL to a temporary file to avoid shell escaping issues
-    import tempfile
-    import os
+    # Pipe the DDL to psql on stdin (no temp file or docker cp); as with psql -f,
+    # a failing statement does not stop the rest of the script
+    result = execute_postgresql_script(clean_ddl, on_error_stop=False)
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False) as f:
-        f.write(clean_ddl)
-        temp_file = f.name
+    if not result or result.returncode != 0:
+        print(f"Failed to create table: {result.stderr if result else 'No result'}")
+        print(f"DDL that failed:")
+        print(clean_ddl)
+        return False
     
-    try:
-        # Copy the SQL file to the container and execute it
-        copy_cmd = f'docker cp {temp_file} postgres_target:/tmp/create_table.sql'
-        result = run_command(copy_cmd)
-        
-        if not result or result.returncode != 0:
-            print(f"Failed to copy SQL file: {result.stderr if result else 'No result'}")
-            return False
-        
-        # Execute the SQL file
-        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/create_table.sql'
-        result = run_command(exec_cmd)
-        
-        if not result or result.returncode != 0:
-            print(f"Failed to create table: {result.stderr if result else 'No result'}")
-            print(f"DDL that failed:")
-            print(clean_ddl)
-            return False
-        
-        # Also show any warnings or output from table creation
-        if result.stdout:
-            print(f"Table creation output: {result.stdout}")
-        if result.stderr:
-            print(f"Table creation warnings: {result.stderr}")
-        
-        print(f"Created {pg_table_name} table successfully")
-        return True
-        
-    finally:
-        # Clean up temporary file
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
+    # Also show any warnings or output from table creation
+    if result.stdout:
+        print(f"Table creation output: {result.stdout}")
+    if result.stderr:
+        print(f"Table creation warnings: {result.stderr}")
+    
+    print(f"Created {pg_table_name} table successfully")
+    return True
 
 def export_and_clean_mysql_data(table_name):
     """Export data from MySQL with advanced cleaning"""
@@ -616,53 +946,38 @@ def import_clientconversationtrack_with_proper_export(pg_table_name, preserve_ca
         print(f"Failed to export ClientConversationTrack data: {result.stderr if result else 'No result'}")
         return False
     
-    # Process the pipe-delimited data
-    import tempfile
-    import csv
-    
-    csv_lines = []
+    # Process the pipe-delimited data, writing each CSV row straight to the file through one
+    # writer (no per-row StringIO, no list of lines and no final join)
     lines = result.stdout.strip().split('\n')
+    row_count = 0
     
-    for line in lines:
-        line = line.strip()
-        if line:
-            # Split by pipe delimiter
-            fields = line.split('|')
-            
-            if len(fields) >= 11:  # We expect 11 fields
-                # Skip ID field if not including it
-                if not include_id:
-                    fields = fields[1:]  # Remove first field (id)
-                
-                # Convert NULL/empty values
-                processed_fields = []
-                for field in fields:
-                    if field == 'NULL' or field == '':
-                        processed_fields.append('')
-                    else:
-                        processed_fields.append(field)
-                
-                # Write as CSV line
-                import io
-                output = io.StringIO()
-                writer = csv.writer(output)
-                writer.writerow(processed_fields)
-                csv_lines.append(output.getvalue().strip())
-    
-    if not csv_lines:
-        print(f"No data lines processed from export. Raw output lines: {len(lines)}")
-        if lines:
-            print(f"First few lines: {lines[:3]}")
-        return False
-    
-    print(f"Processed {len(csv_lines)} data lines")
-    
-    # Write CSV file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8') as f:
-        f.write('\n'.join(csv_lines))
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8', newline='') as f:
         temp_file = f.name
+        writer = csv.writer(f, lineterminator='\n')
+        for line in lines:
+            line = line.strip()
+            if line:
+                # Split by pipe delimiter
+                fields = line.split('|')
+                
+                if len(fields) >= 11:  # We expect 11 fields
+                    # Skip ID field if not including it
+                    if not include_id:
+                        fields = fields[1:]  # Remove first field (id)
+                    
+                    # Convert NULL/empty values
+                    writer.writerow(['' if field == 'NULL' else field for field in fields])
+                    row_count += 1
     
     try:
+        if not row_count:
+            print(f"No data lines processed from export. Raw output lines: {len(lines)}")
+            if lines:
+                print(f"First few lines: {lines[:3]}")
+            return False
+        
+        print(f"Processed {row_count} data lines")
+        
         return execute_csv_import(temp_file, pg_table_name, preserve_case, include_id)
     finally:
         if temp_file and os.path.exists(temp_file):
@@ -688,13 +1003,7 @@ def execute_csv_import(csv_file_path, pg_table_name, preserve_case, include_id):
     else:
         lookup_table_name = "clientconversationtrack"
     
-    id_filter = "" if include_id else " AND column_name != 'id'"
-    get_columns_cmd = f'docker exec postgres_target psql -U postgres -d target_db -t -c "SELECT column_name FROM information_schema.columns WHERE table_name = \'{lookup_table_name}\'{id_filter} ORDER BY ordinal_position;"'
-    col_result = run_command(get_columns_cmd)
-    
-    columns = []
-    if col_result and col_result.returncode == 0:
-        columns = [col.strip() for col in col_result.stdout.strip().split('\n') if col.strip()]
+    columns = get_postgresql_column_names(lookup_table_name, include_id)
     
     # Create COPY command
     if preserve_case:
@@ -713,7 +1022,7 @@ def execute_csv_import(csv_file_path, pg_table_name, preserve_case, include_id):
     
     try:
         # Copy SQL file to container
-        copy_sql_cmd = f'docker cp "{copy_sql_file}" postgres_target:/tmp/import_data.sql'
+        copy_sql_cmd = f'docker cp "{copy_sql_file}" postgres_target:/tmp/{TEMP_PREFIX}import_data.sql'
         result = run_command(copy_sql_cmd)
         
         if not result or result.returncode != 0:
@@ -721,7 +1030,7 @@ def execute_csv_import(csv_file_path, pg_table_name, preserve_case, include_id):
             return False
         
         # Execute the SQL
-        import_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/import_data.sql'
+        import_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{TEMP_PREFIX}import_data.sql'
         result = run_command(import_cmd)
         
         if not result or result.returncode != 0:
@@ -742,8 +1051,239 @@ def execute_csv_import(csv_file_path, pg_table_name, preserve_case, include_id):
         except:
             pass
 
-def import_data_to_postgresql(table_name, data_indicator, preserve_case=True, include_id=False):
-    """Import data to PostgreSQL using direct transfer"""
+def stream_mysql_to_postgresql_copy(select_sql, copy_sql, before_sql=(), after_sql=(), timeout=3600):
+    """Pipe a MySQL batch-mode SELECT straight into a PostgreSQL COPY ... FROM STDIN without intermediate files
+    
+    before_sql and after_sql are run around the COPY inside the same transaction
+    (e.g. SET LOCAL statements and DDL before, sequence/index/FK setup after).
+    """
+    # --quick makes mysql print each row as it arrives instead of buffering the whole result first
+    mysql_cmd = MYSQL_EXEC_PREFIX + ['-B', '--quick', '--skip-column-names', '-e', select_sql]
+    psql_cmd = PSQL_STDIN_EXEC_PREFIX + ['-v', 'ON_ERROR_STOP=1', '--single-transaction']
+    for sql in before_sql:
+        psql_cmd += ['-c', sql]
+    psql_cmd += ['-c', copy_sql]
+    for sql in after_sql:
+        psql_cmd += ['-c', sql]
+    
+    try:
+        export = subprocess.Popen(mysql_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        copy_proc = subprocess.Popen(
+            psql_cmd,
+            stdin=export.stdout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        # Let mysql see a broken pipe if psql exits early
+        export.stdout.close()
+        stdout, stderr = copy_proc.communicate(timeout=timeout)
+        export_stderr = export.stderr.read().decode('utf-8', errors='replace')
+        export.wait()
+        
+        returncode = export.returncode or copy_proc.returncode
+        return subprocess.CompletedProcess(psql_cmd, returncode, stdout, export_stderr + stderr)
+    except Exception as e:
+        print(f"Command failed: {str(e)}")
+        return None
+
+# Backslash escapes COPY's text format needs for the characters it treats as delimiters
+_COPY_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+def _copy_text_field(value):
+    """Encode one driver value as a COPY text-format field (NULL as \\N)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (bytes, bytearray)):
+        return '\\\\x' + value.hex()
+    return str(value).translate(_COPY_TEXT_ESCAPES)
+
+# MySQL protocol type codes whose values never contain a backslash, tab or newline: DECIMAL,
+# TINY, SHORT, LONG, FLOAT, DOUBLE, TIMESTAMP, LONGLONG, INT24, DATE, DATETIME, YEAR, NEWDECIMAL
+_COPY_PLAIN_FIELD_TYPES = frozenset({0, 1, 2, 3, 4, 5, 7, 8, 9, 10, 12, 13, 246})
+
+# MySQL protocol type code for TIME, which PyMySQL returns as a timedelta
+_MYSQL_TIME_FIELD_TYPE = 11
+
+def _copy_plain_field(value):
+    """Encode a numeric or temporal driver value as a COPY text-format field (no escaping needed)"""
+    return '\\N' if value is None else str(value)
+
+def _copy_time_field(value):
+    """Encode a MySQL TIME value as [-]HH:MM:SS[.ffffff]
+    
+    TIME ranges over -838:59:59..838:59:59, which str(timedelta) prints as '1 day, 10:00:00'
+    or '-1 day, 23:00:00'.
+    """
+    if value is None:
+        return '\\N'
+    if not isinstance(value, datetime.timedelta):
+        # PyMySQL hands back the raw text when it cannot parse the value
+        return str(value).translate(_COPY_TEXT_ESCAPES)
+    sign = '-' if value < datetime.timedelta(0) else ''
+    value = abs(value)
+    minutes, seconds = divmod(value.days * 86400 + value.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    text = f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if value.microseconds:
+        text += f".{value.microseconds:06d}"
+    return text
+
+class _CopyRowStream:
+    """File-like reader that encodes rows from an unbuffered cursor as COPY text on demand"""
+    
+    def __init__(self, cursor, batch_size=5000, limit=None):
+        self.cursor = cursor
+        self.batch_size = batch_size
+        self.limit = limit
+        self.rows = 0
+        # One encoder per column, picked once from the result metadata so the per-row loop
+        # does no type dispatch or escaping for columns that cannot need it
+        self.encoders = [
+            _copy_time_field if column[1] == _MYSQL_TIME_FIELD_TYPE
+            else _copy_plain_field if column[1] in _COPY_PLAIN_FIELD_TYPES
+            else _copy_text_field
+            for column in cursor.description
+        ]
+    
+    def read(self, size=-1):
+        # Each fetchmany batch is returned whole, whatever size asks for: copy_expert sends any
+        # chunk length it is given, and slicing a carried-over buffer would copy it on every read
+        chunks = []
+        while True:
+            fetch = self.batch_size if self.limit is None else min(self.batch_size, self.limit - self.rows)
+            rows = self.cursor.fetchmany(fetch) if fetch > 0 else None
+            if not rows:
+                break
+            self.rows += len(rows)
+            encoders = self.encoders
+            chunks.append(''.join(
+                '\t'.join([encode(value) for encode, value in zip(encoders, row)]) + '\n' for row in rows
+            ).encode('utf-8'))
+            if size >= 0:
+                break
+        return b''.join(chunks)
+    
+    readline = read
+
+def stream_mysql_to_postgresql_copy_direct(select_sql, copy_sql, before_sql=(), after_sql=(), batch_size=None):
+    """Stream a SELECT through an unbuffered PyMySQL cursor into psycopg2 copy_expert
+    
+    copy_sql must use COPY's default text format (tab-delimited, NULL as \\N). Everything runs
+    in one transaction unless batch_size is set, in which case each batch_size rows are copied
+    and committed on their own (before_sql is repeated per batch, after_sql runs with the last).
+    Returns the number of rows copied, or None when either driver is unavailable so callers
+    can fall back to the docker exec pipe.
+    """
+    if pymysql is None or psycopg2 is None:
+        return None
+    
+    # Dedicated connections: an unbuffered cursor holds its MySQL connection until drained,
+    # and the COPY needs its own transaction rather than the shared autocommit connection
+    try:
+        source = pymysql.connect(charset='utf8mb4', cursorclass=pymysql.cursors.SSCursor, **MYSQL_CONNECTION)
+    except Exception as e:
+        print(f"Direct MySQL connection failed, using docker exec instead: {str(e)}")
+        return None
+    try:
+        target = psycopg2.connect(**POSTGRESQL_CONNECTION)
+    except Exception as e:
+        source.close()
+        print(f"Direct PostgreSQL connection failed, using docker exec instead: {str(e)}")
+        return None
+    
+    try:
+        total = 0
+        with source.cursor() as source_cursor, target.cursor() as target_cursor:
+            source_cursor.execute(select_sql)
+            while True:
+                for sql in before_sql:
+                    target_cursor.execute(sql)
+                stream = _CopyRowStream(source_cursor, limit=batch_size)
+                target_cursor.copy_expert(copy_sql, stream)
+                total += stream.rows
+                if batch_size is None or stream.rows < batch_size:
+                    break
+                target.commit()
+                print(f"  Committed {total} rows...")
+            for sql in after_sql:
+                target_cursor.execute(sql)
+        target.commit()
+        return total
+    except Exception:
+        target.rollback()
+        raise
+    finally:
+        target.close()
+        source.close()
+
+# Session settings for a phase-1 bulk load, scoped to the COPY transaction. Phase 1 runs before
+# indexes, FKs and triggers exist, so only the synchronous WAL flush at commit is worth skipping.
+BULK_LOAD_SETTINGS = ("SET LOCAL synchronous_commit = off",)
+
+def copy_mysql_table_to_postgresql(table_name, columns, preserve_case=True, before_sql=BULK_LOAD_SETTINGS, after_sql=(), batch_size=None):
+    """Stream the given columns of a MySQL table into PostgreSQL with COPY FROM STDIN, no intermediate CSV
+    
+    batch_size commits every that many rows when the direct driver path is available; the
+    docker exec pipe always loads in a single transaction.
+    """
+    pg_table_name = get_postgresql_table_name(table_name, preserve_case)
+    print(f"Streaming {table_name} data from MySQL into PostgreSQL {pg_table_name} with COPY...")
+    
+    # mysql -B escapes tabs, newlines and backslashes the way COPY's text format expects
+    # and prints NULL as the literal NULL
+    select_sql = f"SELECT {', '.join(f'`{column}`' for column in columns)} FROM `{table_name}`"
+    column_list = ', '.join(get_postgresql_column_name(column, preserve_case) for column in columns)
+    copy_sql = f"COPY {pg_table_name} ({column_list}) FROM STDIN WITH (FORMAT text, NULL 'NULL');"
+    
+    try:
+        rows = stream_mysql_to_postgresql_copy_direct(
+            select_sql, f"COPY {pg_table_name} ({column_list}) FROM STDIN", before_sql, after_sql, batch_size
+        )
+    except Exception as e:
+        print(f"Failed to import data: {str(e)}")
+        return False
+    if rows is not None:
+        print(f"Successfully imported data to {pg_table_name}: COPY {rows}")
+        return True
+    
+    result = stream_mysql_to_postgresql_copy(select_sql, copy_sql, before_sql, after_sql)
+    if not result or result.returncode != 0:
+        print(f"Failed to import data: {result.stderr if result else 'No result'}")
+        return False
+    
+    print(f"Successfully imported data to {pg_table_name}: {result.stdout.strip()}")
+    return True
+
+def _open_copy_session(copy_sql):
+    """Start a psql session that runs copy_sql and reads the COPY data from its stdin"""
+    psql_cmd = PSQL_STDIN_EXEC_PREFIX + ['-v', 'ON_ERROR_STOP=1', '-c', copy_sql]
+    return subprocess.Popen(
+        psql_cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        bufsize=1 << 20
+    )
+
+def _finish_copy_session(copy_proc, timeout=3600):
+    """Close a COPY session's stdin (ending and committing the COPY) and wait for psql"""
+    stdout, stderr = copy_proc.communicate(timeout=timeout)
+    return subprocess.CompletedProcess(copy_proc.args, copy_proc.returncode, stdout, stderr)
+
+def import_data_to_postgresql(table_name, data_indicator, preserve_case=True, include_id=False, batch_size=None):
+    """Import data to PostgreSQL using direct transfer
+    
+    Uses the PyMySQL -> psycopg2 COPY path when both drivers are installed and otherwise pipes
+    mysql -B through psql; both load the same values. batch_size commits every that many rows
+    in its own COPY; by default the whole table is one COPY. An error on the driver path fails
+    the import instead of retrying through docker exec, which could load committed batches twice.
+    """
     pg_table_name = get_postgresql_table_name(table_name, preserve_case)
     
     print(f"Importing data to PostgreSQL {pg_table_name} table...")
@@ -755,175 +1295,115 @@ def import_data_to_postgresql(table_name, data_indicator, preserve_case=True, in
     # Use a direct approach: pipe data from MySQL to PostgreSQL
     print(f"Transferring data directly from MySQL to PostgreSQL...")
     
-    # Create a temporary SQL file for the copy operation
-    import tempfile
-    import os
-    
     # Special handling for tables with text fields that may contain newlines
     if table_name == "ClientConversationTrack":
         return import_clientconversationtrack_with_proper_export(pg_table_name, preserve_case, include_id)
     
-    # First, get the data in a format we can use
-    # Use backticks around table name to handle reserved words like "Lead"
-    get_data_cmd = f'''docker exec mysql_source mysql -u mysql -pmysql source_db -e "SELECT * FROM `{table_name}`;" -B --skip-column-names'''
-    result = run_command(get_data_cmd)
-    
-    if not result or result.returncode != 0:
-        print(f"Failed to retrieve data: {result.stderr if result else 'No result'}")
-        return False
-    
     # Get column list first to know expected field count
     if preserve_case:
         lookup_table_name = table_name  # Use original case for quoted tables
     else:
         lookup_table_name = table_name.lower()  # Use lowercase for unquoted tables
-    print(f"Debug: table_name={table_name}, preserve_case={preserve_case}, lookup_table_name={lookup_table_name}, pg_table_name={pg_table_name}")
-    # Get column list - include or exclude id based on parameter
-    id_filter = "" if include_id else " AND column_name != 'id'"
-    get_columns_cmd = f'docker exec postgres_target psql -U postgres -d target_db -t -c "SELECT column_name FROM information_schema.columns WHERE table_name = \'{lookup_table_name}\'{id_filter} ORDER BY ordinal_position;"'
-    print(f"Debug: get_columns_cmd={get_columns_cmd}")
-    col_result = run_command(get_columns_cmd)
-    
-    expected_column_count = 0
-    columns = []
-    if col_result and col_result.returncode == 0:
-        columns = [col.strip() for col in col_result.stdout.strip().split('\n') if col.strip()]
-        expected_column_count = len(columns)
-    
-    # Process the data and convert to CSV format with proper field padding
-    lines = result.stdout.strip().split('\n')
-    csv_lines = []
-    
-    for line in lines:
-        if line.strip():
-            # Convert tab-separated to comma-separated, handle quotes
-            fields = line.split('\t')
-            
-            # Pad fields to match expected column count
-            while len(fields) < expected_column_count:
-                fields.append('')  # Add empty fields for missing columns
-            
-            csv_fields = []
-            for field in fields:
-                if field == 'NULL':
-                    csv_fields.append('')
-                elif field == '':
-                    # Handle empty strings - they need to be quoted to distinguish from NULL
-                    csv_fields.append('""')
-                else:
-                    # Escape quotes and wrap in quotes if needed
-                    field = field.replace('"', '""')
-                    if ',' in field or '"' in field or '\n' in field:
-                        csv_fields.append(f'"{field}"')
-                    else:
-                        csv_fields.append(field)
-            csv_lines.append(','.join(csv_fields))
-    
-    csv_data = '\n'.join(csv_lines)
-    
-    # Write to temporary file with UTF-8 encoding
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8') as f:
-        f.write(csv_data)
-        temp_file = f.name
+    # Get column list - include or exclude id based on parameter; over the shared connection
+    # this costs no docker exec
+    columns = get_postgresql_column_names(lookup_table_name, include_id)
     
-    try:
-        # Copy to PostgreSQL container
-        import_file_name = f'{table_name}_import.csv'
-        copy_cmd = f'docker cp "{temp_file}" postgres_target:/tmp/{import_file_name}'
-        result = run_command(copy_cmd)
-        
-        if not result or result.returncode != 0:
-            print(f"Failed to copy to PostgreSQL container: {result.stderr if result else 'No result'}")
-            return False
-        
-        # We already have the column information from earlier
-        if expected_column_count > 0 and columns:
-            if preserve_case:
-                # Quote each column name for case sensitivity
-                quoted_columns = [f'"{col}"' for col in columns]
-            else:
-                quoted_columns = columns
-            column_list = ', '.join(quoted_columns)
-            
-            # Modify the data based on include_id parameter
-            updated_csv_lines = []
-            for line in csv_lines:
-                if include_id:
-                    # Include all columns including id
-                    updated_csv_lines.append(line)
-                else:
-                    # Exclude the first column (id)
-                    fields = line.split(',', 1)  # Split only on first comma
-                    if len(fields) > 1:
-                        updated_csv_lines.append(fields[1])  # Skip first field (id)
-            
-            # Write the updated CSV with UTF-8 encoding
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(updated_csv_lines))
-            
-            # Copy updated file to container
-            copy_cmd = f'docker cp "{temp_file}" postgres_target:/tmp/{import_file_name}'
-            result = run_command(copy_cmd)
-            
-            if not result or result.returncode != 0:
-                print(f"Failed to copy updated CSV: {result.stderr if result else 'No result'}")
-                return False
-            
-            # Write the COPY command to a SQL file to avoid shell escaping issues
-            copy_sql = f"COPY {pg_table_name} ({column_list}) FROM '/tmp/{import_file_name}' WITH (FORMAT csv, DELIMITER ',', QUOTE '\"', NULL '');"
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False, encoding='utf-8') as f:
-                f.write(copy_sql)
-                copy_sql_file = f.name
-            
-            try:
-                # Copy SQL file to container
-                copy_sql_cmd = f'docker cp "{copy_sql_file}" postgres_target:/tmp/import_data.sql'
-                result = run_command(copy_sql_cmd)
-                
-                if not result or result.returncode != 0:
-                    print(f"Failed to copy SQL file: {result.stderr if result else 'No result'}")
-                    return False
-                
-                # Execute the SQL file
-                import_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/import_data.sql'
-                print(f"Debug: Final import command: {import_cmd}")
-                print(f"Debug: SQL content: {copy_sql}")
-            finally:
-                # Clean up SQL file
-                try:
-                    if os.path.exists(copy_sql_file):
-                        os.unlink(copy_sql_file)
-                except:
-                    pass
+    # Select exactly the columns being loaded, so id is left out in MySQL rather than per row
+    if columns:
+        if preserve_case:
+            # Quote each column name for case sensitivity
+            quoted_columns = [f'"{col}"' for col in columns]
         else:
-            # Fallback to direct command
-            import_cmd = f"docker exec postgres_target psql -U postgres -d target_db -c \"COPY {pg_table_name} FROM '/tmp/{import_file_name}' WITH (FORMAT csv, DELIMITER ',', QUOTE '\\\"', NULL '');\""
-            print(f"Debug: Fallback import command: {import_cmd}")
-        
-        result = run_command(import_cmd)
-        
-        if not result or result.returncode != 0:
-            print(f"Failed to import data: {result.stderr if result else 'No result'}")
-            if result:
-                print(f"Import command stdout: {result.stdout}")
-            return False
-        
-        # Also check if there was any output that might indicate issues
-        if result.stdout:
-            print(f"Import output: {result.stdout}")
-        if result.stderr:
-            print(f"Import warnings: {result.stderr}")
-        
+            quoted_columns = columns
+        column_clause = f" ({', '.join(quoted_columns)})"
+        select_sql = f"SELECT {', '.join(f'`{col}`' for col in columns)} FROM `{table_name}`"
+    else:
+        # Fallback: COPY into every column of the table
+        column_clause = ""
+        select_sql = f"SELECT * FROM `{table_name}`"
+    
+    # With both drivers installed, copy over the two TCP connections instead: an unbuffered
+    # PyMySQL cursor feeds psycopg2 copy_expert, with no docker exec, psql or text re-parsing.
+    # A failure after connecting is not retried over docker exec: with batch_size the batches
+    # already committed would be loaded a second time, so it is reported and the import fails.
+    # Connection failures return None before any row is copied and do fall back.
+    try:
+        rows = stream_mysql_to_postgresql_copy_direct(
+            select_sql, f"COPY {pg_table_name}{column_clause} FROM STDIN", batch_size=batch_size
+        )
+    except Exception as e:
+        print(f"Failed to import data: {str(e)}")
+        return False
+    if rows is not None:
+        print(f"Import output: COPY {rows}")
         print(f"Imported data to {pg_table_name} table successfully")
         return True
-        
-    finally:
-        # Clean up temporary file
+    
+    # mysql -B escapes tabs, newlines and backslashes the way COPY's text format expects and
+    # prints NULL as the literal NULL, so each row is forwarded to psql unchanged and loads the
+    # same values as the driver path. No CSV file is written, docker cp'd or held in memory.
+    # Use backticks around table name to handle reserved words like "Lead"
+    # and --quick streams rows out of mysql instead of buffering the whole result in the client
+    copy_sql = f"COPY {pg_table_name}{column_clause} FROM STDIN WITH (FORMAT text, NULL 'NULL');"
+    get_data_cmd = MYSQL_EXEC_PREFIX + ['-B', '--quick', '--skip-column-names', '-e', f"{select_sql};"]
+    try:
+        export = subprocess.Popen(
+            get_data_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1 << 20
+        )
+        copy_proc = _open_copy_session(copy_sql)
+        results = []
+        batch_rows = 0
         try:
-            os.unlink(temp_file)
-        except:
+            for line in export.stdout:
+                if batch_size and batch_rows == batch_size:
+                    # Commit this batch and carry on in a fresh COPY
+                    results.append(_finish_copy_session(copy_proc))
+                    copy_proc = None
+                    if results[-1].returncode != 0:
+                        break
+                    copy_proc = _open_copy_session(copy_sql)
+                    batch_rows = 0
+                copy_proc.stdin.write(line)
+                batch_rows += 1
+        except BrokenPipeError:
+            # psql stopped reading because the COPY failed; its stderr below says why
             pass
+        if copy_proc:
+            results.append(_finish_copy_session(copy_proc))
+        if results[-1].returncode != 0:
+            export.kill()
+        export_stderr = export.stderr.read()
+        export.wait()
+    except Exception as e:
+        print(f"Failed to import data: {str(e)}")
+        return False
+    
+    stdout = ''.join(result.stdout for result in results)
+    stderr = ''.join(result.stderr for result in results)
+    if results[-1].returncode != 0:
+        print(f"Failed to import data: {results[-1].stderr}")
+        if stdout:
+            print(f"Import command stdout: {stdout}")
+        return False
+    
+    if export.returncode != 0:
+        print(f"Failed to retrieve data: {export_stderr}")
+        return False
+    
+    # Also check if there was any output that might indicate issues
+    if stdout:
+        print(f"Import output: {stdout}")
+    if stderr:
+        print(f"Import warnings: {stderr}")
+    
+    print(f"Imported data to {pg_table_name} table successfully")
+    return True
 
 def preserve_mysql_case(name):
     """Preserve MySQL case by quoting identifiers for PostgreSQL"""
@@ -953,26 +1433,10 @@ def setup_auto_increment_sequence(table_name, preserve_case=True):
     # Get the maximum ID from the table
     max_id_sql = f"SELECT COALESCE(MAX(id), 0) FROM {pg_table_name};"
     
-    # Write to file to handle quotes properly
-    with open('get_max_id.sql', 'w', encoding='utf-8') as f:
-        f.write(max_id_sql)
-    
-    # Copy and execute
-    copy_cmd = 'docker cp get_max_id.sql postgres_target:/tmp/get_max_id.sql'
-    copy_result = run_command(copy_cmd)
-    
-    if not copy_result or copy_result.returncode != 0:
-        print(f"Failed to copy max ID query file")
-        return False
-    
-    max_id_cmd = 'docker exec postgres_target psql -U postgres -d target_db -t -f /tmp/get_max_id.sql'
-    print(f"Debug: max_id_cmd={max_id_cmd}")
+    # An argument vector handles the quotes, so no SQL file has to be copied in and removed again
+    max_id_cmd = PSQL_EXEC_PREFIX + ['-t', '-c', max_id_sql]
     max_result = run_command(max_id_cmd)
     
-    # Cleanup
-    run_command('rm -f get_max_id.sql')
-    run_command('docker exec postgres_target rm -f /tmp/get_max_id.sql')
-    
     if not max_result or max_result.returncode != 0:
         print(f"Failed to get max ID for {table_name}")
         if max_result:
@@ -1004,24 +1468,8 @@ ALTER TABLE {pg_table_name}
 ALTER COLUMN id SET DEFAULT nextval('{sequence_name}');
 """
     
-    # Write to file and execute
-    with open('setup_sequence.sql', 'w', encoding='utf-8') as f:
-        f.write(sequence_sql)
-    
-    # Copy and execute
-    copy_cmd = 'docker cp setup_sequence.sql postgres_target:/tmp/setup_sequence.sql'
-    copy_result = run_command(copy_cmd)
-    
-    if not copy_result or copy_result.returncode != 0:
-        print(f"Failed to copy sequence setup file")
-        return False
-    
-    exec_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/setup_sequence.sql'
-    exec_result = run_command(exec_cmd)
-    
-    # Cleanup
-    run_command('rm -f setup_sequence.sql')
-    run_command('docker exec postgres_target rm -f /tmp/setup_sequence.sql')
+    # Pipe the script to psql on stdin
+    exec_result = execute_postgresql_script(sequence_sql, on_error_stop=False)
     
     if exec_result and exec_result.returncode == 0:
         print(f"Auto-increment sequence setup complete for {table_name}")
@@ -1042,26 +1490,10 @@ def setup_varchar_id_sequence(table_name, preserve_case=True):
     # Get the maximum numeric ID from the table (for varchar IDs that are numeric)
     max_id_sql = f"SELECT COALESCE(MAX(CAST(id AS BIGINT)), 0) FROM {pg_table_name} WHERE id ~ '^[0-9]+$';"
     
-    # Write to file to handle quotes properly
-    with open('get_max_varchar_id.sql', 'w', encoding='utf-8') as f:
-        f.write(max_id_sql)
-    
-    # Copy and execute
-    copy_cmd = 'docker cp get_max_varchar_id.sql postgres_target:/tmp/get_max_varchar_id.sql'
-    copy_result = run_command(copy_cmd)
-    
-    if not copy_result or copy_result.returncode != 0:
-        print(f"Failed to copy max varchar ID query file")
-        return False
-    
-    max_id_cmd = 'docker exec postgres_target psql -U postgres -d target_db -t -f /tmp/get_max_varchar_id.sql'
-    print(f"Debug: max_id_cmd={max_id_cmd}")
+    # An argument vector handles the quotes, so no SQL file has to be copied in and removed again
+    max_id_cmd = PSQL_EXEC_PREFIX + ['-t', '-c', max_id_sql]
     max_result = run_command(max_id_cmd)
     
-    # Cleanup
-    run_command('rm -f get_max_varchar_id.sql')
-    run_command('docker exec postgres_target rm -f /tmp/get_max_varchar_id.sql')
-    
     if not max_result or max_result.returncode != 0:
         print(f"Failed to get max varchar ID for {table_name}")
         if max_result:
@@ -1101,24 +1533,8 @@ ALTER TABLE {pg_table_name}
 ALTER COLUMN id SET DEFAULT next_{table_name.lower()}_id();
 """
     
-    # Write to file and execute
-    with open('setup_varchar_sequence.sql', 'w', encoding='utf-8') as f:
-        f.write(sequence_sql)
-    
-    # Copy and execute
-    copy_cmd = 'docker cp setup_varchar_sequence.sql postgres_target:/tmp/setup_varchar_sequence.sql'
-    copy_result = run_command(copy_cmd)
-    
-    if not copy_result or copy_result.returncode != 0:
-        print(f"Failed to copy varchar sequence setup file")
-        return False
-    
-    exec_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/setup_varchar_sequence.sql'
-    exec_result = run_command(exec_cmd)
-    
-    # Cleanup
-    run_command('rm -f setup_varchar_sequence.sql')
-    run_command('docker exec postgres_target rm -f /tmp/setup_varchar_sequence.sql')
+    # Pipe the script to psql on stdin
+    exec_result = execute_postgresql_script(sequence_sql, on_error_stop=False)
     
     if exec_result and exec_result.returncode == 0:
         print(f"Varchar ID auto-increment sequence setup complete for {table_name}")
@@ -1139,24 +1555,8 @@ def add_primary_key_constraint(table_name, preserve_case=True):
     # Add PRIMARY KEY constraint
     pk_sql = f"ALTER TABLE {pg_table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY (id);"
     
-    # Write to file and execute
-    with open('add_primary_key.sql', 'w', encoding='utf-8') as f:
-        f.write(pk_sql)
-    
-    # Copy and execute
-    copy_cmd = 'docker cp add_primary_key.sql postgres_target:/tmp/add_primary_key.sql'
-    copy_result = run_command(copy_cmd)
-    
-    if not copy_result or copy_result.returncode != 0:
-        print(f"Failed to copy primary key file")
-        return False
-    
-    exec_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/add_primary_key.sql'
-    exec_result = run_command(exec_cmd)
-    
-    # Cleanup
-    run_command('rm -f add_primary_key.sql')
-    run_command('docker exec postgres_target rm -f /tmp/add_primary_key.sql')
+    # Pipe the statement to psql on stdin
+    exec_result = execute_postgresql_script(pk_sql, on_error_stop=False)
     
     if exec_result and exec_result.returncode == 0:
         print(f"PRIMARY KEY constraint added to {table_name}")
@@ -1227,29 +1627,13 @@ def get_table_record_count(table_name, database_type, preserve_case=True):
             return None
             
     elif database_type.lower() == 'postgresql':
-        # Use file-based approach to handle quotes properly
+        # Passed as one argument, so the quoted table name needs no shell escaping
         if preserve_case:
             sql = f'SELECT COUNT(*) FROM "{table_name}";'
         else:
             sql = f'SELECT COUNT(*) FROM {table_name.lower()};'
             
-        # Write SQL to temporary file
-        with open('temp_count.sql', 'w', encoding='utf-8') as f:
-            f.write(sql)
-        
-        # Copy and execute
-        copy_cmd = 'docker cp temp_count.sql postgres_target:/tmp/temp_count.sql'
-        copy_result = run_command(copy_cmd)
-        
-        if not copy_result or copy_result.returncode != 0:
-            print(f"Failed to copy count query file")
-            return None
-        
-        result = run_command('docker exec postgres_target psql -U postgres -d target_db -t -f /tmp/temp_count.sql')
-        
-        # Cleanup
-        run_command('rm -f temp_count.sql')
-        run_command('docker exec postgres_target rm -f /tmp/temp_count.sql')
+        result = run_command(PSQL_EXEC_PREFIX + ['-t', '-c', sql])
         
         if not result or result.returncode != 0:
             print(f"Failed to get record count from {database_type} for {table_name}")
@@ -1520,13 +1904,13 @@ def import_clientconversationtrack_with_custom_parsing(csv_file_path, preserve_c
     try:
         # Before importing, make the id column temporarily nullable
         make_nullable_sql = f"ALTER TABLE {pg_table_name} ALTER COLUMN id DROP NOT NULL;"
-        with open('make_id_nullable.sql', 'w', encoding='utf-8') as f:
+        with open(f'{TEMP_PREFIX}make_id_nullable.sql', 'w', encoding='utf-8') as f:
             f.write(make_nullable_sql)
         
-        copy_cmd = 'docker cp make_id_nullable.sql postgres_target:/tmp/make_id_nullable.sql'
+        copy_cmd = f'docker cp {TEMP_PREFIX}make_id_nullable.sql postgres_target:/tmp/{TEMP_PREFIX}make_id_nullable.sql'
         run_command(copy_cmd)
         
-        exec_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/make_id_nullable.sql'
+        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{TEMP_PREFIX}make_id_nullable.sql'
         result = run_command(exec_cmd)
         print(f"DEBUG: Made id column nullable: {result.returncode if result else 'N/A'}")
         
@@ -1585,7 +1969,7 @@ def import_clientconversationtrack_with_custom_parsing(csv_file_path, preserve_c
         print(f"DEBUG: SQL file content: {copy_sql}")
         
         # Copy and execute
-        copy_cmd = f'docker cp {import_sql_file} postgres_target:/tmp/import_custom_csv.sql'
+        copy_cmd = f'docker cp {import_sql_file} postgres_target:/tmp/{TEMP_PREFIX}import_custom_csv.sql'
         copy_result = run_command(copy_cmd)
         
         if not copy_result or copy_result.returncode != 0:
@@ -1593,7 +1977,7 @@ def import_clientconversationtrack_with_custom_parsing(csv_file_path, preserve_c
             return False
         
         # Execute the SQL file
-        import_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/import_custom_csv.sql'
+        import_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{TEMP_PREFIX}import_custom_csv.sql'
         print(f"DEBUG: Executing custom import command: {import_cmd}")
         print(f"DEBUG: SQL content: {copy_sql}")
         exec_result = run_command(import_cmd)
@@ -1608,7 +1992,7 @@ def import_clientconversationtrack_with_custom_parsing(csv_file_path, preserve_c
         
         # Cleanup SQL files - keep debug file for inspection
         # run_command('rm -f import_custom_csv_debug.sql')
-        run_command('docker exec postgres_target rm -f /tmp/import_custom_csv.sql')
+        run_command(f'docker exec postgres_target rm -f /tmp/{TEMP_PREFIX}import_custom_csv.sql')
         run_command(f'docker exec postgres_target rm -f /tmp/{import_file_name}')
         
         if exec_result and exec_result.returncode == 0:
@@ -1616,13 +2000,13 @@ def import_clientconversationtrack_with_custom_parsing(csv_file_path, preserve_c
             
             # Make the id column NOT NULL again
             make_not_null_sql = f"UPDATE {pg_table_name} SET id = nextval('\"ClientConversationTrack_id_seq\"') WHERE id IS NULL; ALTER TABLE {pg_table_name} ALTER COLUMN id SET NOT NULL;"
-            with open('make_id_not_null.sql', 'w', encoding='utf-8') as f:
+            with open(f'{TEMP_PREFIX}make_id_not_null.sql', 'w', encoding='utf-8') as f:
                 f.write(make_not_null_sql)
             
-            copy_cmd = 'docker cp make_id_not_null.sql postgres_target:/tmp/make_id_not_null.sql'
+            copy_cmd = f'docker cp {TEMP_PREFIX}make_id_not_null.sql postgres_target:/tmp/{TEMP_PREFIX}make_id_not_null.sql'
             run_command(copy_cmd)
             
-            exec_cmd = 'docker exec postgres_target psql -U postgres -d target_db -f /tmp/make_id_not_null.sql'
+            exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{TEMP_PREFIX}make_id_not_null.sql'
             result = run_command(exec_cmd)
             print(f"DEBUG: Made id column NOT NULL again: {result.returncode if result else 'N/A'}")
             
@@ -1649,6 +2033,125 @@ def import_clientconversationtrack_from_csv(csv_file_path, preserve_case=True):
     print(f"ClientConversationTrack detected - using custom CSV parsing for newline handling")
     return import_clientconversationtrack_with_custom_parsing(csv_file_path, preserve_case)
 
+# MySQL to PostgreSQL column type conversions, fused into one alternation below.
+# Order matters: at a given position the first matching alternative wins.
+_COLUMN_TYPE_CONVERSIONS = [
+    (r'\btinyint\(1\)', 'BOOLEAN'),
+    (r'\btinyint\b(?:\([^)]+\))?', 'SMALLINT'),
+    (r'\bsmallint\b(?:\([^)]+\))?', 'SMALLINT'),
+    (r'\bmediumint\b(?:\([^)]+\))?', 'INTEGER'),
+    (r'\bint\([^)]+\)\b', 'INTEGER'),
+    (r'\bbigint\b(?:\([^)]+\))?', 'BIGINT'),
+    (r'\bint\b', 'INTEGER'),
+    (r'\bvarchar\([^)]+\)\b', 'VARCHAR'),
+    (r'\btext\b', 'TEXT'),
+    (r'\blongtext\b', 'TEXT'),
+    (r'\bmediumtext\b', 'TEXT'),
+    (r'\btinytext\b', 'TEXT'),
+    (r'\bdatetime\([^)]+\)\b', 'TIMESTAMP'),
+    (r'\bdatetime\b', 'TIMESTAMP'),
+    (r'\btimestamp\([^)]+\)\b', 'TIMESTAMP'),
+    (r'\btimestamp\b', 'TIMESTAMP'),
+    (r'\bdate\b', 'DATE'),
+    (r'\btime\b', 'TIME'),
+    (r'\bdouble\b', 'DOUBLE PRECISION'),
+    (r'\bfloat\b', 'REAL'),
+    (r'\bdecimal\([^)]+\)\b', 'DECIMAL'),
+    (r'\bjson\b', 'JSON'),
+    # Whole-word matches, so longblob never becomes longBYTEA
+    (r'\b(?:long|medium|tiny)?blob\b', 'BYTEA'),
+    # Column attributes PostgreSQL does not take
+    (r'\bAUTO_INCREMENT\b', ''),
+    (r'DEFAULT\s+CURRENT_TIMESTAMP\(\d*\)', 'DEFAULT CURRENT_TIMESTAMP'),
+    (r'\s+CHARACTER\s+SET\s+[^\s]+', ''),
+    (r'\s+COLLATE\s+[^\s]+', ''),
+]
+# All rules as one alternation; the matched group's number picks the replacement. The rules
+# never overlap, so one left-to-right pass gives the same result as applying them in turn.
+_COLUMN_TYPE_RE = re.compile('|'.join(f'({pattern})' for pattern, _ in _COLUMN_TYPE_CONVERSIONS), re.IGNORECASE)
+_COLUMN_TYPE_REPLACEMENTS = [replacement for _, replacement in _COLUMN_TYPE_CONVERSIONS]
+_WS_RE = re.compile(r'\s+')
+
+def convert_column_ddl(line, preserve_case=True):
+    """Convert one MySQL column definition to PostgreSQL: quoting, types, AUTO_INCREMENT, defaults and charsets"""
+    # Remove backticks
+    line = line.replace('`', '"' if preserve_case else '')
+    
+    # Type conversions, AUTO_INCREMENT, DEFAULT CURRENT_TIMESTAMP(n) and charset/collation
+    # removal in a single pass, dispatching on the matched alternative
+    line = _COLUMN_TYPE_RE.sub(lambda m: _COLUMN_TYPE_REPLACEMENTS[m.lastindex - 1], line)
+    
+    # Clean up whitespace
+    return _WS_RE.sub(' ', line).strip()
+
+# Whole-statement type mapping for scripts that convert the full CREATE TABLE at once and keep
+# lengths and precision (VARCHAR(191), DECIMAL(10,2)). Quoted identifiers and string literals are
+# matched by the skip branch so a column named `date` or a DEFAULT 'text' is left alone.
+_MYSQL_TYPE_TOKEN_RE = re.compile(
+    r"(?P<skip>`[^`]*`|'(?:[^'\\]|\\.)*')"
+    r"|\b(?P<type>tinyint|smallint|mediumint|bigint|int|varchar|char|tinytext|mediumtext|longtext|text"
+    r"|datetime|timestamp|date|time|decimal|numeric|double|float|enum|json|tinyblob|mediumblob|longblob|blob)\b"
+    r"(?P<args>\([^)]*\))?(?P<auto_increment>\s+auto_increment\b)?",
+    re.IGNORECASE
+)
+
+# Replacement for each type token; True keeps the original (...) arguments after it
+MYSQL_TYPE_MAPPINGS = {
+    'smallint': ('SMALLINT', False),
+    'mediumint': ('INTEGER', False),
+    'int': ('INTEGER', False),
+    'bigint': ('BIGINT', False),
+    'varchar': ('VARCHAR', True),
+    'char': ('CHAR', True),
+    'tinytext': ('TEXT', False),
+    'mediumtext': ('TEXT', False),
+    'longtext': ('TEXT', False),
+    'text': ('TEXT', False),
+    'timestamp': ('TIMESTAMP', True),
+    'date': ('DATE', False),
+    'time': ('TIME', True),
+    'decimal': ('DECIMAL', True),
+    'numeric': ('DECIMAL', True),
+    'double': ('DOUBLE PRECISION', False),
+    'float': ('REAL', False),
+    'enum': ('VARCHAR(50)', False),
+    'json': ('JSONB', False),
+    'tinyblob': ('BYTEA', False),
+    'mediumblob': ('BYTEA', False),
+    'longblob': ('BYTEA', False),
+    'blob': ('BYTEA', False),
+}
+
+# Display-width integer keys that MySQL declares inline with AUTO_INCREMENT
+_MYSQL_SERIAL_TYPES = {'int': 'SERIAL PRIMARY KEY', 'bigint': 'BIGSERIAL PRIMARY KEY'}
+
+def convert_mysql_column_types(ddl, serial_auto_increment=False):
+    """Map every MySQL type token in a CREATE TABLE statement to PostgreSQL in one pass
+    
+    Unlike convert_column_ddl, lengths and precision are kept. With serial_auto_increment an
+    int(n)/bigint(n) AUTO_INCREMENT column becomes SERIAL/BIGSERIAL PRIMARY KEY; otherwise
+    AUTO_INCREMENT is left for the caller to strip.
+    """
+    def convert(match):
+        if match.group('skip'):
+            return match.group('skip')
+        mysql_type = match.group('type').lower()
+        args = match.group('args') or ''
+        auto_increment = match.group('auto_increment') or ''
+        if serial_auto_increment and args and auto_increment and mysql_type in _MYSQL_SERIAL_TYPES:
+            return _MYSQL_SERIAL_TYPES[mysql_type]
+        if mysql_type == 'tinyint':
+            postgres_type = 'BOOLEAN' if args == '(1)' else 'SMALLINT'
+        elif mysql_type == 'datetime':
+            postgres_type = 'TIMESTAMP(3)' if args else 'TIMESTAMP'
+        else:
+            postgres_type, keep_args = MYSQL_TYPE_MAPPINGS[mysql_type]
+            if keep_args:
+                postgres_type += args
+        return postgres_type + auto_increment
+    
+    return _MYSQL_TYPE_TOKEN_RE.sub(convert, ddl)
+
 def standardize_id_column_as_serial(ddl, preserve_case=True):
     """
     Standardize the ID column to use SERIAL for auto-increment functionality.
@@ -1855,7 +2358,7 @@ def execute_enum_creation(enum_ddl):
     
     try:
         # Copy the SQL file to the container and execute it
-        copy_cmd = f'docker cp {temp_file} postgres_target:/tmp/create_enums.sql'
+        copy_cmd = f'docker cp {temp_file} postgres_target:/tmp/{TEMP_PREFIX}create_enums.sql'
         result = run_command(copy_cmd)
         
         if not result or result.returncode != 0:
@@ -1863,7 +2366,7 @@ def execute_enum_creation(enum_ddl):
             return False
         
         # Execute the SQL file
-        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/create_enums.sql'
+        exec_cmd = f'docker exec postgres_target psql -U postgres -d target_db -f /tmp/{TEMP_PREFIX}create_enums.sql'
         result = run_command(exec_cmd)
         
         if not result or result.returncode != 0: